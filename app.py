@@ -1,25 +1,270 @@
-from flask import Flask, render_template, request, jsonify, make_response
+from flask import Flask, render_template, request, jsonify, make_response, g
+from werkzeug.http import is_resource_modified
+from functools import wraps
 import pandas as pd
 import os
 import unicodedata
 import numpy as np
 import locale
 import gspread
+from gspread.utils import absolute_range_name, fill_gaps, rowcol_to_a1, a1_to_rowcol
+from gspread.urls import DRIVE_FILES_API_V3_URL
 from google.oauth2.service_account import Credentials
-from datetime import datetime, timedelta
+from google.auth.transport.requests import AuthorizedSession, Request as GoogleAuthRequest
+from requests.adapters import HTTPAdapter
+from datetime import datetime, timedelta, timezone
 import json
+import gzip
+import csv
+import sqlite3
+import click
+import logging
+import contextvars
+import threading
+import time
+import hashlib
+import pickle
+import resource
+from contextlib import contextmanager
+from collections import defaultdict
+from bisect import bisect_left
 from flask_cors import CORS
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
 
-import locale
+# Hızlı JSON serileştirme (orjson yoksa standart json kullanılır)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Brotli sıkıştırma (kurulu değilse sadece gzip sunulur)
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Diske snapshot yazma (pyarrow yoksa snapshot sadece bellekte tutulur)
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:
+    pa = None
+    feather = None
+
+# Yerel .xlsx veri kaynağı (kurulu değilse sadece CSV dizinleri okunur)
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+# Worker'lar arası yenileme kilidi (POSIX dışı sistemlerde her worker kendi yeniler)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 try:
     locale.setlocale(locale.LC_COLLATE, 'tr_TR.UTF-8')
 except locale.Error:
     locale.setlocale(locale.LC_COLLATE, '')  # Sistem varsayılanına geç
 
+# Günlük (logging) ayarları: seviye LOG_LEVEL ile, alt sistem bazında LOG_LEVEL_<ALT_SISTEM> ile
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_SUBSYSTEMS = ['sheets', 'data', 'cache', 'api', 'ders']
+# DEBUG kayıtları çağrı yeri başına LOG_DEBUG_SAMPLE_INTERVAL saniyede en fazla LOG_DEBUG_SAMPLE_RATE adet
+LOG_DEBUG_SAMPLE_RATE = int(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 20))
+LOG_DEBUG_SAMPLE_INTERVAL = float(os.environ.get('LOG_DEBUG_SAMPLE_INTERVAL', 10))
+# Bu değer X-Debug-Log başlığıyla gönderilirse o istek için tüm ayrıntılı kayıtlar açılır (boş = kapalı)
+DEBUG_LOG_TOKEN = os.environ.get('DEBUG_LOG_TOKEN', '')
+
+# Geçerli istek için ayrıntılı günlük açık mı (istek bağlamına özel)
+verbose_logging = contextvars.ContextVar('verbose_logging', default=False)
+
+class RequestVerboseLogger(logging.Logger):
+    """Ayrıntılı günlük istenen istekte seviyeden bağımsız olarak tüm kayıtları geçiren logger"""
+
+    def isEnabledFor(self, level):
+        return verbose_logging.get() or super().isEnabledFor(level)
+
+class DebugSampler(logging.Filter):
+    """DEBUG kayıtlarını çağrı yeri başına bir zaman aralığında en fazla `rate` adetle sınırlar
+
+    Bastırılan kayıt sayısı, aralık yenilendiğinde geçen ilk kayda eklenir. Ayrıntılı
+    günlük istenen isteklerin kayıtları örneklenmez.
+    """
+
+    def __init__(self, rate, interval):
+        super().__init__()
+        self.rate = rate
+        self.interval = interval
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or verbose_logging.get():
+            return True
+        key = (record.name, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            started, count, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - started >= self.interval:
+                if suppressed:
+                    record.msg = f'{record.msg} (önceki {suppressed} benzer kayıt bastırıldı)'
+                started, count, suppressed = now, 0, 0
+            if count >= self.rate:
+                self._windows[key] = (started, count, suppressed + 1)
+                return False
+            self._windows[key] = (started, count + 1, suppressed)
+            return True
+
+logging.setLoggerClass(RequestVerboseLogger)
+logger = logging.getLogger(__name__)
+sheets_logger, data_logger, cache_logger, api_logger, ders_logger = (
+    logger.getChild(name) for name in LOG_SUBSYSTEMS
+)
+logging.setLoggerClass(logging.Logger)
+
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s [%(process)d] %(name)s: %(message)s'))
+log_handler.addFilter(DebugSampler(LOG_DEBUG_SAMPLE_RATE, LOG_DEBUG_SAMPLE_INTERVAL))
+logger.addHandler(log_handler)
+logger.setLevel(LOG_LEVEL)
+logger.propagate = False
+for name in LOG_SUBSYSTEMS:
+    level = os.environ.get(f'LOG_LEVEL_{name.upper()}')
+    if level:
+        logger.getChild(name).setLevel(level.upper())
+
 # Flask app'i oluştur
 app = Flask(__name__)
 
+@app.before_request
+def enable_request_verbose_logging():
+    """X-Debug-Log başlığı DEBUG_LOG_TOKEN ile eşleşirse bu istek için ayrıntılı günlüğü açar"""
+    if DEBUG_LOG_TOKEN and request.headers.get('X-Debug-Log') == DEBUG_LOG_TOKEN:
+        g.verbose_logging_token = verbose_logging.set(True)
+        api_logger.debug('🔍 Ayrıntılı günlük açıldı: %s %s', request.method, request.full_path)
+
+@app.teardown_request
+def reset_request_verbose_logging(exc):
+    token = g.pop('verbose_logging_token', None)
+    if token is not None:
+        verbose_logging.reset(token)
+
+# Prometheus metrikleri: PROMETHEUS_MULTIPROC_DIR ayarlıysa (gunicorn.conf.py) tüm worker'lar
+# değerlerini bu dizindeki dosyalara yazar ve /metrics hepsini birleştirerek döndürür
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'İstek işleme süresi (route bazında)',
+    ['method', 'endpoint', 'status'],
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Gönderilen yanıt gövdesi boyutu (sıkıştırma sonrası)',
+    ['endpoint'], buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+SHEETS_CALLS = Counter(
+    'sheets_api_calls_total', 'Google Sheets / Drive API çağrıları', ['operation', 'outcome'],
+)
+SHEETS_CALL_DURATION = Histogram(
+    'sheets_api_call_duration_seconds', 'Google Sheets / Drive API çağrı süresi', ['operation'],
+)
+RESPONSE_CACHE = Counter(
+    'response_cache_requests_total', 'Yanıt önbelleği kullanımı (payload: snapshot başına gövde, conditional: 304)',
+    ['cache', 'result'],
+)
+DATA_REFRESHES = Counter(
+    'data_refresh_total', 'Snapshot yenileme sonuçları', ['result'],
+)
+SNAPSHOT_VERSION = Gauge(
+    'data_snapshot_version', 'Worker\'ın sunduğu snapshot sürümü', multiprocess_mode='liveall',
+)
+SNAPSHOT_REFRESHED = Gauge(
+    'data_snapshot_refreshed_timestamp_seconds', 'Sunulan snapshot\'ın son doğrulandığı zaman (unix)',
+    multiprocess_mode='liveall',
+)
+
+class SnapshotAgeCollector:
+    """data_snapshot_age_seconds: her worker'ın son doğrulama zamanından kazıma anında hesaplanır
+
+    Worker'ların kendi yazdığı bir yaş gauge'u sadece /metrics isteğini yanıtlayan worker'da
+    güncellenir, diğerlerinin donmuş değerleri toplamda kalırdı. source, refreshed
+    zaman damgasını (çok süreçli modda worker başına pid etiketiyle) üreten collector'dır.
+    """
+
+    def __init__(self, source):
+        self.source = source
+
+    def collect(self):
+        age = GaugeMetricFamily('data_snapshot_age_seconds', 'Sunulan snapshot\'ın yaşı (kazıma anında)')
+        now = time.time()
+        for metric in self.source.collect():
+            if metric.name != 'data_snapshot_refreshed_timestamp_seconds':
+                continue
+            for sample in metric.samples:
+                # 0: worker henüz snapshot yüklemedi
+                if sample.value:
+                    age.add_sample('data_snapshot_age_seconds', sample.labels, now - sample.value)
+        yield age
+
+REGISTRY.register(SnapshotAgeCollector(SNAPSHOT_REFRESHED))
+
+SHEETS_IN_FLIGHT = Gauge(
+    'sheets_api_calls_in_flight', 'Şu anda süren Google Sheets / Drive çağrıları', multiprocess_mode='livesum',
+)
+
+# Worker başına aynı anda süren Sheets çağrısı sınırı: yavaş bir upstream tüm istek thread'lerini tutmasın
+SHEETS_MAX_CONCURRENCY = int(os.environ.get('SHEETS_MAX_CONCURRENCY', 4))
+SHEETS_QUEUE_TIMEOUT = float(os.environ.get('SHEETS_QUEUE_TIMEOUT', 20))
+sheets_slots = threading.BoundedSemaphore(SHEETS_MAX_CONCURRENCY)
+
+class SheetsBusyError(Exception):
+    """SHEETS_QUEUE_TIMEOUT içinde boş Sheets çağrı yeri açılmadı"""
+
+@contextmanager
+def sheets_call(operation):
+    """Google Sheets / Drive çağrısını işlem adına göre sayar ve süresini ölçer
+
+    Çağrı, SHEETS_MAX_CONCURRENCY yerden biri boşalana kadar bekler; SHEETS_QUEUE_TIMEOUT
+    dolarsa SheetsBusyError fırlatılır (yazma API'leri 503 döner).
+    """
+    if not sheets_slots.acquire(timeout=SHEETS_QUEUE_TIMEOUT):
+        SHEETS_CALLS.labels(operation, 'busy').inc()
+        raise SheetsBusyError(f'{operation}: {SHEETS_QUEUE_TIMEOUT:g} sn içinde boş Sheets çağrı yeri açılmadı')
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        with SHEETS_IN_FLIGHT.track_inprogress():
+            yield
+        outcome = 'ok'
+    finally:
+        sheets_slots.release()
+        SHEETS_CALLS.labels(operation, outcome).inc()
+        SHEETS_CALL_DURATION.labels(operation).observe(time.perf_counter() - started)
+
+@app.errorhandler(SheetsBusyError)
+def sheets_busy(error):
+    api_logger.warning('⏳ %s', error)
+    response = jsonify({'error': 'Google Sheets şu anda yoğun, lütfen biraz sonra tekrar deneyin'})
+    response.headers['Retry-After'] = str(max(1, int(SHEETS_QUEUE_TIMEOUT)))
+    return response, 503
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def observe_request(response):
+    """Gecikme ve yanıt boyutu; sıkıştırmadan sonra çalışır (after_request ters sırayla çağrılır)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_LATENCY.labels(request.method, endpoint, response.status_code).observe(time.perf_counter() - started)
+        if not response.direct_passthrough:
+            RESPONSE_SIZE.labels(endpoint).observe(response.calculate_content_length() or 0)
+    return response
+
 # CORS konfigürasyonu
 CORS(app, 
      origins=['https://www.bilisimizcileri.com', 
@@ -36,166 +281,1862 @@ SCOPES = [
     'https://www.googleapis.com/auth/drive'
 ]
 
-# Google Sheets bağlantısı
-def get_google_sheets_client():
-    try:
+# Google Sheets oturum ayarları
+SHEETS_POOL_SIZE = int(os.environ.get('SHEETS_POOL_SIZE', 10))
+SHEETS_METADATA_TTL = int(os.environ.get('SHEETS_METADATA_TTL', 600))
+SHEETS_TOKEN_REFRESH_MARGIN = int(os.environ.get('SHEETS_TOKEN_REFRESH_MARGIN', 300))
+
+class GoogleSheetsManager:
+    """Süreç genelinde tek bir yetkili Google Sheets oturumu ve spreadsheet tutamacı tutar"""
+
+    def __init__(self):
+        self.credentials = None
+        self.session = None
+        self.client = None
+        self.spreadsheet = None
+        self.worksheets = None
+        self.worksheet_ids = {}
+        self.worksheet_roles = None
+        # Worksheet id -> Program Kodu sütunu (1 tabanlı; yazma yolunda doğrulanarak güncellenir)
+        self.key_columns = {}
+        self.metadata_loaded_at = 0.0
+        self._lock = threading.RLock()
+
+    def _load_credentials(self):
         # Önce environment variable'dan credentials'ı kontrol et (Render için)
         google_credentials = os.environ.get('GOOGLE_CREDENTIALS')
         
         if google_credentials:
             # Environment variable'dan credentials oluştur
-            import json
             creds_dict = json.loads(google_credentials)
             creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
-            print("✅ Environment variable'dan credentials yüklendi")
+            sheets_logger.info("✅ Environment variable'dan credentials yüklendi")
         elif os.path.exists('credentials.json'):
             # Dosyadan credentials yükle (local development için)
             creds = Credentials.from_service_account_file('credentials.json', scopes=SCOPES)
-            print("✅ credentials.json dosyasından yüklendi")
+            sheets_logger.info('✅ credentials.json dosyasından yüklendi')
         else:
             # Credentials bulunamadı
-            print("❌ Google Sheets credentials bulunamadı!")
-            print("💡 Render'da GOOGLE_CREDENTIALS environment variable'ını ayarlayın")
-            print("💡 Local'de credentials.json dosyasını oluşturun")
-            return None
-        
-        if creds:
-            client = gspread.authorize(creds)
-            return client
-        else:
+            sheets_logger.error("❌ Google Sheets credentials bulunamadı! 💡 Render'da GOOGLE_CREDENTIALS environment variable'ını ayarlayın, local'de credentials.json dosyasını oluşturun")
             return None
+        return creds
+
+    def get_client(self):
+        """Yetkili gspread istemcisini döndürür, gerekirse ilk kez oluşturur"""
+        with self._lock:
+            if self.client is None:
+                creds = self._load_credentials()
+                if not creds:
+                    return None
+                # Keep-alive bağlantı havuzu: TLS kurulumu her istekte tekrarlanmaz
+                session = AuthorizedSession(creds)
+                adapter = HTTPAdapter(pool_connections=SHEETS_POOL_SIZE, pool_maxsize=SHEETS_POOL_SIZE)
+                session.mount('https://', adapter)
+                self.credentials = creds
+                self.session = session
+                self.client = gspread.Client(auth=creds, session=session)
+            self._ensure_token()
+            return self.client
+
+    def _ensure_token(self):
+        # Token süresi dolmadan önce yenile (istek sırasında 401 beklemeden)
+        creds = self.credentials
+        expiry = creds.expiry
+        if creds.token and expiry is not None and expiry - datetime.utcnow() > timedelta(seconds=SHEETS_TOKEN_REFRESH_MARGIN):
+            return
+        with sheets_call('token_refresh'):
+            creds.refresh(GoogleAuthRequest(self.session))
+        sheets_logger.info("🔑 Google Sheets erişim token'ı yenilendi")
+
+    def get_spreadsheet(self):
+        """Önbellekteki spreadsheet tutamacını döndürür"""
+        with self._lock:
+            client = self.get_client()
+            if not client:
+                return None
+            sheet_id = os.environ.get('GOOGLE_SHEET_ID', '')
+            if not sheet_id:
+                return None
+            if self.spreadsheet is None or self.spreadsheet.id != sheet_id:
+                with sheets_call('open_by_key'):
+                    self.spreadsheet = client.open_by_key(sheet_id)
+                self.worksheets = None
+            return self.spreadsheet
+
+    def get_worksheets(self):
+        """Worksheet listesini döndürür; metadata SHEETS_METADATA_TTL boyunca önbellekte tutulur"""
+        with self._lock:
+            spreadsheet = self.get_spreadsheet()
+            if spreadsheet is None:
+                return None
+            if self.worksheets is None or time.time() - self.metadata_loaded_at >= SHEETS_METADATA_TTL:
+                with sheets_call('worksheets'):
+                    self.worksheets = spreadsheet.worksheets()
+                self.worksheet_ids = {ws.title: ws.id for ws in self.worksheets}
+                self.worksheet_roles = resolve_worksheet_roles(self.worksheets)
+                self.metadata_loaded_at = time.time()
+            return self.worksheets
+
+    def get_worksheet_roles(self):
+        """Rol adından worksheet'e eşlemeyi döndürür (metadata ile birlikte önbellekte)"""
+        with self._lock:
+            if self.get_worksheets() is None:
+                return None
+            return self.worksheet_roles
+
+    def get_role_worksheet(self, role):
+        roles = self.get_worksheet_roles()
+        return roles.get(role) if roles else None
+
+    def invalidate(self):
+        """Spreadsheet ve worksheet önbelleğini temizler (oturum korunur)"""
+        with self._lock:
+            self.spreadsheet = None
+            self.worksheets = None
+            self.worksheet_ids = {}
+            self.worksheet_roles = None
+            self.key_columns = {}
+
+sheets_manager = GoogleSheetsManager()
+
+# Google Sheets bağlantısı
+def get_google_sheets_client():
+    try:
+        return sheets_manager.get_client()
+    except SheetsBusyError:
+        # Bağlantı sağlam, sadece çağrı sırası dolu: çağıran 503 döndürsün
+        raise
     except Exception as e:
-        print(f"Google Sheets bağlantı hatası: {e}")
+        sheets_logger.error('Google Sheets bağlantı hatası: %s', e)
         return None
 
 # Eski load_data_from_sheets fonksiyonu kaldırıldı - Artık load_data() kullanılıyor
 
 # Excel dosyasından veri yükleme fonksiyonu kaldırıldı - Artık Google Sheets kullanılıyor
 
-# Ana veri yükleme fonksiyonu
-def load_data():
-    """Ana veri yükleme fonksiyonu - Google Sheets'ten yükler"""
-    try:
+# Worksheet rolleri: başlık eşleşmesi, bulunamazsa sıradaki worksheet kullanılır
+WORKSHEET_ROLE_TITLES = {
+    'universiteler': ['üniversiteler', 'universiteler', 'ana veri', 'ana_veri', 'main', 'data'],
+    'ders_programi': ['ders programı', 'ders_programi', 'ders programi', 'ders_programı'],
+}
+WORKSHEET_ROLE_FALLBACK_INDEX = {'universiteler': 0, 'ders_programi': 1}
+
+def resolve_worksheet_roles(worksheets):
+    """Her veri rolü için kullanılacak worksheet'i seçer"""
+    sheets_logger.debug("📊 Mevcut worksheet'ler: %s", [ws.title for ws in worksheets])
+    roles = {}
+    for role, titles in WORKSHEET_ROLE_TITLES.items():
+        selected = None
+        for ws in worksheets:
+            if ws.title.lower() in titles:
+                selected = ws
+                break
+        
+        # Eğer bulunamazsa sıradaki worksheet'i kullan
+        fallback_index = WORKSHEET_ROLE_FALLBACK_INDEX[role]
+        if not selected and len(worksheets) > fallback_index:
+            selected = worksheets[fallback_index]
+            sheets_logger.warning("⚠️ '%s' worksheet'i bulunamadı, '%s' kullanılıyor", role, selected.title)
+        
+        if selected:
+            sheets_logger.debug("🎯 '%s' için seçilen worksheet: '%s'", role, selected.title)
+        else:
+            sheets_logger.error("❌ '%s' worksheet'i bulunamadı!", role)
+        roles[role] = selected
+    return roles
+
+def fetch_sheet_values():
+    """Tüm rollerin worksheet değerlerini tek bir values:batchGet isteğiyle indirir"""
+    spreadsheet = sheets_manager.get_spreadsheet()
+    roles = sheets_manager.get_worksheet_roles()
+    if spreadsheet is None or roles is None:
+        return None
+    
+    selected = {role: ws for role, ws in roles.items() if ws is not None}
+    if not selected:
+        return {}
+    
+    ranges = [absolute_range_name(ws.title) for ws in selected.values()]
+    with sheets_call('values_batch_get'):
+        response = spreadsheet.values_batch_get(ranges)
+    value_ranges = response.get('valueRanges', [])
+    
+    values = {}
+    for role, value_range in zip(selected, value_ranges):
+        # get_all_values() ile aynı şekilde satırları dikdörtgene tamamla
+        values[role] = fill_gaps(value_range.get('values', []))
+        sheets_logger.debug("📊 '%s' worksheet'inden alınan satır sayısı: %d", role, len(values[role]))
+    return values
+
+def build_universiteler_df(all_values):
+    """Ana veri worksheet değerlerinden temizlenmiş DataFrame oluşturur"""
+    if not all_values or len(all_values) < 2:
+        data_logger.error("❌ Ana veri worksheet'inde veri bulunamadı!")
+        return None
+    
+    # Başlıkları al
+    headers = all_values[0]
+    data_logger.debug('📋 Başlıklar: %s', headers)
+    
+    # Veri satırlarını al
+    data_rows = all_values[1:]
+    
+    # DataFrame oluştur
+    df = pd.DataFrame(data_rows, columns=headers)
+    data_logger.info("✅ Ana veri worksheet'inden %d satır veri yüklendi", len(df))
+    data_logger.debug('📊 Ana veri başlıkları: %s', list(df.columns))
+    
+    # Tekrarlanan sütunları temizle
+    data_logger.debug('🔍 Tekrarlanan sütunlar kontrol ediliyor...')
+    duplicate_columns = df.columns[df.columns.duplicated()].tolist()
+    if duplicate_columns:
+        data_logger.warning('⚠️ Tekrarlanan sütunlar bulundu: %s', duplicate_columns)
+        # Tekrarlanan sütunları kaldır (ilk olanları tut)
+        df = df.loc[:, ~df.columns.duplicated()]
+        data_logger.info('✅ Tekrarlanan sütunlar kaldırıldı. Yeni sütun sayısı: %d', len(df.columns))
+        data_logger.debug('📊 Güncellenmiş başlıklar: %s', list(df.columns))
+    else:
+        data_logger.debug('✅ Tekrarlanan sütun bulunamadı')
+    
+    # Bellek raporunun "önce"si: sayfadan gelen ham metin hali (sayıya çevirmeden önce)
+    raw_memory = df.memory_usage(deep=True, index=False)
+    
+    # Sayısal sütunları düzelt (sıralama için kullanılacak)
+    numeric_columns = ['Kontenjan', '2024 Başarı Sırası', '2024 YKS En Küçük Puanı']
+    
+    # Metin sütunları (aralık bilgileri için)
+    text_columns = ['2024 YKS Puanı Aralığı', '2024 Başarı Sırası Aralığı']
+    
+    # Aralık sütunlarını kontrol et
+    data_logger.debug('🔍 Aralık sütunları kontrol ediliyor...')
+    for col in text_columns:
+        if col in df.columns:
+            if data_logger.isEnabledFor(logging.DEBUG):
+                data_logger.debug('✅ %s sütunu bulundu, örnek değerler: %s', col, df[col].head().tolist())
+        else:
+            data_logger.warning('❌ %s sütunu bulunamadı!', col)
+            # Benzer isimleri ara
+            similar_cols = [c for c in df.columns if 'aralık' in c.lower() or 'puanı' in c.lower()]
+            if similar_cols:
+                data_logger.warning('   Benzer sütunlar: %s', similar_cols)
+    
+    for col in numeric_columns:
+        if col in df.columns:
+            if col == '2024 YKS En Küçük Puanı':
+                # YKS puanı için virgülü nokta ile değiştir (ondalık sayı)
+                df[col] = df[col].astype(str).str.replace(',', '.').str.replace(' ', '')
+            else:
+                # Diğer sayılar için virgülü kaldır (tam sayı)
+                df[col] = df[col].astype(str).str.replace(',', '').str.replace(' ', '')
+            
+            # Sayısal değerlere çevir (geçersiz değerler NaN olur)
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+            
+            if data_logger.isEnabledFor(logging.DEBUG):
+                data_logger.debug('✅ %s sütunu düzeltildi, örnek değerler: %s', col, df[col].head().tolist())
+    
+    return compact_universiteler_df(df, raw_memory)
+
+# Az sayıda farklı değeri olan sütunlar kategorik olarak tutulur
+CATEGORICAL_COLUMNS = ['Ülke', 'Şehir', 'Grup', 'Tür', 'Fakülte Adı']
+
+def compact_universiteler_df(df, raw_memory):
+    """Düşük kardinaliteli sütunları kategorik, sayısal sütunları null destekli tiplere çevirir
+
+    raw_memory: ham frame'in sütun bazında bellek kullanımı; df.attrs['memory_report']
+    bununla kompakt halin karşılaştırmasıdır (/api/status -> cache.memory).
+    """
+    df = df.copy()
+    
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    
+    for col in SORTABLE_NUMERIC_COLUMNS:
+        if col in df.columns:
+            values = df[col].astype('Float64')
+            # Tüm değerler tam sayıysa Int64 (Kontenjan, Başarı Sırası), değilse Float64 (YKS puanı)
+            if values.dropna().mod(1).eq(0).all():
+                values = values.astype('Int64')
+            df[col] = values
+    
+    after = df.memory_usage(deep=True, index=False)
+    df.attrs['memory_report'] = memory_report(raw_memory, after)
+    report = df.attrs['memory_report']
+    data_logger.info('📦 Ana veri bellek kullanımı: %.0f KB -> %.0f KB', report['before_bytes'] / 1024, report['after_bytes'] / 1024)
+    return df
+
+def memory_report(before, after):
+    """Sütun bazında önce/sonra bellek kullanımı (byte) raporu"""
+    return {
+        'before_bytes': int(before.sum()),
+        'after_bytes': int(after.sum()),
+        'columns': {
+            col: {'before_bytes': int(before[col]), 'after_bytes': int(after[col])}
+            for col in after.index if before.get(col) != after[col]
+        }
+    }
+
+def build_ders_programi_df(all_values):
+    """Ders programı worksheet değerlerinden DataFrame oluşturur"""
+    if not all_values or len(all_values) < 2:
+        data_logger.error("❌ Ders programı worksheet'inde veri bulunamadı!")
+        return None
+    
+    # Başlıkları al
+    headers = all_values[0]
+    data_logger.debug('📋 Başlıklar: %s', headers)
+    
+    # Sütun isimlerini güncelle
+    updated_headers = []
+    for header in headers:
+        if header == 'GEÇERLİLİK TARİHİ':
+            updated_headers.append('GÜNCELLENME TARİHİ')
+        else:
+            updated_headers.append(header)
+    
+    data_logger.debug('📋 Güncellenmiş başlıklar: %s', updated_headers)
+    
+    # Veri satırlarını al
+    data_rows = all_values[1:]
+    
+    # DataFrame oluştur
+    df = pd.DataFrame(data_rows, columns=updated_headers)
+    data_logger.info("✅ Ders programı worksheet'inden %d satır veri yüklendi", len(df))
+    data_logger.debug('📊 Ders programı başlıkları: %s', list(df.columns))
+    
+    return df
+
+# Veri kaynakları: fetch() rol -> satır listesi döndürür, probe() içerik değiştiğinde
+# değişen kısa bir sürüm anahtarı döndürür (bilinmiyorsa None: her yenilemede tam indirme)
+class SheetsDataSource:
+    """Google Sheets veri kaynağı; değişiklik yoklaması Drive dosya sürümüyle yapılır"""
+
+    name = 'Google Sheets'
+    writable = True
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def probe(self):
+        """Spreadsheet'in Drive sürümü ve değiştirilme zamanı (tek hafif istek, hücre indirilmez)"""
+        spreadsheet = self.manager.get_spreadsheet()
+        if spreadsheet is None:
+            return None
+        with sheets_call('drive_files_get'):
+            metadata = spreadsheet.client.request(
+                'get',
+                f'{DRIVE_FILES_API_V3_URL}/{spreadsheet.id}',
+                params={'fields': 'version,modifiedTime', 'supportsAllDrives': True},
+            ).json()
+        if 'version' not in metadata:
+            return None
+        return f"{metadata['version']}:{metadata.get('modifiedTime', '')}"
+
+    def fetch(self):
         client = get_google_sheets_client()
         if not client:
-            print("❌ Google Sheets bağlantısı kurulamadı!")
+            sheets_logger.error('❌ Google Sheets bağlantısı kurulamadı!')
             return None
         
         SHEET_ID = os.environ.get('GOOGLE_SHEET_ID', '')
         if not SHEET_ID:
-            print("❌ GOOGLE_SHEET_ID environment variable'ı ayarlanmamış!")
+            sheets_logger.error("❌ GOOGLE_SHEET_ID environment variable'ı ayarlanmamış!")
             return None
         
-        # Ana veri worksheet'ini bul (varsayılan olarak ilk worksheet)
-        spreadsheet = client.open_by_key(SHEET_ID)
-        worksheets = spreadsheet.worksheets()
-        
-        print(f"📊 Mevcut worksheet'ler: {[ws.title for ws in worksheets]}")
-        print(f"📊 Toplam worksheet sayısı: {len(worksheets)}")
-        
-        # Ana veri worksheet'ini bul (genellikle ilk worksheet)
-        main_worksheet = None
-        for ws in worksheets:
-            print(f"🔍 Worksheet kontrol ediliyor: '{ws.title}'")
-            # Ana veri worksheet'ini tanımla
-            if ws.title.lower() in ['üniversiteler', 'universiteler', 'ana veri', 'ana_veri', 'main', 'data']:
-                main_worksheet = ws
-                print(f"✅ Ana veri worksheet bulundu: '{ws.title}'")
-                break
-        
-        # Eğer bulunamazsa ilk worksheet'i kullan
-        if not main_worksheet and len(worksheets) > 0:
-            main_worksheet = worksheets[0]  # İlk worksheet
-            print(f"⚠️ Ana veri worksheet bulunamadı, '{main_worksheet.title}' kullanılıyor")
-        
-        if not main_worksheet:
-            print("❌ Ana veri worksheet bulunamadı!")
+        return fetch_sheet_values()
+
+    def invalidate(self):
+        self.manager.invalidate()
+
+class FakeDataSource:
+    """Ağa çıkmayan bellek içi veri kaynağı (yerel deneme ve ölçümler için)
+
+    Her update() çağrısı sürümü artırır; probe/fetch sayaçları kaç tam indirme
+    yapıldığını gösterir. probe_error verilirse probe() onu fırlatır.
+    """
+
+    name = 'Fake'
+    writable = False
+
+    def __init__(self, values):
+        self.values = {role: [list(row) for row in rows] for role, rows in values.items()}
+        self.revision = 1
+        self.probe_count = 0
+        self.fetch_count = 0
+        self.probe_error = None
+
+    def update(self, role, rows):
+        self.values[role] = [list(row) for row in rows]
+        self.revision += 1
+
+    def probe(self):
+        self.probe_count += 1
+        if self.probe_error is not None:
+            raise self.probe_error
+        return str(self.revision)
+
+    def fetch(self):
+        self.fetch_count += 1
+        return {role: [list(row) for row in rows] for role, rows in self.values.items()}
+
+    def invalidate(self):
+        pass
+
+def sheet_cell_text(value):
+    """Dosyadan / veritabanından okunan hücreyi Google Sheets'in döndürdüğü metin biçimine çevirir"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if hasattr(value, 'strftime'):
+        return value.strftime('%d.%m.%Y')
+    return str(value)
+
+def trim_sheet_values(rows):
+    """Sondaki boş hücre ve satırları atıp dikdörtgene tamamlar (Sheets API'nin döndürdüğü biçim)"""
+    trimmed = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] == '':
+            row.pop()
+        trimmed.append(row)
+    while trimmed and not trimmed[-1]:
+        trimmed.pop()
+    return fill_gaps(trimmed)
+
+class FileDataSource:
+    """Yerel dosya veri kaynağı
+
+    .xlsx çalışma kitabında worksheet rolleri Google Sheets'teki gibi seçilir; dizin
+    verilirse her rol için <rol>.csv (universiteler.csv, ders_programi.csv) okunur.
+    Değişiklik yoklaması dosyaların değiştirilme zamanı ve boyutuyla yapılır.
+    """
+
+    name = 'Dosya'
+    writable = False
+
+    def __init__(self, path):
+        self.path = path
+
+    def _csv_files(self):
+        files = {role: os.path.join(self.path, f'{role}.csv') for role in WORKSHEET_ROLE_TITLES}
+        return {role: path for role, path in files.items() if os.path.exists(path)}
+
+    def probe(self):
+        if not self.path or not os.path.exists(self.path):
             return None
-        
-        print(f"🎯 Seçilen ana veri worksheet: '{main_worksheet.title}'")
-        
-        # Ham veriyi al
-        all_values = main_worksheet.get_all_values()
-        
-        print(f"📊 Worksheet'ten alınan satır sayısı: {len(all_values)}")
-        
-        if not all_values or len(all_values) < 2:
-            print("❌ Ana veri worksheet'inde veri bulunamadı!")
+        paths = list(self._csv_files().values()) if os.path.isdir(self.path) else [self.path]
+        stats = [os.stat(path) for path in paths]
+        return ';'.join(f'{stat.st_mtime_ns}:{stat.st_size}' for stat in stats) or None
+
+    def fetch(self):
+        if not self.path or not os.path.exists(self.path):
+            data_logger.error('❌ Veri dosyası bulunamadı: %s', self.path or '(DATA_FILE ayarlanmamış)')
             return None
         
-        # Başlıkları al
-        headers = all_values[0]
-        print(f"📋 Başlıklar: {headers}")
-        
-        # Veri satırlarını al
-        data_rows = all_values[1:]
-        
-        # DataFrame oluştur
-        df = pd.DataFrame(data_rows, columns=headers)
-        print(f'✅ Ana veri worksheet\'inden {len(df)} satır veri yüklendi')
-        print('📊 Ana veri başlıkları:', list(df.columns))
-        
-        # Tekrarlanan sütunları temizle
-        print('🔍 Tekrarlanan sütunlar kontrol ediliyor...')
-        duplicate_columns = df.columns[df.columns.duplicated()].tolist()
-        if duplicate_columns:
-            print(f'⚠️ Tekrarlanan sütunlar bulundu: {duplicate_columns}')
-            # Tekrarlanan sütunları kaldır (ilk olanları tut)
-            df = df.loc[:, ~df.columns.duplicated()]
-            print(f'✅ Tekrarlanan sütunlar kaldırıldı. Yeni sütun sayısı: {len(df.columns)}')
-            print(f'📊 Güncellenmiş başlıklar: {list(df.columns)}')
-        else:
-            print('✅ Tekrarlanan sütun bulunamadı')
-        
-        # Sayısal sütunları düzelt (sıralama için kullanılacak)
-        numeric_columns = ['Kontenjan', '2024 Başarı Sırası', '2024 YKS En Küçük Puanı']
+        if os.path.isdir(self.path):
+            values = {}
+            for role, path in self._csv_files().items():
+                with open(path, newline='', encoding='utf-8-sig') as f:
+                    values[role] = trim_sheet_values(csv.reader(f))
+            return values
         
-        # Metin sütunları (aralık bilgileri için)
-        text_columns = ['2024 YKS Puanı Aralığı', '2024 Başarı Sırası Aralığı']
-        
-        # Aralık sütunlarını kontrol et
-        print('🔍 Aralık sütunları kontrol ediliyor...')
-        for col in text_columns:
-            if col in df.columns:
-                print(f'✅ {col} sütunu bulundu')
-                print(f'   Örnek değerler: {df[col].head().tolist()}')
-            else:
-                print(f'❌ {col} sütunu bulunamadı!')
-                # Benzer isimleri ara
-                similar_cols = [c for c in df.columns if 'aralık' in c.lower() or 'puanı' in c.lower()]
-                if similar_cols:
-                    print(f'   Benzer sütunlar: {similar_cols}')
+        if openpyxl is None:
+            data_logger.error('❌ .xlsx okumak için openpyxl kurulu değil')
+            return None
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            roles = resolve_worksheet_roles(workbook.worksheets)
+            return {
+                role: trim_sheet_values([sheet_cell_text(value) for value in row] for row in ws.iter_rows(values_only=True))
+                for role, ws in roles.items() if ws is not None
+            }
+        finally:
+            workbook.close()
+
+    def invalidate(self):
+        pass
+
+# SQLite tablolarında sayısal sütunların tipi (compact_universiteler_df'in seçtiği dtype'a göre)
+SQLITE_COLUMN_TYPES = {'Int64': 'INTEGER', 'Float64': 'REAL'}
+
+def numeric_sort_order(key, direction):
+    """PresortedIndex ile aynı sıra: boşlar her iki yönde de sonda ve kendi aralarında satır
+    sırasında; azalan sıralama artan permütasyonun tersi olduğundan eşit değerler ters sırada.
+    Aynı ifadeyle kurulan indeks sayesinde sıralama tablo taranmadan yapılır."""
+    return f'{key} IS NULL, {key} {direction}, CASE WHEN {key} IS NULL THEN satir END, satir {direction}'
+
+def turkish_sort_text(value):
+    """turkish_key ile aynı sırayı SQLite'ın ikili (BINARY) karşılaştırmasında veren metin anahtarı"""
+    return ''.join(chr(min(code + 1, 0x10FFFF)) for code in turkish_key(value))
+
+class SqliteDataSource:
+    """İndeksli SQLite veri kaynağı
+
+    Veritabanı `flask import-data` komutuyla doldurulur. Sütunlar sayfadaki sıralarıyla
+    c0, c1, ... olarak saklanır (başlıklar sutunlar tablosunda); sayısal sütunlar tipli
+    tutulur ve arama, Türkçe sıralama ve ders programı eşleştirmesi için türetilmiş sütunlar
+    yazılır. Bu sayede üniversite listesi ve ders programı filtreleri (query_* metotları)
+    bellekteki snapshot'la aynı sonucu SQL üzerinden üretir; sayfalı istekler sadece istenen
+    satırları okur.
+    """
+
+    name = 'SQLite'
+    writable = False
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        """İş parçacığı başına salt okunur bağlantı"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            uri = f'file:{os.path.abspath(self.path)}?mode=ro'
+            conn = sqlite3.connect(uri, uri=True, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _read(self):
+        # Başlıklar ve satırlar aynı okuma işleminde: içe aktarma arada bitse de tutarlı
+        conn = self._connection()
+        if getattr(self._local, 'pinned', False):
+            yield conn
+            return
+        conn.execute('BEGIN')
+        try:
+            yield conn
+        finally:
+            conn.execute('COMMIT')
+
+    def pin(self):
+        """İstek boyunca bu thread'in okumalarını tek işlemde tutar (unpin ile biter)
+
+        Snapshot eşitlemesi (probe / fetch) ve query_* sorguları aynı aktarma revizyonunu görür.
+        """
+        if not os.path.exists(self.path):
+            return False
+        self._connection().execute('BEGIN')
+        self._local.pinned = True
+        return True
+
+    def unpin(self):
+        if getattr(self._local, 'pinned', False):
+            self._local.pinned = False
+            self._local.conn.execute('COMMIT')
+
+    @staticmethod
+    def _headers(conn):
+        headers = defaultdict(list)
+        for table, header in conn.execute('SELECT tablo, baslik FROM sutunlar ORDER BY tablo, sira'):
+            headers[table].append(header)
+        return headers
+
+    def probe(self):
+        if not os.path.exists(self.path):
+            return None
+        row = self._connection().execute("SELECT deger FROM kaynak_bilgisi WHERE anahtar = 'revizyon'").fetchone()
+        return f'sqlite:{row[0]}' if row else None
+
+    def fetch(self):
+        if not os.path.exists(self.path):
+            data_logger.error("❌ SQLite veritabanı bulunamadı: %s ('flask import-data' ile oluşturun)", self.path)
+            return None
         
-        for col in numeric_columns:
-            if col in df.columns:
-                if col == '2024 YKS En Küçük Puanı':
-                    # YKS puanı için virgülü nokta ile değiştir (ondalık sayı)
-                    df[col] = df[col].astype(str).str.replace(',', '.').str.replace(' ', '')
+        values = {}
+        with self._read() as conn:
+            for table, columns in self._headers(conn).items():
+                selected = ', '.join(f'c{i}' for i in range(len(columns)))
+                rows = conn.execute(f'SELECT {selected} FROM {table} ORDER BY satir').fetchall()
+                values[table] = [columns] + [[sheet_cell_text(value) for value in row] for row in rows]
+        return values
+
+    def invalidate(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def import_values(self, values):
+        """Sheets biçimindeki rol -> satır listesi değerlerini tek bir işlemde veritabanına yazar
+
+        Okuyucular işlem bitene kadar eski içeriği görür; revizyon artırılarak
+        çalışan uygulamalara değişiklik bildirilir. Rol başına satır sayısını döndürür.
+        """
+        universiteler_df = build_universiteler_df(values.get('universiteler'))
+        if universiteler_df is None:
+            raise ValueError('Ana veri bulunamadı')
+        frames = {'universiteler': universiteler_df, 'ders_programi': build_ders_programi_df(values.get('ders_programi'))}
+        
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('CREATE TABLE IF NOT EXISTS kaynak_bilgisi (anahtar TEXT PRIMARY KEY, deger TEXT)')
+            row = conn.execute("SELECT deger FROM kaynak_bilgisi WHERE anahtar = 'revizyon'").fetchone()
+            revision = int(row[0]) + 1 if row else 1
+            conn.execute('DROP TABLE IF EXISTS sutunlar')
+            conn.execute('CREATE TABLE sutunlar (tablo TEXT, sira INTEGER, baslik TEXT, PRIMARY KEY (tablo, sira))')
+            
+            counts = {}
+            for table, df in frames.items():
+                conn.execute(f'DROP TABLE IF EXISTS {table}')
+                if df is None:
+                    continue
+                conn.executemany('INSERT INTO sutunlar VALUES (?, ?, ?)', [(table, i, column) for i, column in enumerate(df.columns)])
+                if table == 'universiteler':
+                    self._write_universiteler(conn, df)
                 else:
-                    # Diğer sayılar için virgülü kaldır (tam sayı)
-                    df[col] = df[col].astype(str).str.replace(',', '').str.replace(' ', '')
-                
-                # Sayısal değerlere çevir ve NaN'leri temizle
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-                # NaN değerleri None ile değiştir
-                df[col] = df[col].where(pd.notnull(df[col]), None)
+                    self._write_ders_programi(conn, df)
+                counts[table] = len(df)
+            
+            # Sorgu planlayıcısı için indeks istatistikleri
+            conn.execute('ANALYZE')
+            conn.executemany('INSERT OR REPLACE INTO kaynak_bilgisi VALUES (?, ?)', [
+                ('revizyon', str(revision)),
+                ('aktarma_zamani', datetime.now().isoformat()),
+            ])
+            conn.execute('COMMIT')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return counts
+
+    @staticmethod
+    def _write_universiteler(conn, df):
+        columns = list(df.columns)
+        definitions = [f'c{i} {SQLITE_COLUMN_TYPES.get(str(df[column].dtype), "TEXT")}' for i, column in enumerate(columns)]
+        conn.execute(f'CREATE TABLE universiteler (satir INTEGER PRIMARY KEY, {", ".join(definitions)}, arama TEXT, ad_anahtari TEXT)')
+        
+        names = df['Üniversite Adı'].tolist() if 'Üniversite Adı' in columns else [None] * len(df)
+        placeholders = ', '.join('?' * (len(columns) + 3))
+        conn.executemany(f'INSERT INTO universiteler VALUES ({placeholders})', (
+            (position, *record.values(), normalize_text(name), turkish_sort_text(name))
+            for position, (record, name) in enumerate(zip(dataframe_records(df), names))
+        ))
+        
+        conn.execute('CREATE INDEX universiteler_ad ON universiteler (ad_anahtari, satir)')
+        indexed = [[column] for column in ['Program Kodu', *FACET_COLUMNS.values()]]
+        # Ülke + Şehir: sayfalı yanıtın istatistikleri (GROUP BY) sadece indeksten okunur
+        indexed[1].append('Şehir')
+        for index_columns in indexed:
+            # Baştaki sütun yoksa indeks işe yaramaz; ad tüm sütunlardan (Ülke'siz sayfada Şehir ile çakışmasın)
+            if index_columns[0] not in columns:
+                continue
+            keys = [f'c{columns.index(column)}' for column in index_columns if column in columns]
+            conn.execute(f'CREATE INDEX IF NOT EXISTS universiteler_{"_".join(keys)} ON universiteler ({", ".join(keys)})')
+        for column in SORTABLE_NUMERIC_COLUMNS:
+            if column in columns:
+                i = columns.index(column)
+                for direction in ('ASC', 'DESC'):
+                    conn.execute(f'CREATE INDEX IF NOT EXISTS universiteler_c{i}_{direction.lower()} ON universiteler ({numeric_sort_order(f"c{i}", direction)})')
+
+    @staticmethod
+    def _write_ders_programi(conn, df):
+        """Filtre sütunları için TextColumnMatcher'ın kullandığı biçimler de yazılır:
+        k: kırpılmış küçük harf, t: boşlukla çevrili kelimeler, n: sayısal değer"""
+        columns = list(df.columns)
+        filter_positions = [columns.index(column) for column, _ in DERS_FILTER_RULES.values() if column in columns]
+        derived = [f'k{i} TEXT, t{i} TEXT, n{i} INTEGER' for i in filter_positions]
+        conn.execute(f'CREATE TABLE ders_programi (satir INTEGER PRIMARY KEY, {", ".join(f"c{i} TEXT" for i in range(len(columns)))}'
+                     f'{"".join(", " + d for d in derived)})')
+        
+        def rows():
+            for position, record in enumerate(dataframe_records(df)):
+                values = list(record.values())
+                row = [position, *values]
+                for i in filter_positions:
+                    value = str(values[i]).strip() if values[i] is not None else None
+                    lowered = value.lower() if value is not None else None
+                    number = int(value) if value is not None and value.isdecimal() else None
+                    row += [lowered, f' {" ".join(lowered.split())} ' if lowered is not None else None, number]
+                yield row
+        
+        placeholders = ', '.join('?' * (1 + len(columns) + 3 * len(filter_positions)))
+        conn.executemany(f'INSERT INTO ders_programi VALUES ({placeholders})', rows())
+        for i in filter_positions:
+            conn.execute(f'CREATE INDEX ders_programi_c{i} ON ders_programi (c{i})')
+        if 'DÖNEM' in columns:
+            i = columns.index('DÖNEM')
+            conn.execute(f'CREATE INDEX ders_programi_n{i} ON ders_programi (n{i})')
+
+    def query_universiteler(self, search, filters, sort_by, ascending, page=None):
+        """get_universiteler'in filtre ve sıralamasını SQL'de uygular
+
+        page=None ise tüm kayıtları, page=(offset, limit) ise (sayfa, toplam, istatistikler)
+        döndürür; limit None ise offset'ten sonraki tüm satırlar gelir.
+        """
+        with self._read() as conn:
+            columns = self._headers(conn)['universiteler']
+            where, params = ['1'], []
+            
+            query = normalize_text(search)
+            if query:
+                where.append('instr(arama, ?) > 0')
+                params.append(query)
+            for param, value in filters.items():
+                column = FACET_COLUMNS.get(param)
+                if value and column in columns:
+                    where.append(f'c{columns.index(column)} = ?')
+                    params.append(value)
+            
+            # Filtre varken sıralama indeksi kullanılmasın ('+' ile): planlayıcı aksi halde
+            # tüm tabloyu sıralı indeksten tarayıp filtreliyor; süzülen az satırı sıralamak daha ucuz
+            hint = '' if len(where) == 1 else '+'
+            searched = bool(query)
+            where = ' AND '.join(where)
+            
+            # Bellekteki sıralamayla aynı: boşlar sonda, eşit değerler sayfa sırasında
+            direction = 'ASC' if ascending else 'DESC'
+            if sort_by not in columns:
+                order = f'{hint}satir'
+            elif sort_by == 'Üniversite Adı':
+                order = f'{hint}ad_anahtari {direction}, {hint}satir {direction}'
+            elif sort_by in SORTABLE_NUMERIC_COLUMNS:
+                order = numeric_sort_order(f'{hint}c{columns.index(sort_by)}', direction)
+            else:
+                key = f'{hint}c{columns.index(sort_by)}'
+                order = f'{key} IS NULL, {key} {direction}, {hint}satir'
+            
+            selected = ', '.join(f'c{i}' for i in range(len(columns)))
+            sql = f'SELECT {selected} FROM universiteler WHERE {where} ORDER BY {order}'
+            if page is None:
+                return [dict(zip(columns, row)) for row in conn.execute(sql, params)]
+            
+            # Toplam ve Ülke / Şehir sayıları tek bir gruplamadan
+            # (aramada tablo zaten taranır; Ülke indeksiyle gruplamak her satır için ek okuma demek)
+            grouped = [f'c{columns.index(column)}' if column in columns else 'NULL' for column in ('Ülke', 'Şehir')]
+            grouping = ', '.join(f'+{key}' if searched and key != 'NULL' else key for key in grouped)
+            groups = conn.execute(
+                f'SELECT {", ".join(grouped)}, COUNT(*) FROM universiteler WHERE {where} GROUP BY {grouping}', params
+            ).fetchall()
+            total = sum(count for _, _, count in groups)
+            ulke_count = len({ulke for ulke, _, _ in groups if ulke})
+            sehir_count = len({sehir for _, sehir, _ in groups if sehir})
+            offset, limit = page
+            rows = conn.execute(f'{sql} LIMIT ? OFFSET ?', [*params, -1 if limit is None else limit, offset])
+            return [dict(zip(columns, row)) for row in rows], total, {'ulke_count': ulke_count, 'sehir_count': sehir_count}
+
+    def query_ders_programlari(self, filters):
+        """filter_ders_programlari'nin eşleşme kurallarını (DERS_FILTER_RULES) SQL'de uygular"""
+        with self._read() as conn:
+            columns = self._headers(conn)['ders_programi']
+            where, params = ['1'], []
+            for param, value in filters.items():
+                column, rules = DERS_FILTER_RULES[param]
+                if not value or column not in columns:
+                    continue
+                i = columns.index(column)
+                filter_str = str(value).strip()
+                filter_lower = filter_str.lower()
+                if not filter_str:
+                    where.append('0')
+                    continue
                 
-                print(f'✅ {col} sütunu düzeltildi')
-                print(f'   Örnek değerler: {df[col].head().tolist()}')
+                matches = []
+                if 'contains' in rules:
+                    matches.append(f'instr(k{i}, ?) > 0')
+                    params.append(filter_lower)
+                if 'words' in rules:
+                    words = sorted(set(filter_lower.split()))
+                    matches.append('(' + ' AND '.join(f'instr(t{i}, ?) > 0' for _ in words) + ')')
+                    params.extend(f' {word} ' for word in words)
+                if 'paren_prefix' in rules and '(' in filter_str and ')' in filter_str:
+                    matches.append(f'instr(k{i}, ?) > 0')
+                    params.append(filter_str.split('(')[0].strip().lower())
+                if 'abbreviation' in rules and len(filter_str) >= 3:
+                    matches.append(f'substr(k{i}, 1, ?) = ?')
+                    params.extend([len(filter_lower), filter_lower])
+                if 'number' in rules and filter_str.isdecimal():
+                    matches.append(f'n{i} = ?')
+                    params.append(int(filter_str))
+                # Boş değerler hiçbir filtreyle eşleşmez
+                where.append(f"(k{i} <> '' AND ({' OR '.join(matches)}))")
+            
+            selected = ', '.join(f'c{i}' for i in range(len(columns)))
+            rows = conn.execute(f'SELECT {selected} FROM ders_programi WHERE {" AND ".join(where)} ORDER BY satir', params)
+            return [dict(zip(columns, row)) for row in rows]
+
+# Veri kaynağı seçimi: sheets (varsayılan), file (DATA_FILE) veya sqlite (SQLITE_PATH)
+DATA_SOURCE = os.environ.get('DATA_SOURCE', 'sheets').lower()
+DATA_FILE = os.environ.get('DATA_FILE', '')
+SQLITE_PATH = os.environ.get('SQLITE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data.sqlite3'))
+
+def create_data_source(kind):
+    if kind == 'file':
+        return FileDataSource(DATA_FILE)
+    if kind == 'sqlite':
+        return SqliteDataSource(SQLITE_PATH)
+    if kind != 'sheets':
+        logger.warning("⚠️ Bilinmeyen DATA_SOURCE '%s', Google Sheets kullanılıyor", kind)
+    return SheetsDataSource(sheets_manager)
+
+# Etkin veri kaynağı (yerel denemelerde FakeDataSource ile değiştirilebilir)
+data_source = create_data_source(DATA_SOURCE)
+
+def probe_data_source():
+    return data_source.probe()
+
+# Veri kaynağından tüm veriyi indirme fonksiyonu
+def fetch_all_data():
+    """Ana veri ve ders programı değerlerini veri kaynağından indirip DataFrame'lere çevirir (önbelleksiz)"""
+    try:
+        values = data_source.fetch()
+        if values is None:
+            return None
         
-        # Tüm DataFrame'deki NaN değerleri None ile değiştir
-        df = df.where(pd.notnull(df), None)
+        universiteler_df = build_universiteler_df(values.get('universiteler'))
+        if universiteler_df is None:
+            return None
         
-        return df
+        return {
+            'universiteler': universiteler_df,
+            'ders_programi': build_ders_programi_df(values.get('ders_programi')),
+        }
         
+    except SheetsBusyError:
+        # Yük altında sağlam oturum atılmaz; SnapshotCache eski snapshot'ı sunmaya devam eder
+        raise
     except Exception as e:
-        print(f'❌ Ana veri yükleme hatası: {e}')
-        import traceback
-        traceback.print_exc()
+        data_logger.exception('❌ Veri yükleme hatası: %s', e)
+        data_source.invalidate()
         return None
 
 
+# Arama için metin normalizasyonu (küçük harf + aksan/nokta işaretlerini kaldır)
+def normalize_text(s):
+    if s is None or (not isinstance(s, str) and pd.isna(s)):
+        return ''
+    s = str(s).strip().lower()
+    s = unicodedata.normalize('NFKD', s)
+    s = ''.join([c for c in s if not unicodedata.combining(c)])
+    return s
+
+SEARCH_NGRAM_SIZE = 3
+EMPTY_POSITIONS = np.empty(0, dtype=np.int64)
+
+class NgramSearchIndex:
+    """Normalize edilmiş değerler üzerinde n-gram ters indeksi (alt dizi araması için)
+
+    Aynı isim birçok programda tekrarlandığından indeks farklı isimler üzerinde
+    kurulur; eşleşen isimler daha sonra satır konumlarına açılır.
+    """
+
+    def __init__(self, values, n=SEARCH_NGRAM_SIZE):
+        self.n = n
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+        self.normalized = [normalize_text(v) for v in uniques]
+
+        # Her farklı isim için satır konumları
+        order = np.argsort(codes, kind='stable')
+        boundaries = np.flatnonzero(np.diff(codes[order])) + 1
+        self.rows_by_value = np.split(order, boundaries) if len(order) else []
+
+        # 1..n uzunluğundaki tüm n-gram'lar: n'den kısa sorgular da indeksten cevaplanır
+        postings = defaultdict(set)
+        for value_id, text in enumerate(self.normalized):
+            for size in range(1, n + 1):
+                for i in range(len(text) - size + 1):
+                    postings[text[i:i + size]].add(value_id)
+        self.postings = {gram: np.array(sorted(ids), dtype=np.int64) for gram, ids in postings.items()}
+
+    def search(self, query):
+        """Sorguyu alt dizi olarak içeren satırların konumlarını (artan sırada) döndürür"""
+        query = normalize_text(query)
+        if not query:
+            return None
+        
+        if len(query) <= self.n:
+            value_ids = self.postings.get(query, EMPTY_POSITIONS)
+        else:
+            grams = {query[i:i + self.n] for i in range(len(query) - self.n + 1)}
+            posting_lists = sorted((self.postings.get(gram, EMPTY_POSITIONS) for gram in grams), key=len)
+            candidates = posting_lists[0]
+            for posting_list in posting_lists[1:]:
+                if not len(candidates):
+                    break
+                candidates = np.intersect1d(candidates, posting_list, assume_unique=True)
+            # n-gram kesişimi sadece aday kümesidir; gerçek alt dizi kontrolü
+            value_ids = [value_id for value_id in candidates if query in self.normalized[value_id]]
+        
+        if not len(value_ids):
+            return EMPTY_POSITIONS
+        return np.sort(np.concatenate([self.rows_by_value[value_id] for value_id in value_ids]))
+
+# Türkçe katlama: normalize_text'e ek olarak noktasız ı da i'ye indirgenir (ışık == isik)
+def turkish_fold(s):
+    return normalize_text(s).replace('ı', 'i')
+
+SUGGEST_DEFAULT_LIMIT = 10
+SUGGEST_MAX_LIMIT = int(os.environ.get('SUGGEST_MAX_LIMIT', 20))
+SUGGEST_FIELDS = ['Üniversite Adı', 'Program Adı', 'Program Kodu']
+
+class PrefixSuggestIndex:
+    """Otomatik tamamlama için sıralı önek indeksi
+
+    İsmin başından eşleşmeler önce, isimdeki diğer kelimelerin başından
+    eşleşmeler sonra gelir; her iki liste de ikili arama ile taranır.
+    """
+
+    def __init__(self, df):
+        self.values = {
+            field: [None if v is None or (not isinstance(v, str) and pd.isna(v)) else v for v in df[field].tolist()]
+            if field in df.columns else [None] * len(df)
+            for field in SUGGEST_FIELDS
+        }
+        names = [turkish_fold(v) for v in self.values['Üniversite Adı']]
+        programs = [turkish_fold(v) for v in self.values['Program Adı']]
+
+        name_entries = []
+        word_entries = []
+        for row, name in enumerate(names):
+            if not name:
+                continue
+            name_entries.append((name, programs[row], row))
+            # İsimdeki her kelime başlangıcından itibaren son ek
+            for i in range(1, len(name)):
+                if name[i - 1] == ' ' and name[i] != ' ':
+                    word_entries.append((name[i:], programs[row], row))
+        name_entries.sort()
+        word_entries.sort()
+        self.name_keys = [key for key, _, _ in name_entries]
+        self.name_rows = [row for _, _, row in name_entries]
+        self.word_keys = [key for key, _, _ in word_entries]
+        self.word_rows = [row for _, _, row in word_entries]
+
+    def suggest(self, query, limit):
+        """Önekle eşleşen en fazla `limit` satırın öneri kayıtlarını döndürür"""
+        prefix = turkish_fold(query)
+        if not prefix or limit <= 0:
+            return []
+        
+        rows = []
+        seen = set()
+        for keys, key_rows in ((self.name_keys, self.name_rows), (self.word_keys, self.word_rows)):
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and len(rows) < limit and keys[i].startswith(prefix):
+                row = key_rows[i]
+                if row not in seen:
+                    seen.add(row)
+                    rows.append(row)
+                i += 1
+        return [{field: self.values[field][row] for field in SUGGEST_FIELDS} for row in rows]
+
+
+def dumps_json(obj):
+    """Nesneyi UTF-8 JSON byte dizisine çevirir"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def json_bytes_response(body, status=200):
+    """Önceden serileştirilmiş JSON byte'larını doğrudan yanıt olarak döndürür (Content-Length otomatik)"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
+def dataframe_records(df):
+    """DataFrame'i JSON'a hazır kayıt listesine çevirir (NaN -> None)"""
+    return df.astype(object).where(df.notna(), None).to_dict('records')
+
+# Filtre parametresi -> sütun eşlemesi
+FACET_COLUMNS = {'ulke': 'Ülke', 'sehir': 'Şehir', 'grup': 'Grup', 'tur': 'Tür'}
+
+class FacetIndex:
+    """Bir filtre sütunu için tam sayı kodları ve değer başına paketlenmiş bit maskeleri"""
+
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Kategorik sütunlarda kodlar zaten hazır
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        self.size = len(series)
+        # Kod 0 boş (None/NaN) değerler içindir, değerler 1'den başlar
+        self.codes = (codes + 1).astype(np.int32)
+        self.values = [str(value) for value in uniques]
+        self.value_ids = {value: i for i, value in enumerate(self.values)}
+        self.sorted_ids = sorted(range(len(self.values)), key=self.values.__getitem__)
+        self.bitmaps = [np.packbits(self.codes == i + 1) for i in range(len(self.values))]
+        self.empty_bitmap = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def bitmap(self, value):
+        value_id = self.value_ids.get(value)
+        return self.bitmaps[value_id] if value_id is not None else self.empty_bitmap
+
+    def counts(self, mask=None):
+        """Maskedeki satırlar için değer başına satır sayıları (sıralı sözlük)"""
+        codes = self.codes if mask is None else self.codes[mask]
+        counts = np.bincount(codes, minlength=len(self.values) + 1)
+        return {self.values[i]: int(counts[i + 1]) for i in self.sorted_ids if counts[i + 1]}
+
+class FacetEngine:
+    """Ülke/Şehir/Grup/Tür filtreleri için bit maskesi kesişimine dayalı facet motoru"""
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.facets = {param: FacetIndex(df[column]) for param, column in FACET_COLUMNS.items() if column in df.columns}
+
+    def mask(self, filters):
+        """Seçili filtre değerlerinin kesişimini bool maske olarak döndürür (filtre yoksa None)"""
+        selection = None
+        for param, value in filters.items():
+            facet = self.facets.get(param)
+            if not value or facet is None:
+                continue
+            bitmap = facet.bitmap(value)
+            selection = bitmap if selection is None else selection & bitmap
+        if selection is None:
+            return None
+        return np.unpackbits(selection, count=self.size).view(bool)
+
+    def options(self, param, mask=None):
+        """Facet seçenekleri ve sayıları; mask verilirse sadece o satırlar sayılır"""
+        facet = self.facets.get(param)
+        if facet is None:
+            return [], {}
+        counts = facet.counts(mask)
+        return list(counts), counts
+
+class ProgramCodeIndex:
+    """Program Kodu -> satır konumu sözlüğü ve detay sayfası için temizlenmiş kayıtlar"""
+
+    def __init__(self, df, records):
+        self.positions = {}
+        self.duplicates = {}
+        self.details = {}
+        codes = df['Program Kodu'].tolist() if 'Program Kodu' in df.columns else []
+        
+        for position, code in enumerate(codes):
+            key = str(code).strip() if code is not None else ''
+            if not key:
+                continue
+            if key in self.positions:
+                self.duplicates.setdefault(key, [self.positions[key]]).append(position)
+                continue
+            self.positions[key] = position
+            # Detay için: boş metinler None, metinler kırpılmış
+            self.details[key] = {
+                column: (value.strip() or None) if isinstance(value, str) else value
+                for column, value in records[position].items()
+            }
+        
+        if self.duplicates:
+            examples = ', '.join(f"{code} (satır {', '.join(str(p + 2) for p in positions)})"
+                                 for code, positions in list(self.duplicates.items())[:10])
+            data_logger.warning('⚠️ Tekrarlanan Program Kodu bulundu (%d adet), ilk kayıt kullanılacak: %s', len(self.duplicates), examples)
+
+    def get_detail(self, program_kodu):
+        return self.details.get(str(program_kodu).strip())
+
+class SheetRowIndex:
+    """Program Kodu -> kaynak sayfadaki satır numarası (başlık 1. satır, veri 2. satırdan başlar)
+
+    Snapshot'tan kurulur ve yazma işlemleriyle birlikte güncellenir: silinen satırın
+    altındakiler bir yukarı kayar, eklenen satır sona yazılır. Yazmadan önce satırın hâlâ
+    beklenen kodu taşıdığı doğrulanır; tutmazsa sayfadan yeniden kurulur (reset).
+    """
+
+    def __init__(self, codes):
+        self._lock = threading.Lock()
+        self.reset(codes)
+
+    def reset(self, codes):
+        with self._lock:
+            self.codes = [str(code).strip() if code is not None else '' for code in codes]
+            self._rebuild()
+
+    def _rebuild(self):
+        # Aynı kod birden fazla satırda varsa ilk satır kullanılır
+        self.rows = {}
+        for offset, code in enumerate(self.codes):
+            if code:
+                self.rows.setdefault(code, offset + 2)
+
+    def row(self, program_kodu):
+        return self.rows.get(str(program_kodu).strip())
+
+    def deleted(self, row_index):
+        """delete_rows sonrası: satır çıkarılır, altındaki satırlar bir yukarı kayar"""
+        with self._lock:
+            if 2 <= row_index < len(self.codes) + 2:
+                del self.codes[row_index - 2]
+                self._rebuild()
+
+    def appended(self, program_kodu, row_index):
+        """append_row sonrası: kod, sayfanın bildirdiği satıra yazılır (aradaki boş satırlar korunur)"""
+        with self._lock:
+            code = str(program_kodu).strip()
+            offset = row_index - 2
+            if offset < len(self.codes):
+                self.codes[offset] = code
+                self._rebuild()
+                return
+            self.codes.extend([''] * (offset - len(self.codes)))
+            self.codes.append(code)
+            self.rows.setdefault(code, row_index)
+
+    def updated(self, row_index, program_kodu):
+        """Satırın Program Kodu değiştiğinde eşlemeyi günceller"""
+        with self._lock:
+            offset = row_index - 2
+            code = str(program_kodu).strip()
+            if 0 <= offset < len(self.codes) and self.codes[offset] != code:
+                self.codes[offset] = code
+                self._rebuild()
+
+
+# Ders programı filtreleri: parametre -> (sütun, eşleşme kuralları)
+# Tam eşleşme her durumda 'contains' kuralının özel halidir
+DERS_FILTER_RULES = {
+    'universite': ('ÜNİVERSİTE', ('contains', 'words', 'paren_prefix')),
+    'bolum': ('BÖLÜM', ('contains', 'words', 'paren_prefix')),
+    'donem': ('DÖNEM', ('contains', 'number')),
+    'ders_grubu': ('DERS GRUBU', ('contains', 'words', 'abbreviation')),
+    'ders_alt_grubu': ('DERS ALT GRUBU', ('contains', 'words', 'abbreviation')),
+}
+
+class TextColumnMatcher:
+    """Bir metin sütunu için önceden hesaplanmış küçük harf değerler ve kelime indeksleri
+
+    Kurallar sütundaki farklı değerler üzerinde bir kez değerlendirilir, sonuç
+    tam sayı kodlar üzerinden satır maskesine dönüştürülür.
+    """
+
+    def __init__(self, series):
+        stripped = series.map(lambda v: str(v).strip(), na_action='ignore')
+        codes, uniques = pd.factorize(stripped)
+        self.codes = (codes + 1).astype(np.int32)  # 0: boş (NaN) satırlar
+        self.values = list(uniques)
+        self.lowered = [value.lower() for value in self.values]
+        
+        postings = defaultdict(list)
+        for value_id, text in enumerate(self.lowered):
+            for token in set(text.split()):
+                postings[token].append(value_id)
+        self.token_postings = {token: np.array(ids, dtype=np.int64) for token, ids in postings.items()}
+
+    def _matching_values(self, filter_str, rules):
+        filter_lower = filter_str.lower()
+        matched = np.zeros(len(self.values), dtype=bool)
+        
+        # 1-2. Tam eşleşme / içeriyor kontrolü (büyük/küçük harf duyarsız)
+        if 'contains' in rules:
+            matched |= np.fromiter((filter_lower in text for text in self.lowered), dtype=bool, count=len(self.lowered))
+        
+        # 3. Kelime bazında eşleşme: filtredeki tüm kelimeler değerde geçmeli
+        if 'words' in rules:
+            filter_words = set(filter_lower.split())
+            candidates = None
+            for word in filter_words:
+                ids = self.token_postings.get(word)
+                if ids is None:
+                    candidates = EMPTY_POSITIONS
+                    break
+                candidates = ids if candidates is None else np.intersect1d(candidates, ids, assume_unique=True)
+            if candidates is not None:
+                matched[candidates] = True
+        
+        # 4a. Parantezli ifadeler: parantez öncesi kısım değerde geçmeli
+        if 'paren_prefix' in rules and '(' in filter_str and ')' in filter_str:
+            base_filter = filter_str.split('(')[0].strip().lower()
+            matched |= np.fromiter((base_filter in text for text in self.lowered), dtype=bool, count=len(self.lowered))
+        
+        # 4b. Kısaltma kontrolü (MATEMATİK -> MAT): değer filtreyle başlamalı
+        if 'abbreviation' in rules and len(filter_str) >= 3:
+            matched |= np.fromiter((text.startswith(filter_lower) for text in self.lowered), dtype=bool, count=len(self.lowered))
+        
+        # Sayısal eşleşme (1 == 01); isdigit() '²' gibi int()'in çeviremediği rakamları da kabul eder
+        if 'number' in rules and filter_str.isdecimal():
+            matched |= np.fromiter((value.isdecimal() and int(value) == int(filter_str) for value in self.values),
+                                   dtype=bool, count=len(self.values))
+        
+        # Boş değerler hiçbir filtreyle eşleşmez
+        matched &= np.fromiter((bool(value) for value in self.values), dtype=bool, count=len(self.values))
+        return matched
+
+    def match(self, filter_value, rules):
+        """Filtreyle eşleşen satırlar için bool maske döndürür"""
+        filter_str = str(filter_value).strip()
+        if not filter_str:
+            return np.zeros(len(self.codes), dtype=bool)
+        matched_codes = np.concatenate([[False], self._matching_values(filter_str, rules)])
+        return matched_codes[self.codes]
+
+class DersProgramiMatcher:
+    """Ders programı filtreleri için snapshot başına kurulan eşleştirici"""
+
+    def __init__(self, df):
+        self.size = len(df)
+        self.columns = {
+            column: TextColumnMatcher(df[column])
+            for column, _ in DERS_FILTER_RULES.values() if column in df.columns
+        }
+
+    def match(self, param, value):
+        column, rules = DERS_FILTER_RULES[param]
+        return self.columns[column].match(value, rules)
+
+
+# Veri önbelleği ayarları (saniye)
+DATA_CACHE_TTL = int(os.environ.get('DATA_CACHE_TTL', 300))
+DATA_CACHE_RETRY_INTERVAL = int(os.environ.get('DATA_CACHE_RETRY_INTERVAL', 30))
+
+# Son geçerli snapshot'ın yazıldığı dizin (boş bırakılırsa diske yazılmaz)
+SNAPSHOT_DIR = os.environ.get('SNAPSHOT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+# Diğer worker'ların yayınladığı yeni snapshot'ın ne sıklıkla kontrol edileceği (saniye)
+SNAPSHOT_POLL_INTERVAL = float(os.environ.get('SNAPSHOT_POLL_INTERVAL', 5))
+
+def frames_digest(frames):
+    """DataFrame içeriklerinden kısa bir özet (hash) üretir"""
+    hasher = hashlib.blake2b(digest_size=8)
+    for name, df in sorted(frames.items()):
+        hasher.update(name.encode('utf-8'))
+        if df is None:
+            continue
+        hasher.update('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+        hasher.update(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    return hasher.hexdigest()
+
+class DataSnapshot:
+    """Temizlenmiş verinin (ana veri + ders programı) sürümlü, salt okunur kopyası
+
+    prebuilt verilirse PERSISTED_INDEXES'teki yapılar yeniden kurulmaz (diskteki snapshot).
+    """
+
+    # Kurulumu en pahalı olan ve SnapshotStore'un tablolarla birlikte sakladığı yapılar
+    PERSISTED_INDEXES = ('suggest_index', 'records', 'ders_records')
+
+    def __init__(self, frames, version, digest, prebuilt=None):
+        self.frames = frames
+        self.df = frames['universiteler']
+        self.ders_df = frames.get('ders_programi')
+        self.version = version
+        self.digest = digest
+        self.loaded_at = time.time()
+        # İçeriğin son değiştiği an (aynı içerikle yenilemede korunur; Last-Modified için)
+        self.created_at = self.loaded_at
+        # Verinin kaynaktan indirilmeye başlandığı an: bundan önce yapılan yazmaları içerir
+        self.fetched_at = 0.0
+        # Verinin geldiği yer: 'sheets' (veri kaynağından canlı yenileme), 'disk' (kayıtlı snapshot) veya 'write' (yazma sonrası)
+        self.source = 'sheets'
+        # Veri kaynağının bu içerik için bildirdiği sürüm anahtarı (probe)
+        self.source_token = None
+        self._payloads = {}
+        self._payloads_lock = threading.RLock()
+        
+        # Snapshot başına bir kez kurulan arama indeksi
+        names = self.df['Üniversite Adı'] if 'Üniversite Adı' in self.df.columns else pd.Series([None] * len(self.df))
+        self.search_index = NgramSearchIndex(names.tolist())
+        prebuilt = prebuilt or {}
+        self.suggest_index = prebuilt['suggest_index'] if 'suggest_index' in prebuilt else PrefixSuggestIndex(self.df)
+        self.sort_index = PresortedIndex(self.df)
+        
+        # JSON'a hazır kayıtlar: istek başına NaN temizliği yapılmaz
+        self.records = prebuilt['records'] if 'records' in prebuilt else dataframe_records(self.df)
+        self.program_index = ProgramCodeIndex(self.df, self.records)
+        # Yazma işlemleri için kaynak sayfa satır numaraları (DataFrame satırı i -> sayfa satırı i + 2)
+        self.sheet_rows = SheetRowIndex(self.df['Program Kodu'].tolist() if 'Program Kodu' in self.df.columns else [])
+        self.facets = FacetEngine(self.df)
+        
+        # Ders programı için eşleştirici ve JSON'a hazır kayıtlar
+        self.ders_matcher = DersProgramiMatcher(self.ders_df) if self.ders_df is not None else None
+        if 'ders_records' in prebuilt:
+            self.ders_records = prebuilt['ders_records']
+        else:
+            self.ders_records = dataframe_records(self.ders_df) if self.ders_df is not None else None
+
+    @property
+    def age(self):
+        return time.time() - self.loaded_at
+
+    def payload(self, key, builder):
+        """Bu snapshot sürümü için bir kez üretilip saklanan yanıt gövdesi (builder None dönerse saklanmaz)"""
+        body = self._payloads.get(key)
+        if body is None:
+            with self._payloads_lock:
+                body = self._payloads.get(key)
+                if body is None:
+                    RESPONSE_CACHE.labels('payload', 'miss').inc()
+                    body = builder()
+                    if body is not None:
+                        self._payloads[key] = body
+                    return body
+        RESPONSE_CACHE.labels('payload', 'hit').inc()
+        return body
+
+class SnapshotStore:
+    """Temizlenmiş DataFrame'leri Feather (Arrow IPC) dosyaları olarak yayınlayan/okuyan depo
+
+    Tablolar içerik özetiyle adlandırılan değişmez dosyalara sıkıştırılmadan yazılır.
+    Geçerli snapshot'ı gösteren snapshot.json en son ve os.replace ile yazılır: aynı dizini kullanan tüm
+    worker'lar yeni sürüme tek adımda geçer, yarım yazılmış bir snapshot görmez.
+
+    Kurulumu pahalı indeksler (DataSnapshot.PERSISTED_INDEXES) tabloların yanına pickle
+    olarak yazılır; okuyucu onları yeniden kurmaz. Biçimi INDEX_FORMAT'tan farklı veya
+    okunamayan bir dosya yok sayılır ve indeksler tablolardan kurulur.
+
+    Depo kaynaktan çekmeyi worker'lar arasında paylaştırır, belleği değil: her worker
+    tabloları ve indeksleri kendi belleğine okur.
+    """
+
+    META_FILE = 'snapshot.json'
+    LOCK_FILE = 'refresh.lock'
+    # İndeks sınıflarının yapısı değiştiğinde artırılır (eski dosyalar kullanılmaz)
+    INDEX_FORMAT = 1
+
+    def __init__(self, directory, poll_interval=5):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.last_saved_at = None
+        self.last_error = None
+        self._seen_mtime = None
+        self._last_poll = 0.0
+
+    @property
+    def enabled(self):
+        return bool(self.directory) and feather is not None
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def _write_atomic(self, filename, write):
+        path = self._path(filename)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _write_meta(self, meta):
+        def write(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(meta, f, ensure_ascii=False)
+        self._write_atomic(self.META_FILE, write)
+        self._seen_mtime = os.stat(self._path(self.META_FILE)).st_mtime_ns
+
+    def _remove_stale_tables(self, keep):
+        for filename in os.listdir(self.directory):
+            if filename.endswith(('.feather', '.pickle')) and filename not in keep:
+                try:
+                    os.remove(self._path(filename))
+                except OSError:
+                    pass
+
+    @contextmanager
+    def refresh_lock(self, blocking=False):
+        """Kaynaktan çekme hakkı için dosya kilidi; alınamazsa False verir (başka worker yeniliyor)"""
+        if not self.enabled or fcntl is None:
+            yield True
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(self.LOCK_FILE), 'a') as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def save(self, snapshot):
+        """Snapshot'ı yayınlar; hata olursa sadece kaydedilir (servis etkilenmez)"""
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            header = {'version': snapshot.version, 'digest': snapshot.digest}
+            previous = self.peek()
+            tables = {}
+            for name, df in snapshot.frames.items():
+                if df is None:
+                    continue
+                filename = f'{name}-{snapshot.digest}.feather'
+                tables[name] = filename
+                if os.path.exists(self._path(filename)):
+                    continue
+                table = pa.Table.from_pandas(df)
+                metadata = dict(table.schema.metadata or {})
+                metadata[b'snapshot'] = json.dumps(header).encode('utf-8')
+                table = table.replace_schema_metadata(metadata)
+                # Sıkıştırmasız: okurken açma maliyeti yok
+                self._write_atomic(filename, lambda path: feather.write_feather(table, path, compression='uncompressed'))
+            
+            indexes = f'indexes-{snapshot.digest}.pickle'
+            if not os.path.exists(self._path(indexes)):
+                payload = {
+                    **header,
+                    'format': self.INDEX_FORMAT,
+                    'indexes': {name: getattr(snapshot, name) for name in DataSnapshot.PERSISTED_INDEXES},
+                }
+                
+                def write_indexes(path):
+                    with open(path, 'wb') as f:
+                        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+                self._write_atomic(indexes, write_indexes)
+            
+            self._write_meta({
+                **header,
+                'created_at': snapshot.created_at,
+                'refreshed_at': snapshot.loaded_at,
+                'fetched_at': snapshot.fetched_at,
+                'source_token': snapshot.source_token,
+                'tables': tables,
+                'indexes': indexes,
+                'memory_report': snapshot.df.attrs.get('memory_report'),
+            })
+            # Bir önceki sürümün dosyaları, o sürümü okumakta olan worker'lar için tutulur
+            keep = {*tables.values(), indexes, *(previous or {}).get('tables', {}).values(), (previous or {}).get('indexes')}
+            self._remove_stale_tables(keep)
+            self.last_saved_at = time.time()
+            self.last_error = None
+        except Exception as e:
+            self.last_error = str(e)
+            cache_logger.warning('⚠️ Snapshot diske yazılamadı: %s', e)
+
+    def touch(self, snapshot):
+        """İçerik değişmeden yenilenen snapshot'ın tazelik zamanını günceller"""
+        if not self.enabled:
+            return
+        meta = self.peek()
+        if meta is None or meta.get('digest') != snapshot.digest:
+            self.save(snapshot)
+            return
+        try:
+            meta['refreshed_at'] = snapshot.loaded_at
+            meta['fetched_at'] = snapshot.fetched_at
+            meta['source_token'] = snapshot.source_token
+            self._write_meta(meta)
+        except Exception as e:
+            self.last_error = str(e)
+            cache_logger.warning('⚠️ Snapshot zamanı güncellenemedi: %s', e)
+
+    def peek(self):
+        """Yayınlanmış snapshot'ın üst bilgisini döndürür (tabloları okumaz)"""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._path(self.META_FILE), encoding='utf-8') as f:
+                self._seen_mtime = os.fstat(f.fileno()).st_mtime_ns
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.last_error = str(e)
+            cache_logger.warning('⚠️ Snapshot bilgisi okunamadı: %s', e)
+            return None
+
+    def has_update(self):
+        """snapshot.json son okunduğundan beri değiştiyse True (en fazla poll_interval'da bir bakılır)"""
+        if not self.enabled:
+            return False
+        now = time.time()
+        if now - self._last_poll < self.poll_interval:
+            return False
+        self._last_poll = now
+        try:
+            return os.stat(self._path(self.META_FILE)).st_mtime_ns != self._seen_mtime
+        except OSError:
+            return False
+
+    def load(self):
+        """Yayınlanmış son snapshot'ı okur (yoksa veya tutarsızsa None)"""
+        meta = self.peek()
+        if meta is None:
+            return None
+        try:
+            frames = {'ders_programi': None}
+            for name, filename in meta['tables'].items():
+                table = feather.read_table(self._path(filename))
+                header = json.loads(table.schema.metadata[b'snapshot'])
+                if header['digest'] != meta['digest']:
+                    cache_logger.warning('⚠️ Diskteki %s tablosu snapshot ile uyuşmuyor, kullanılmıyor', name)
+                    return None
+                frames[name] = table.to_pandas()
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.last_error = str(e)
+            cache_logger.warning('⚠️ Diskteki snapshot okunamadı: %s', e)
+            return None
+        
+        if frames.get('universiteler') is None:
+            return None
+        frames['universiteler'].attrs['memory_report'] = meta.get('memory_report')
+        snapshot = DataSnapshot(frames, meta['version'], meta['digest'], prebuilt=self._load_indexes(meta))
+        snapshot.created_at = meta['created_at']
+        snapshot.loaded_at = meta['refreshed_at']
+        snapshot.fetched_at = meta.get('fetched_at', 0.0)
+        snapshot.source = 'disk'
+        snapshot.source_token = meta.get('source_token')
+        return snapshot
+
+    def _load_indexes(self, meta):
+        """Snapshot ile birlikte yazılmış indeksler; yoksa veya uyuşmuyorsa None (yeniden kurulur)"""
+        if not meta.get('indexes'):
+            return None
+        try:
+            with open(self._path(meta['indexes']), 'rb') as f:
+                payload = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            cache_logger.warning('⚠️ Diskteki indeksler okunamadı, yeniden kurulacak: %s', e)
+            return None
+        if payload.get('format') != self.INDEX_FORMAT or payload.get('digest') != meta['digest']:
+            return None
+        return payload['indexes']
+
+    def status(self):
+        return {
+            'enabled': self.enabled,
+            'directory': self.directory or None,
+            'last_saved_at': datetime.fromtimestamp(self.last_saved_at).isoformat() if self.last_saved_at else None,
+            'last_error': self.last_error,
+        }
+
+class SnapshotCache:
+    """Süre dolunca eski snapshot'ı sunarken arka planda yenileyen önbellek
+
+    probe verilirse yenilemeden önce kaynağın sürüm anahtarına bakılır; değişmediyse tam
+    indirme yapılmaz. store verilirse her başarılı yenileme diske yazılır; açılışta ve kaynak erişilemezken
+    diskteki son snapshot kullanılır. Aynı dizini paylaşan worker'lardan sadece yenileme
+    kilidini alan kaynaktan çeker, diğerleri yayınlanan snapshot'a geçer.
+    """
+
+    def __init__(self, loader, ttl, retry_interval, name, store=None, probe=None):
+        self.loader = loader
+        self.probe = probe
+        self.skipped_downloads = 0
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.name = name
+        self.store = store
+        self.snapshot = None
+        self.last_error = None
+        self.last_attempt = 0.0
+        self.invalidated_at = 0.0
+        self.refreshing = False
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        # apply ile sıraya alınan (zaman, değişiklik) çiftleri
+        self._pending_changes = []
+        self._applying = False
+
+    def get(self):
+        """Geçerli snapshot'ı döndürür; yoksa senkron olarak yükler"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            # İlk yükleme: aynı anda gelen istekler tek bir indirmeyi bekler
+            with self._load_lock:
+                if self.snapshot is None:
+                    # Diskte snapshot varsa hemen onu sun; eskiyse bir sonraki istek arka planda yeniler
+                    self._load_from_store()
+                if self.snapshot is None and time.time() - self.last_attempt >= self.retry_interval:
+                    self._refresh()
+            return self.snapshot
+
+        if snapshot.age >= self.ttl:
+            self._start_background_refresh()
+        elif self.store is not None and self.store.has_update():
+            # Başka bir worker yeni bir snapshot yayınladı
+            self._start_background_refresh(force=True)
+        return snapshot
+
+    def invalidate(self):
+        """Bir sonraki istekte yenilemeyi tetikler (eski snapshot sunulmaya devam eder)
+
+        Bu andan önce yayınlanmış snapshot'lar benimsenmez; yenileme kaynağa gider.
+        """
+        snapshot = self.snapshot
+        if snapshot is not None:
+            snapshot.loaded_at = 0.0
+        self.last_attempt = 0.0
+        self.invalidated_at = time.time()
+
+    def refresh_for(self, token):
+        """Snapshot kaynağın token sürümünde değilse arka planda kaynaktan yeniler
+
+        Yenileme bitene kadar eski snapshot sunulmaya devam eder. Paylaşılan depo ve yenileme
+        kilidi atlanır: yerel kaynaklarda (SQLite) her worker okuduğu revizyondan kurar.
+        Başarısız yenileme retry_interval dolmadan tekrarlanmaz.
+        """
+        snapshot = self.snapshot
+        if snapshot is None or snapshot.source_token == token:
+            return
+        self._start_background_refresh(force=self.last_error is None, target=self._sync)
+
+    def _sync(self):
+        self.last_attempt = time.time()
+        self.last_error = None
+        self._fetch()
+
+    def _start_background_refresh(self, force=False, target=None):
+        with self._lock:
+            if self.refreshing or (not force and time.time() - self.last_attempt < self.retry_interval):
+                return
+            self.refreshing = True
+        thread = threading.Thread(target=self._background_refresh, args=(target or self._refresh,),
+                                  name=f'{self.name}-refresh', daemon=True)
+        thread.start()
+
+    def _background_refresh(self, target):
+        try:
+            with self._load_lock:
+                target()
+        finally:
+            with self._lock:
+                self.refreshing = False
+
+    def _load_from_store(self):
+        if self.store is None:
+            return
+        snapshot = self.store.load()
+        if snapshot is not None:
+            self.snapshot = snapshot
+            self._observe('disk')
+            cache_logger.info('💾 %s snapshot v%d diskten yüklendi (%.0f sn önce yenilenmiş)', self.name, snapshot.version, snapshot.age)
+
+    def _adopt_published(self):
+        """Yayınlanmış snapshot tazeyse ona geçer (kaynaktan çekmeye gerek kalmaz)"""
+        meta = self.store.peek()
+        if meta is None or time.time() - meta['refreshed_at'] >= self.ttl:
+            return False
+        if meta['refreshed_at'] <= self.invalidated_at:
+            # Geçersizlemeden önce doğrulanmış: aynı eski veriye geri dönülmesin
+            return False
+        current = self.snapshot
+        if current is not None and current.digest == meta['digest']:
+            current.loaded_at = max(current.loaded_at, meta['refreshed_at'])
+            current.source_token = meta.get('source_token')
+            self._observe('adopted')
+            return True
+        snapshot = self.store.load()
+        if snapshot is None:
+            return False
+        self.snapshot = snapshot
+        self._observe('adopted')
+        cache_logger.info('🔄 %s snapshot v%d paylaşılan depodan alındı', self.name, snapshot.version)
+        return True
+
+    def _refresh(self):
+        self.last_attempt = time.time()
+        self.last_error = None
+        if self.store is None:
+            self._fetch()
+            return
+        
+        if self._adopt_published():
+            return
+        # İlk yüklemede kilidi bekle: yenileyen worker bitirince onun snapshot'ı kullanılır
+        with self.store.refresh_lock(blocking=self.snapshot is None) as acquired:
+            if not acquired:
+                # Başka bir worker kaynaktan çekiyor; yayınladığında buradan alınır
+                return
+            if self._adopt_published():
+                return
+            self._fetch()
+
+    def _probe(self):
+        """Kaynağın sürüm anahtarı; yoklama desteklenmiyor veya başarısızsa None"""
+        if self.probe is None:
+            return None
+        try:
+            return self.probe()
+        except SheetsBusyError:
+            raise
+        except Exception as e:
+            cache_logger.warning('⚠️ %s değişiklik yoklaması başarısız, tam indirme yapılacak: %s', self.name, e)
+            return None
+
+    def _fetch(self):
+        started = time.perf_counter()
+        # Sürüm anahtarı indirmeden önce alınır: arada gelen değişiklik bir sonraki yoklamada görülür
+        try:
+            token = self._probe()
+        except SheetsBusyError as e:
+            # Tam indirme de aynı sıraya gireceği için bu deneme atlanır
+            self._fetch_failed(str(e))
+            return
+        previous = self.snapshot
+        if token is not None and previous is not None and previous.source_token == token:
+            previous.loaded_at = time.time()
+            self.skipped_downloads += 1
+            if self.store is not None:
+                self.store.touch(previous)
+            self._observe('unchanged')
+            cache_logger.info('✅ %s kaynakta değişiklik yok, snapshot v%d korunuyor', self.name, previous.version)
+            return
+        
+        fetched_at = time.time()
+        try:
+            frames = self.loader()
+        except Exception as e:
+            frames = None
+            self.last_error = str(e)
+        if frames is None:
+            self._fetch_failed(self.last_error or 'Veri kaynağından boş yanıt alındı')
+            return
+
+        digest = frames_digest(frames)
+        previous = self.snapshot
+        if previous is not None and previous.digest == digest:
+            # İçerik değişmedi: sürümü koru, sadece tazelik süresini yenile
+            previous.loaded_at = time.time()
+            previous.fetched_at = fetched_at
+            previous.source = 'sheets'
+            previous.source_token = token
+            version = previous.version
+            if self.store is not None:
+                self.store.touch(previous)
+            self._observe('unchanged')
+        else:
+            version = self._next_version()
+            snapshot = DataSnapshot(frames, version, digest)
+            snapshot.source_token = token
+            snapshot.fetched_at = fetched_at
+            self.snapshot = snapshot
+            if self.store is not None:
+                self.store.save(snapshot)
+            self._observe('downloaded')
+        self.last_error = None
+        row_counts = ', '.join(f'{name}: {len(df) if df is not None else 0}' for name, df in frames.items())
+        cache_logger.info('✅ %s snapshot v%d hazır (%s satır, %.2f sn)', self.name, version, row_counts, time.perf_counter() - started)
+
+    def _fetch_failed(self, error):
+        self.last_error = error
+        DATA_REFRESHES.labels('failed').inc()
+        if self.snapshot is None:
+            self._load_from_store()
+        if self.snapshot is not None:
+            cache_logger.warning('⚠️ %s yenilenemedi, son geçerli snapshot (v%d) kullanılmaya devam ediliyor', self.name, self.snapshot.version)
+
+    def _observe(self, result):
+        """Yenileme sonucunu ve sunulan snapshot'ın sürüm / tazeliğini metriklere yansıtır"""
+        DATA_REFRESHES.labels(result).inc()
+        snapshot = self.snapshot
+        if snapshot is not None:
+            SNAPSHOT_VERSION.set(snapshot.version)
+            SNAPSHOT_REFRESHED.set(snapshot.loaded_at)
+
+    def _next_version(self):
+        version = self.snapshot.version + 1 if self.snapshot is not None else 1
+        if self.store is not None:
+            # Sürüm numaraları worker'lar arasında tutarlı kalsın
+            published = self.store.peek()
+            if published is not None:
+                version = max(version, published['version'] + 1)
+        return version
+
+    def apply(self, change):
+        """Yazma işleminin sonucunu arka planda yeni bir snapshot sürümü olarak yayınlar (write-through)
+
+        change(frames) değiştirilmiş yeni frames sözlüğünü döndürür. Değişiklik sıraya alınır
+        ve hemen dönülür; arka plandaki uygulayıcı sıradaki tüm değişiklikleri en son
+        snapshot'ın üzerine uygular ve indeksleri bir kez kurar. İndirmesi değişiklikten sonra
+        başlamış bir snapshot onu zaten içerdiğinden değişiklik atlanır. Yayınlanan snapshot
+        diğer worker'lar için geçersizleme sinyalidir; bu sadece SNAPSHOT_DIR ayarlı ve pyarrow
+        kuruluyken çalışır, aksi halde diğer worker'lar yazmayı TTL dolunca görür. Başarısız
+        olursa bir sonraki istekte yenileme tetiklenir.
+        """
+        with self._lock:
+            self._pending_changes.append((time.time(), change))
+            if self._applying:
+                return
+            self._applying = True
+        thread = threading.Thread(target=self._apply_pending, name=f'{self.name}-apply', daemon=True)
+        thread.start()
+
+    def _apply_pending(self):
+        while True:
+            # Devam eden bir yenileme varsa önce o beklenir; bu sırada gelen yazmalar birlikte uygulanır
+            with self._load_lock:
+                with self._lock:
+                    pending, self._pending_changes = self._pending_changes, []
+                    if not pending:
+                        self._applying = False
+                        return
+                self._apply_changes(pending)
+
+    def _apply_changes(self, pending):
+        current = self.snapshot
+        if current is None:
+            return
+        changes = [change for queued_at, change in pending if queued_at >= current.fetched_at]
+        if not changes:
+            return
+        started = time.perf_counter()
+        try:
+            frames = current.frames
+            for change in changes:
+                frames = change(frames)
+            snapshot = DataSnapshot(frames, self._next_version(), frames_digest(frames))
+        except Exception as e:
+            cache_logger.exception('⚠️ %s snapshot yazma sonrası güncellenemedi, yeniden yüklenecek: %s', self.name, e)
+            self.invalidate()
+            return
+        
+        # Kaynak sürümü bilinmiyor: bir sonraki yoklama tam indirmeyle doğrular
+        snapshot.source = 'write'
+        snapshot.fetched_at = current.fetched_at
+        # Yazmalarla güncel tutulan satır indeksi yeni snapshot'a taşınır
+        snapshot.sheet_rows = current.sheet_rows
+        self.snapshot = snapshot
+        if self.store is not None:
+            self.store.save(snapshot)
+        self._observe('write')
+        cache_logger.info('✅ %s snapshot v%d %d yazma sonrası güncellendi (%.2f sn)', self.name, snapshot.version, len(changes), time.perf_counter() - started)
+
+    def wait_for_writes(self, timeout=None):
+        """Sıradaki yazmalar snapshot'a uygulanana kadar bekler; süre dolarsa False"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            with self._lock:
+                if not self._applying:
+                    return True
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+
+    def status(self):
+        snapshot = self.snapshot
+        return {
+            'version': snapshot.version if snapshot is not None else None,
+            'digest': snapshot.digest if snapshot is not None else None,
+            'age_seconds': round(snapshot.age, 1) if snapshot is not None else None,
+            'source': snapshot.source if snapshot is not None else None,
+            'source_token': snapshot.source_token if snapshot is not None else None,
+            'skipped_downloads': self.skipped_downloads,
+            'loaded_at': datetime.fromtimestamp(snapshot.loaded_at).isoformat() if snapshot is not None else None,
+            'ttl_seconds': self.ttl,
+            'duplicate_program_codes': len(snapshot.program_index.duplicates) if snapshot is not None else 0,
+            'memory': snapshot.df.attrs.get('memory_report') if snapshot is not None else None,
+            'worker_max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'refreshing': self.refreshing,
+            'applying_writes': self._applying,
+            'last_error': self.last_error,
+            'disk': self.store.status() if self.store is not None else None,
+        }
+
+data_cache = SnapshotCache(fetch_all_data, DATA_CACHE_TTL, DATA_CACHE_RETRY_INTERVAL, 'Veri',
+                           store=SnapshotStore(SNAPSHOT_DIR, SNAPSHOT_POLL_INTERVAL),
+                           probe=probe_data_source)
+
+# Ana veri yükleme fonksiyonu
+def load_data():
+    """Ana veri yükleme fonksiyonu - önbellekteki snapshot'ı döndürür"""
+    snapshot = data_cache.get()
+    return snapshot.df if snapshot is not None else None
+
+
 # Türkçe sıralama anahtarı
 TURKISH_ALPHABET = 'a b c ç d e f g ğ h ı i j k l m n o ö p r s ş t u ü v y z'.split()
 TURKISH_ORDER = {char: idx for idx, char in enumerate(TURKISH_ALPHABET)}
@@ -203,25 +2144,252 @@ def turkish_key(s):
     s = str(s).lower()
     return [TURKISH_ORDER.get(char, ord(char)) for char in s]
 
+def turkish_collation_ranks(values):
+    """Her değer için Türkçe alfabe sırasını koruyan tam sayı sıralama anahtarı üretir"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=False)
+    keys = [turkish_key(value) for value in uniques]
+    unique_ranks = np.empty(len(uniques), dtype=np.int32)
+    rank = -1
+    previous_key = None
+    for unique_id in sorted(range(len(uniques)), key=keys.__getitem__):
+        # Aynı anahtara sahip farklı yazımlar ('A' / 'a') aynı sırayı paylaşır
+        if keys[unique_id] != previous_key:
+            rank += 1
+            previous_key = keys[unique_id]
+        unique_ranks[unique_id] = rank
+    return unique_ranks[codes]
+
+# Sayısal sıralama sütunları
+SORTABLE_NUMERIC_COLUMNS = ['2024 Başarı Sırası', '2024 YKS En Küçük Puanı', 'Kontenjan']
+
+class PresortedIndex:
+    """Sıralanabilir sütunlar için snapshot başına bir kez hesaplanan sıralama permütasyonları
+
+    Boş (NaN) değerler pandas sort_values gibi her iki yönde de sonda kalır.
+    """
+
+    def __init__(self, df):
+        self.name_ranks = None
+        self.permutations = {}
+        
+        if 'Üniversite Adı' in df.columns:
+            self.name_ranks = turkish_collation_ranks(df['Üniversite Adı'].tolist())
+            self._add('Üniversite Adı', self.name_ranks, len(df))
+        
+        for col in SORTABLE_NUMERIC_COLUMNS:
+            if col in df.columns:
+                values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+                self._add(col, values, int(np.count_nonzero(~np.isnan(values))))
+
+    def _add(self, column, keys, valid_count):
+        ascending = np.argsort(keys, kind='stable')
+        descending = np.concatenate([ascending[:valid_count][::-1], ascending[valid_count:]])
+        self.permutations[column] = (ascending, descending)
+
+    def order(self, column, ascending=True):
+        """Sütun için tüm satırların sıralı konumlarını döndürür (yoksa None)"""
+        permutations = self.permutations.get(column)
+        if permutations is None:
+            return None
+        return permutations[0] if ascending else permutations[1]
+
+# Okuma API'leri için Cache-Control değerleri (uç nokta başına CACHE_CONTROL_<AD> ile değiştirilebilir)
+API_CACHE_CONTROL = os.environ.get('API_CACHE_CONTROL', 'public, no-cache')
+CACHE_CONTROL_ENDPOINTS = [
+    'universiteler', 'universiteler_suggest', 'filtreler', 'sehirler', 'dinamik_filtreler',
+    'universite_detay', 'ders_programlari', 'ders_programlari_filtreler',
+]
+CACHE_CONTROL = {
+    name: os.environ.get(f'CACHE_CONTROL_{name.upper()}', API_CACHE_CONTROL)
+    for name in CACHE_CONTROL_ENDPOINTS
+}
+
+# Yanıt sıkıştırma: bu boyutun altındaki gövdeler sıkıştırılmaz (byte)
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+# Snapshot başına bir kez sıkıştırılan gövdeler daha yüksek, istek başına sıkıştırılanlar hızlı
+# seviyede. Önceden sıkıştırma her kodlamanın ilk isteğinde yapılır: br 9 / gzip 9, 100k satırlık
+# ders programında bu isteği yaklaşık bir saniye bekletiyordu (br 5 / gzip 6 ile ~0.25 sn)
+PRECOMPRESS_LEVELS = {'br': 5, 'gzip': 6}
+DYNAMIC_COMPRESS_LEVELS = {'br': 4, 'gzip': 5}
+ETAG_ENCODING_SUFFIXES = {'br': '-br', 'gzip': '-gz'}
+
+def negotiate_encoding():
+    """Accept-Encoding başlığına göre kullanılacak sıkıştırmayı seçer (yoksa None)"""
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+def compress_body(body, encoding, levels):
+    """Gövdeyi verilen kodlamayla sıkıştırır; gzip zaman damgası sabit tutulur (aynı girdi = aynı çıktı)"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=levels['br'])
+    return gzip.compress(body, compresslevel=levels['gzip'], mtime=0)
+
+def encode_payload(body, encoding, levels=PRECOMPRESS_LEVELS):
+    """(gövde, uygulanan kodlama) çifti; küçük gövdeler veya kodlama yoksa olduğu gibi döner"""
+    if encoding is None or len(body) < COMPRESS_MIN_SIZE:
+        return body, None
+    return compress_body(body, encoding, levels), encoding
+
+@app.after_request
+def compress_response(response):
+    """Önceden sıkıştırılmamış büyük JSON yanıtlarını istek anında sıkıştırır"""
+    if response.mimetype != 'application/json' or response.direct_passthrough:
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+    
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+    body, applied = encode_payload(response.get_data(), encoding, DYNAMIC_COMPRESS_LEVELS)
+    if applied is not None:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = applied
+    return response
+
+@app.before_request
+def pin_data_source():
+    # SQLite: bir API isteğinin tüm SQL sorguları ve ETag'i aynı aktarma revizyonundan gelsin
+    # (HTML ve statik dosya istekleri veritabanına dokunmaz)
+    if request.path.startswith('/api/') and isinstance(data_source, SqliteDataSource) and data_source.pin():
+        g.pinned_source = data_source
+
+@app.teardown_request
+def unpin_data_source(exc):
+    source = g.pop('pinned_source', None)
+    if source is not None:
+        source.unpin()
+
+def current_snapshot():
+    """data_cache.get(); SQLite kaynağında isteğin gördüğü revizyon g.source_token'a yazılır
+
+    Snapshot o revizyonda değilse arka planda yeniden kurulur; bu sırada facet / detay
+    yanıtları eski snapshot'tan gelir, doğrulayıcılar ise revizyonla birlikte değişir.
+    """
+    snapshot = data_cache.get()
+    source = g.get('pinned_source')
+    if snapshot is not None and source is not None:
+        token = source.probe()
+        g.source_token = token
+        if token is not None and token != snapshot.source_token:
+            data_cache.refresh_for(token)
+    return snapshot
+
+def request_snapshot():
+    """İsteğe sabitlenmiş snapshot (ETag ile yanıt gövdesi aynı sürümden üretilir)"""
+    snapshot = g.get('snapshot')
+    return snapshot if snapshot is not None else current_snapshot()
+
+def snapshot_etag(snapshot, name):
+    """Snapshot içeriği, uç nokta, yol ve normalize edilmiş sorgu parametrelerinden güçlü ETag"""
+    hasher = hashlib.blake2b(digest_size=12)
+    hasher.update(f'{snapshot.digest}\x1f{g.get("source_token")}\x1f{name}\x1f{request.path}'.encode('utf-8'))
+    for key, values in sorted(request.args.lists()):
+        hasher.update(f'\x1e{key}={chr(31).join(values)}'.encode('utf-8'))
+    return hasher.hexdigest()
+
+def conditional_get(name, precompress=False):
+    """Okuma API'lerine ETag / Last-Modified ekler; değişmemişse gövde üretmeden 304 döndürür
+
+    precompress=True ise parametresiz (filtresiz) istekte gövde her kodlama için snapshot
+    başına bir kez üretilip sıkıştırılır ve sonraki isteklerde bellekten sunulur.
+    """
+    cache_control = CACHE_CONTROL[name]
+    
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            snapshot = current_snapshot()
+            if snapshot is None:
+                return view(*args, **kwargs)
+            
+            g.snapshot = snapshot
+            encoding = negotiate_encoding()
+            # Her kodlama ayrı bir gösterim olduğundan ETag'i de ayrıdır
+            etag = snapshot_etag(snapshot, name) + ETAG_ENCODING_SUFFIXES.get(encoding, '')
+            # Snapshot yenilenirken SQL daha yeni bir revizyondan okur: tarih bilinmediği için
+            # Last-Modified gönderilmez, If-Modified-Since'e 304 verilmez
+            stale = g.get('source_token', snapshot.source_token) != snapshot.source_token
+            last_modified = None if stale else datetime.fromtimestamp(int(snapshot.created_at), timezone.utc)
+            
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                RESPONSE_CACHE.labels('conditional', 'not_modified').inc()
+                response = app.response_class(status=304)
+            elif precompress and not request.args:
+                RESPONSE_CACHE.labels('conditional', 'full').inc()
+                failed = []
+                
+                def build():
+                    rendered = make_response(view(*args, **kwargs))
+                    if rendered.status_code != 200:
+                        failed.append(rendered)
+                        return None
+                    return encode_payload(rendered.get_data(), encoding)
+                
+                cached = snapshot.payload(f'{name}:{request.path}:{encoding}', build)
+                # Hata yanıtları saklanmaz ve doğrulayıcı almaz
+                if cached is None:
+                    return failed[0]
+                body, applied = cached
+                response = app.response_class(body, mimetype='application/json')
+                if applied is not None:
+                    response.headers['Content-Encoding'] = applied
+            else:
+                RESPONSE_CACHE.labels('conditional', 'full').inc()
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            response.headers['Cache-Control'] = cache_control
+            response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+    return decorator
+
+def conditional_page(template, **context):
+    """HTML sayfaları: her ziyarette doğrulanır, içerik değişmediyse 304 döner"""
+    response = make_response(render_template(template, **context))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.add_etag()
+    return response.make_conditional(request)
+
 @app.route('/')
 def index():
-    response = make_response(render_template('index.html'))
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    return response
+    return conditional_page('index.html')
+
 
 
+# Sayfalı listede tek istekte dönebilecek en fazla kayıt; limit verilmeden offset / fields
+# ile gelen istekler varsayılan sayfa boyutuyla sınırlanır
+UNIVERSITELER_MAX_LIMIT = int(os.environ.get('UNIVERSITELER_MAX_LIMIT', 500))
+UNIVERSITELER_DEFAULT_LIMIT = min(int(os.environ.get('UNIVERSITELER_DEFAULT_LIMIT', 100)), UNIVERSITELER_MAX_LIMIT)
+
+def page_bounds():
+    """İstekteki (offset, limit); limit her zaman UNIVERSITELER_MAX_LIMIT ile sınırlıdır"""
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = request.args.get('limit', UNIVERSITELER_DEFAULT_LIMIT, type=int)
+    return offset, max(0, min(limit, UNIVERSITELER_MAX_LIMIT))
+
+def count_non_empty_unique(df, column, positions):
+    if column not in df.columns:
+        return 0
+    values = df[column].iloc[positions]
+    return int(values[values.notna() & (values != '')].nunique())
 
 @app.route('/api/universiteler')
+@conditional_get('universiteler', precompress=True)
 def get_universiteler():
     try:
-        df = load_data()
-        if df is None:
+        snapshot = request_snapshot()
+        if snapshot is None:
             return jsonify({'error': 'Veri yüklenemedi'}), 500
+        df = snapshot.df
             
-        print('Toplam üniversite:', len(df))
-        print(df[['Üniversite Adı', 'Şehir', 'Grup']].head(10))
+        api_logger.debug('Toplam üniversite: %d', len(df))
         
         # Filtreleme parametreleri
         search = request.args.get('search', '').lower()
@@ -232,222 +2400,381 @@ def get_universiteler():
         sort_by = request.args.get('sort_by', 'Üniversite Adı')
         sort_order = request.args.get('sort_order', 'asc')
         
-        # Sıralama öncesi: sayısal sütunları dönüştür (sıralama için kullanılacak)
-        for col in ['2024 YKS En Küçük Puanı', '2024 Başarı Sırası', 'Kontenjan']:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-                # NaN değerleri None ile değiştir
-                df[col] = df[col].where(pd.notnull(df[col]), None)
-
-        # Arama filtresi (normalize)
-        def normalize(s):
-            if pd.isna(s):
-                return ''
-            s = str(s).strip().lower()
-            s = unicodedata.normalize('NFKD', s)
-            s = ''.join([c for c in s if not unicodedata.combining(c)])
-            return s
-
-        if search:
-            search_norm = normalize(search)
-            df = df[df['Üniversite Adı'].apply(normalize).str.contains(search_norm)]
+        if isinstance(data_source, SqliteDataSource):
+            return query_universiteler_response(df, search, {'ulke': ulke, 'sehir': sehir, 'grup': grup, 'tur': tur}, sort_by, sort_order)
         
-        # Ülke filtresi
-        if ulke:
-            df = df[df['Ülke'] == ulke]
+        # Filtreler snapshot satırları üzerinde bir maske olarak birleştirilir;
+        # önbellekteki DataFrame paylaşıldığı için yerinde değiştirilmez
+        mask = np.ones(len(df), dtype=bool)
         
-        # Şehir filtresi
-        if sehir:
-            df = df[df['Şehir'] == sehir]
+        # Arama filtresi (normalize edilmiş isimler üzerindeki n-gram indeksinden)
+        if search:
+            positions = snapshot.search_index.search(search)
+            if positions is not None:
+                search_mask = np.zeros(len(df), dtype=bool)
+                search_mask[positions] = True
+                mask &= search_mask
+        
+        # Ülke / Şehir / Grup / Tür filtreleri (facet bit maskelerinin kesişimi)
+        facet_mask = snapshot.facets.mask({'ulke': ulke, 'sehir': sehir, 'grup': grup, 'tur': tur})
+        if facet_mask is not None:
+            mask &= facet_mask
+        
+        # Sıralama: önceden hesaplanmış permütasyon maske ile süzülür
+        ascending = sort_order != 'desc'
+        if sort_by not in df.columns:
+            sort_by = 'Üniversite Adı'
+            ascending = True
+        
+        order = snapshot.sort_index.order(sort_by, ascending)
+        if order is not None:
+            positions = order[mask[order]]
+        else:
+            # Permütasyonu olmayan sütunlar (ör. Şehir) için filtrelenmiş satırları sırala
+            # (snapshot DataFrame'i RangeIndex ile kurulduğundan index = satır konumu);
+            # eşit değerler sayfa sırasını korur, böylece sayfalar arası sıra da sabit kalır
+            positions = df[mask].sort_values(by=sort_by, ascending=ascending, kind='stable').index.to_numpy()
         
-        # Grup filtresi
-        if grup:
-            df = df[df['Grup'] == grup]
+        records = snapshot.records
         
-        # Tür filtresi
-        if tur and 'Tür' in df.columns:
-            df = df[df['Tür'] == tur]
+        # Sayfalama/alan seçimi istenmediyse eski davranış: tüm kayıtlar dizi olarak
+        if not any(arg in request.args for arg in ('limit', 'offset', 'fields')):
+            return jsonify([records[i] for i in positions])
         
-        # Sıralama
-        if sort_by in df.columns:
-            if sort_by == 'Üniversite Adı':
-                df = df.sort_values(by=sort_by, key=lambda col: col.map(turkish_key), ascending=(sort_order != 'desc'))
-            else:
-                df = df.sort_values(by=sort_by, ascending=(sort_order != 'desc'))
+        offset, limit = page_bounds()
+        page_positions = positions[offset:offset + limit]
+        
+        # Alan seçimi: sadece bilinen sütunlar
+        fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip() in df.columns]
+        if fields:
+            page = [{field: records[i][field] for field in fields} for i in page_positions]
         else:
-            df = df.sort_values(by='Üniversite Adı', key=lambda col: col.map(turkish_key))
-
-        # Tüm NaN değerleri None ile değiştir
-        df = df.where(pd.notnull(df), None)
+            page = [records[i] for i in page_positions]
         
-        # DataFrame'i JSON'a çevir
-        result = df.to_dict('records')
+        return jsonify({
+            'data': page,
+            'total': len(positions),
+            'limit': limit,
+            'offset': offset,
+            'stats': {
+                'ulke_count': count_non_empty_unique(df, 'Ülke', positions),
+                'sehir_count': count_non_empty_unique(df, 'Şehir', positions),
+            }
+        })
         
-        # Son kontrol: None değerleri kontrol et
-        for record in result:
-            for key, value in record.items():
-                if pd.isna(value) or (isinstance(value, (int, float)) and value != value):
-                    record[key] = None
+    except Exception as e:
+        api_logger.exception('Üniversiteler hatası: %s', e)
+        return jsonify({'error': 'Üniversiteler alınırken hata oluştu'}), 500
+
+def query_universiteler_response(df, search, filters, sort_by, sort_order):
+    """get_universiteler'in SQLite karşılığı: filtre, sıralama ve sayfalama veritabanında yapılır"""
+    ascending = sort_order != 'desc'
+    if sort_by not in df.columns:
+        sort_by = 'Üniversite Adı'
+        ascending = True
+    
+    if not any(arg in request.args for arg in ('limit', 'offset', 'fields')):
+        return jsonify(data_source.query_universiteler(search, filters, sort_by, ascending))
+    
+    offset, limit = page_bounds()
+    page, total, stats = data_source.query_universiteler(search, filters, sort_by, ascending, page=(offset, limit))
+    
+    fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip() in df.columns]
+    if fields:
+        page = [{field: record[field] for field in fields} for record in page]
+    
+    return jsonify({
+        'data': page,
+        'total': total,
+        'limit': limit,
+        'offset': offset,
+        'stats': stats,
+    })
+
+@app.route('/api/universiteler/suggest')
+@conditional_get('universiteler_suggest')
+def get_universiteler_suggest():
+    """Arama kutusu için hafif öneri listesi (sunucu tarafında sınırlandırılmış)"""
+    try:
+        snapshot = request_snapshot()
+        if snapshot is None:
+            return jsonify({'error': 'Veri yüklenemedi'}), 500
+        
+        query = request.args.get('q', '')
+        limit = request.args.get('limit', SUGGEST_DEFAULT_LIMIT, type=int)
+        limit = max(0, min(limit, SUGGEST_MAX_LIMIT))
         
-        return jsonify(result)
+        return jsonify(snapshot.suggest_index.suggest(query, limit))
         
     except Exception as e:
-        print(f'Üniversiteler hatası: {e}')
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': 'Üniversiteler alınırken hata oluştu'}), 500
+        api_logger.exception('Öneri hatası: %s', e)
+        return jsonify({'error': 'Öneriler alınırken hata oluştu'}), 500
 
 @app.route('/api/filtreler')
+@conditional_get('filtreler', precompress=True)
 def get_filtreler():
     try:
-        df = load_data()
-        if df is None:
+        snapshot = request_snapshot()
+        if snapshot is None:
             return jsonify({'error': 'Veri yüklenemedi'}), 500
         
-        # NaN değerleri temizle
-        df = df.where(pd.notnull(df), None)
-        
-        ulkeler = sorted([str(u) for u in df['Ülke'].unique() if u is not None])
-        sehirler = sorted([str(s) for s in df['Şehir'].unique() if s is not None])
-        gruplar = sorted([str(g) for g in df['Grup'].unique() if g is not None])
-        
-        # Tür sütunu varsa ekle
-        turler = []
-        if 'Tür' in df.columns:
-            turler = sorted([str(t) for t in df['Tür'].unique() if t is not None])
-        
+        # Facet seçenekleri snapshot yüklenirken hesaplanır (Tür sütunu yoksa boş liste)
+        facets = snapshot.facets
         return jsonify({
-            'ulkeler': ulkeler,
-            'sehirler': sehirler,
-            'gruplar': gruplar,
-            'turler': turler
+            'ulkeler': facets.options('ulke')[0],
+            'sehirler': facets.options('sehir')[0],
+            'gruplar': facets.options('grup')[0],
+            'turler': facets.options('tur')[0]
         })
     except Exception as e:
-        print(f'Filtreler hatası: {e}')
+        api_logger.exception('Filtreler hatası: %s', e)
         return jsonify({'error': 'Filtreler alınırken hata oluştu'}), 500
 
 @app.route('/api/sehirler')
+@conditional_get('sehirler')
 def get_sehirler():
     try:
-        df = load_data()
-        if df is None:
+        snapshot = request_snapshot()
+        if snapshot is None:
             return jsonify({'error': 'Veri yüklenemedi'}), 500
             
         ulke = request.args.get('ulke', '')
         
-        # NaN değerleri temizle
-        df = df.where(pd.notnull(df), None)
-        
-        if ulke:
-            # Belirli ülkeye göre şehirler
-            filtered_df = df[df['Ülke'] == ulke]
-            sehirler = sorted([str(s) for s in filtered_df['Şehir'].unique() if s is not None])
-        else:
-            # Tüm şehirler
-            sehirler = sorted([str(s) for s in df['Şehir'].unique() if s is not None])
+        # Belirli ülkeye göre şehirler (ülke yoksa tüm şehirler)
+        mask = snapshot.facets.mask({'ulke': ulke})
+        sehirler, _ = snapshot.facets.options('sehir', mask)
         
         return jsonify({
             'sehirler': sehirler
         })
     except Exception as e:
-        print(f'Şehirler hatası: {e}')
+        api_logger.exception('Şehirler hatası: %s', e)
         return jsonify({'error': 'Şehirler alınırken hata oluştu'}), 500
 
 @app.route('/api/dinamik-filtreler')
+@conditional_get('dinamik_filtreler', precompress=True)
 def get_dinamik_filtreler():
     try:
-        df = load_data()
-        if df is None:
+        snapshot = request_snapshot()
+        if snapshot is None:
             return jsonify({'error': 'Veri yüklenemedi'}), 500
         
-        # NaN değerleri temizle
-        df = df.where(pd.notnull(df), None)
-        
         # Mevcut filtreleri al
-        ulke = request.args.get('ulke', '')
-        sehir = request.args.get('sehir', '')
-        grup = request.args.get('grup', '')
-        tur = request.args.get('tur', '')
+        filters = {param: request.args.get(param, '') for param in FACET_COLUMNS}
         
-        # DataFrame'i mevcut filtrelere göre filtrele
-        filtered_df = df.copy()
-        
-        if ulke:
-            filtered_df = filtered_df[filtered_df['Ülke'] == ulke]
-        if sehir:
-            filtered_df = filtered_df[filtered_df['Şehir'] == sehir]
-        if grup:
-            filtered_df = filtered_df[filtered_df['Grup'] == grup]
-        if tur and 'Tür' in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df['Tür'] == tur]
-        
-        # Filtrelenmiş veriye göre seçenekleri döndür
-        result = {
-            'ulkeler': sorted([str(u) for u in df['Ülke'].unique() if u is not None]),  # Ülkeler her zaman tam liste
-            'sehirler': sorted([str(s) for s in filtered_df['Şehir'].unique() if s is not None]),
-            'gruplar': sorted([str(g) for g in filtered_df['Grup'].unique() if g is not None]),
-        }
+        # Seçili filtrelerin bit maskesi kesişimi (DataFrame kopyalanmaz)
+        facets = snapshot.facets
+        mask = facets.mask(filters)
         
-        # Tür sütunu varsa ekle
-        if 'Tür' in filtered_df.columns:
-            result['turler'] = sorted([str(t) for t in filtered_df['Tür'].unique() if t is not None])
-        else:
-            result['turler'] = []
+        # Ülkeler her zaman tam liste, diğerleri filtrelenmiş satırlara göre
+        ulkeler, ulke_sayilari = facets.options('ulke')
+        sehirler, sehir_sayilari = facets.options('sehir', mask)
+        gruplar, grup_sayilari = facets.options('grup', mask)
+        turler, tur_sayilari = facets.options('tur', mask)
         
-        return jsonify(result)
+        return jsonify({
+            'ulkeler': ulkeler,
+            'sehirler': sehirler,
+            'gruplar': gruplar,
+            'turler': turler,
+            'sayilar': {
+                'ulkeler': ulke_sayilari,
+                'sehirler': sehir_sayilari,
+                'gruplar': grup_sayilari,
+                'turler': tur_sayilari
+            }
+        })
     except Exception as e:
-        print(f'Dinamik filtreler hatası: {e}')
+        api_logger.exception('Dinamik filtreler hatası: %s', e)
         return jsonify({'error': 'Dinamik filtreler alınırken hata oluştu'}), 500
 
 @app.route('/api/universite/<program_kodu>')
+@conditional_get('universite_detay')
 def get_universite_detay(program_kodu):
     try:
-        df = load_data()
-        if df is None:
+        snapshot = request_snapshot()
+        if snapshot is None:
             return jsonify({'error': 'Veri yüklenemedi'}), 500
-            
-        # Program Kodu'nu string olarak karşılaştır, boşlukları kırp
-        universite = df[df['Program Kodu'].astype(str).str.strip() == str(program_kodu).strip()]
-
-        if universite.empty:
+        
+        # Program Kodu sözlüğünden sabit zamanlı arama (kayıtlar yüklemede temizlendi)
+        universite_data = snapshot.program_index.get_detail(program_kodu)
+        if universite_data is None:
             return jsonify({'error': 'Üniversite bulunamadı'}), 404
-
-        # NaN değerleri güvenli bir şekilde temizle
-        universite_data = universite.iloc[0].to_dict()
-        
-        # Tüm değerleri güvenli hale getir
-        cleaned_data = {}
-        for key, value in universite_data.items():
-            if pd.isna(value):
-                cleaned_data[key] = None
-            elif isinstance(value, (int, float)) and (pd.isna(value) or value != value):  # NaN kontrolü
-                cleaned_data[key] = None
-            elif isinstance(value, str):
-                # Boş string kontrolü
-                cleaned_data[key] = value.strip() if value.strip() else None
-            else:
-                cleaned_data[key] = value
         
-        return jsonify(cleaned_data)
+        return jsonify(universite_data)
         
     except Exception as e:
-        print(f'Üniversite detay hatası: {e}')
-        import traceback
-        traceback.print_exc()
+        api_logger.exception('Üniversite detay hatası: %s', e)
         return jsonify({'error': 'Üniversite detayları alınırken hata oluştu'}), 500
 
 @app.route('/detay/<program_kodu>')
 def detay_sayfasi(program_kodu):
-    response = make_response(render_template('detay.html', program_kodu=program_kodu))
-    response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '0'
-    return response
+    return conditional_page('detay.html', program_kodu=program_kodu)
+
+# Program Kodu sütununun varsayılan konumu (B); başlık satırıyla doğrulanır
+PROGRAM_KODU_DEFAULT_COLUMN = 2
+
+def read_program_kodu_column(sheet):
+    """Başlık satırını ve Program Kodu sütununu tek values:batchGet isteğiyle okur
+
+    (başlıklar, kodlar) döndürür; kodlar[i] sayfanın i + 2. satırındaki koddur. Sütun
+    bulunamazsa kodlar None olur.
+    """
+    column = sheets_manager.key_columns.get(sheet.id, PROGRAM_KODU_DEFAULT_COLUMN)
+    header = []
+    for _ in range(2):
+        letter = rowcol_to_a1(1, column).rstrip('0123456789')
+        with sheets_call('values_batch_get'):
+            response = sheet.spreadsheet.values_batch_get([
+                absolute_range_name(sheet.title, '1:1'),
+                absolute_range_name(sheet.title, f'{letter}2:{letter}'),
+            ])
+        header_range, code_range = response.get('valueRanges', [{}, {}])
+        header = (header_range.get('values') or [[]])[0]
+        if 'Program Kodu' not in header:
+            return header, None
+        actual = header.index('Program Kodu') + 1
+        if actual == column:
+            sheets_manager.key_columns[sheet.id] = column
+            codes = [str(row[0]).strip() if row else '' for row in code_range.get('values', [])]
+            return header, codes
+        # Sütun yer değiştirmiş: doğru sütunla bir kez daha oku
+        column = actual
+    return header, None
+
+# Satır numaralarını değiştiren yazmalar (ekleme/silme) worker içinde sırayla yapılır
+sheet_write_lock = threading.RLock()
+
+def first_cell_value(value_range):
+    """Tek hücrelik aralık yanıtındaki değer (boş hücre için '')"""
+    values = value_range.get('values') or [[]]
+    return str(values[0][0]).strip() if values[0] else ''
+
+def current_sheet_rows():
+    snapshot = data_cache.get()
+    return snapshot.sheet_rows if snapshot is not None else None
+
+def locate_program_rows(sheet, program_kodlari):
+    """Program kodlarının sayfa satırlarını bulur: (başlıklar, {kod: satır})
+
+    Önce snapshot'taki satır indeksine bakılır ve başlık satırı ile beklenen Program Kodu
+    hücreleri tek values:batchGet isteğiyle doğrulanır. İndekste olmayan veya artık farklı
+    kod taşıyan satır varsa sütun taranır ve indeks yeniden kurulur. Bulunamayan kodlar
+    sözlükte yer almaz.
+    """
+    index = current_sheet_rows()
+    codes = list(dict.fromkeys(str(code).strip() for code in program_kodlari))
+    rows = {code: index.row(code) for code in codes} if index is not None else {}
+    
+    column = sheets_manager.key_columns.get(sheet.id, PROGRAM_KODU_DEFAULT_COLUMN)
+    if rows and all(rows.values()):
+        letter = rowcol_to_a1(1, column).rstrip('0123456789')
+        with sheets_call('values_batch_get'):
+            response = sheet.spreadsheet.values_batch_get(
+                [absolute_range_name(sheet.title, '1:1')] +
+                [absolute_range_name(sheet.title, f'{letter}{row}') for row in rows.values()]
+            )
+        value_ranges = response.get('valueRanges', [])
+        header = (value_ranges[0].get('values') or [[]])[0] if value_ranges else []
+        cells = [first_cell_value(value_range) for value_range in value_ranges[1:]]
+        if 'Program Kodu' in header and header.index('Program Kodu') + 1 == column and cells == codes:
+            return header, rows
+        sheets_logger.warning('⚠️ Satır indeksi sayfayla uyuşmuyor, Program Kodu sütunu yeniden okunuyor')
+    
+    header, column_codes = read_program_kodu_column(sheet)
+    if column_codes is None:
+        raise ValueError("'Program Kodu' sütunu bulunamadı")
+    if index is None:
+        index = SheetRowIndex(column_codes)
+    else:
+        index.reset(column_codes)
+    return header, {code: index.row(code) for code in codes if index.row(code) is not None}
+
+def update_universite_rows(sheet, updates):
+    """(program_kodu, alanlar) güncellemelerini tek batch_update isteğiyle yazar
+
+    Sadece gönderilen alanların hücreleri, başlıktaki konumlarına göre yazılır (diğer
+    hücreler değişmez). (güncellenen kodlar, bulunamayan kodlar) döndürür; bulunamayan
+    kod varsa hiçbir satır yazılmaz.
+    """
+    header, rows = locate_program_rows(sheet, [code for code, _ in updates])
+    
+    not_found = [code for code, _ in updates if str(code).strip() not in rows]
+    if not_found:
+        return [], not_found
+    
+    columns = {}
+    for position, field in enumerate(header, start=1):
+        if field:
+            columns.setdefault(field, position)
+    
+    data = []
+    for code, fields in updates:
+        row_index = rows[str(code).strip()]
+        for field, value in fields.items():
+            # Sayfada olmayan alanlar yok sayılır
+            if field in columns:
+                data.append({'range': rowcol_to_a1(row_index, columns[field]), 'values': [[value]]})
+    
+    if data:
+        with sheets_call('batch_update'):
+            sheet.batch_update(data)
+    
+    # Program Kodu değiştiyse satır indeksini güncelle
+    index = current_sheet_rows()
+    if index is not None:
+        for code, fields in updates:
+            if 'Program Kodu' in fields and 'Program Kodu' in columns:
+                index.updated(rows[str(code).strip()], fields['Program Kodu'])
+    return [code for code, _ in updates], []
+
+def frame_sheet_values(df):
+    """Temizlenmiş DataFrame'i sayfa değerleri biçimine (başlık + metin satırları) geri çevirir"""
+    values = df.astype(object).where(df.notna(), '')
+    return [list(df.columns)] + [[str(value) for value in row] for row in values.itertuples(index=False, name=None)]
+
+def apply_universite_changes(frames, updated=(), deleted=(), appended=()):
+    """Yazma işlemlerini snapshot'taki ana veriye uygular ve aynı temizleme adımlarıyla yeniden kurar
+
+    updated: (program_kodu, alanlar) çiftleri, deleted: program kodları, appended: yeni kayıtlar.
+    Satırlar Program Kodu ile bulunur (aynı kod birden fazlaysa ilk satır, sayfadaki gibi).
+    """
+    values = frame_sheet_values(frames['universiteler'])
+    header = values[0]
+    columns = {field: position for position, field in enumerate(header)}
+    key_column = columns['Program Kodu']
+    
+    rows = {}
+    for offset, row in enumerate(values[1:], start=1):
+        rows.setdefault(row[key_column].strip(), offset)
+    
+    for code, fields in updated:
+        offset = rows.get(str(code).strip())
+        if offset is None:
+            continue
+        for field, value in fields.items():
+            if field in columns:
+                values[offset][columns[field]] = '' if value is None else str(value)
+    
+    removed = {rows[str(code).strip()] for code in deleted if str(code).strip() in rows}
+    if removed:
+        values = [row for offset, row in enumerate(values) if offset not in removed]
+    
+    for record in appended:
+        values.append(['' if record.get(field) is None else str(record.get(field)) for field in header])
+    
+    universiteler_df = build_universiteler_df(values)
+    if universiteler_df is None:
+        raise ValueError('Ana veri yazma sonrası boş kaldı')
+    return {**frames, 'universiteler': universiteler_df}
 
 # Google Sheets'e veri ekleme
 @app.route('/api/universite', methods=['POST'])
 def add_universite():
     try:
+        if not data_source.writable:
+            return jsonify({'error': f'{data_source.name} veri kaynağı salt okunur; değişiklikleri kaynakta yapın'}), 409
+        
         data = request.get_json()
         
         # Gerekli alanları kontrol et
@@ -464,7 +2791,7 @@ def add_universite():
         if not SHEET_ID:
             return jsonify({'error': 'GOOGLE_SHEET_ID ayarlanmamış'}), 500
         
-        sheet = client.open_by_key(SHEET_ID).sheet1
+        sheet = sheets_manager.get_role_worksheet('universiteler')
         
         # Yeni satır olarak ekle (yeni sütunlarla birlikte)
         row_data = [
@@ -493,18 +2820,36 @@ def add_universite():
             data.get('Akreditasyon', '')
         ]
         
-        sheet.append_row(row_data)
+        with sheet_write_lock:
+            with sheets_call('append_row'):
+                response = sheet.append_row(row_data)
+            # Eklenen satırın numarası yanıttaki aralıktan alınır
+            updated_range = response.get('updates', {}).get('updatedRange', '')
+            index = current_sheet_rows()
+            if index is not None and '!' in updated_range:
+                row_index, _ = a1_to_rowcol(updated_range.split('!')[1].split(':')[0])
+                index.appended(data.get('Program Kodu', ''), row_index)
+            
+            # Okuyucular değişikliği sayfa yeniden indirilmeden görür (snapshot arka planda güncellenir)
+            data_cache.apply(lambda frames: apply_universite_changes(frames, appended=[data]))
         
         return jsonify({'message': 'Üniversite başarıyla eklendi', 'data': data}), 201
         
+    except SheetsBusyError:
+        # Sheets meşgul: bağlantı sıfırlanmaz, errorhandler 503 döner
+        raise
     except Exception as e:
-        print(f'Veri ekleme hatası: {e}')
+        api_logger.exception('Veri ekleme hatası: %s', e)
+        sheets_manager.invalidate()
         return jsonify({'error': 'Veri eklenirken hata oluştu'}), 500
 
 # Google Sheets'te veri güncelleme
 @app.route('/api/universite/<program_kodu>', methods=['PUT'])
 def update_universite(program_kodu):
     try:
+        if not data_source.writable:
+            return jsonify({'error': f'{data_source.name} veri kaynağı salt okunur; değişiklikleri kaynakta yapın'}), 409
+        
         data = request.get_json()
         
         client = get_google_sheets_client()
@@ -515,43 +2860,46 @@ def update_universite(program_kodu):
         if not SHEET_ID:
             return jsonify({'error': 'GOOGLE_SHEET_ID ayarlanmamış'}), 500
         
-        sheet = client.open_by_key(SHEET_ID).sheet1
-        
-        # Program koduna göre satırı bul
-        all_records = sheet.get_all_records()
-        row_index = None
-        
-        for i, record in enumerate(all_records, start=2):  # 2'den başla çünkü 1. satır başlık
-            if str(record.get('Program Kodu', '')).strip() == str(program_kodu).strip():
-                row_index = i
-                break
-        
-        if row_index is None:
-            return jsonify({'error': 'Üniversite bulunamadı'}), 404
-        
-        # Güncellenecek alanları belirle
-        update_data = []
-        for field in ['Üniversite Adı', 'Program Kodu', 'Fakülte Adı', 'Ülke', 'Şehir', 'Grup', 'Program Adı', 'Kontenjan', '2024 Başarı Sırası', '2024 YKS En Küçük Puanı', '2024 YKS Puanı Aralığı', '2024 Başarı Sırası Aralığı', 'Kuruluş Tarihi', 'Adres', 'Telefon', 'E-posta', 'Rektör', 'Üni Alan Adı', 'Fakülte Alan adı', 'Bölüm Alan Adı', 'Tür', 'Wikipedia Sayfası', 'Akreditasyon']:
-            if field in data:
-                update_data.append(data[field])
-            else:
-                # Mevcut değeri koru
-                cell_value = sheet.cell(row_index, all_records[0].keys().index(field) + 1).value
-                update_data.append(cell_value)
+        sheet = sheets_manager.get_role_worksheet('universiteler')
         
-        # Satırı güncelle (23 sütun için A-W aralığı)
-        sheet.update(f'A{row_index}:W{row_index}', [update_data])
+        # Satır indeksinden doğrulanmış tek okuma ve tek toplu yazma
+        with sheet_write_lock:
+            _, not_found = update_universite_rows(sheet, [(program_kodu, data)])
+            if not_found:
+                return jsonify({'error': 'Üniversite bulunamadı'}), 404
+            data_cache.apply(lambda frames: apply_universite_changes(frames, updated=[(program_kodu, data)]))
         
         return jsonify({'message': 'Üniversite başarıyla güncellendi', 'data': data}), 200
         
+    except SheetsBusyError:
+        raise
     except Exception as e:
-        print(f'Veri güncelleme hatası: {e}')
+        api_logger.exception('Veri güncelleme hatası: %s', e)
+        sheets_manager.invalidate()
         return jsonify({'error': 'Veri güncellenirken hata oluştu'}), 500
 
-# Google Sheets'ten veri silme
-@app.route('/api/universite/<program_kodu>', methods=['DELETE'])
-def delete_universite(program_kodu):
+# Google Sheets'te toplu veri güncelleme
+@app.route('/api/universiteler', methods=['PUT'])
+def bulk_update_universiteler():
+    """Birden fazla programı tek okuma ve tek batch_update isteğiyle günceller
+
+    Gövde: [{"program_kodu": "...", "data": {...}}, ...] veya {"updates": [...]}
+    """
     try:
+        if not data_source.writable:
+            return jsonify({'error': f'{data_source.name} veri kaynağı salt okunur; değişiklikleri kaynakta yapın'}), 409
+        
+        payload = request.get_json()
+        items = payload.get('updates') if isinstance(payload, dict) else payload
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'Güncelleme listesi boş veya geçersiz'}), 400
+        
+        updates = []
+        for item in items:
+            if not isinstance(item, dict) or not item.get('program_kodu') or not isinstance(item.get('data'), dict):
+                return jsonify({'error': 'Her güncelleme program_kodu ve data alanlarını içermelidir'}), 400
+            updates.append((item['program_kodu'], item['data']))
+        
         client = get_google_sheets_client()
         if not client:
             return jsonify({'error': 'Google Sheets bağlantısı kurulamadı'}), 500
@@ -560,111 +2908,71 @@ def delete_universite(program_kodu):
         if not SHEET_ID:
             return jsonify({'error': 'GOOGLE_SHEET_ID ayarlanmamış'}), 500
         
-        sheet = client.open_by_key(SHEET_ID).sheet1
-        
-        # Program koduna göre satırı bul
-        all_records = sheet.get_all_records()
-        row_index = None
-        
-        for i, record in enumerate(all_records, start=2):
-            if str(record.get('Program Kodu', '')).strip() == str(program_kodu).strip():
-                row_index = i
-                break
-        
-        if row_index is None:
-            return jsonify({'error': 'Üniversite bulunamadı'}), 404
+        sheet = sheets_manager.get_role_worksheet('universiteler')
         
-        # Satırı sil
-        sheet.delete_rows(row_index)
+        with sheet_write_lock:
+            updated, not_found = update_universite_rows(sheet, updates)
+            if not_found:
+                return jsonify({'error': 'Bazı üniversiteler bulunamadı, hiçbir kayıt güncellenmedi', 'not_found': not_found}), 404
+            data_cache.apply(lambda frames: apply_universite_changes(frames, updated=updates))
         
-        return jsonify({'message': 'Üniversite başarıyla silindi'}), 200
+        return jsonify({'message': f'{len(updated)} üniversite başarıyla güncellendi', 'updated': updated}), 200
         
+    except SheetsBusyError:
+        raise
     except Exception as e:
-        print(f'Veri silme hatası: {e}')
-        return jsonify({'error': 'Veri silinirken hata oluştu'}), 500
+        api_logger.exception('Toplu güncelleme hatası: %s', e)
+        sheets_manager.invalidate()
+        return jsonify({'error': 'Veriler güncellenirken hata oluştu'}), 500
 
-# Ders programı verilerini yükleme
-def load_ders_programi_data():
-    """Ders programı worksheet'inden veri yükler"""
+# Google Sheets'ten veri silme
+@app.route('/api/universite/<program_kodu>', methods=['DELETE'])
+def delete_universite(program_kodu):
     try:
+        if not data_source.writable:
+            return jsonify({'error': f'{data_source.name} veri kaynağı salt okunur; değişiklikleri kaynakta yapın'}), 409
+        
         client = get_google_sheets_client()
         if not client:
-            print("Google Sheets bağlantısı kurulamadı!")
-            return None
+            return jsonify({'error': 'Google Sheets bağlantısı kurulamadı'}), 500
         
         SHEET_ID = os.environ.get('GOOGLE_SHEET_ID', '')
         if not SHEET_ID:
-            print("GOOGLE_SHEET_ID environment variable'ı ayarlanmamış!")
-            return None
-        
-        # Ders programı worksheet'ini bul (varsayılan olarak ikinci worksheet)
-        spreadsheet = client.open_by_key(SHEET_ID)
-        
-        # Worksheet listesini al
-        worksheets = spreadsheet.worksheets()
-        
-        # Debug: Mevcut worksheet'leri listele
-        print(f"Mevcut worksheet'ler: {[ws.title for ws in worksheets]}")
-        print(f"Toplam worksheet sayısı: {len(worksheets)}")
-        
-        # Ders programı worksheet'ini bul (genellikle ikinci worksheet)
-        ders_worksheet = None
-        for ws in worksheets:
-            print(f"Worksheet kontrol ediliyor: '{ws.title}' (lower: '{ws.title.lower()}')")
-            if ws.title.lower() in ['ders programı', 'ders_programi', 'ders programi', 'ders_programı']:
-                ders_worksheet = ws
-                print(f"✅ Ders programı worksheet bulundu: '{ws.title}'")
-                break
-        
-        # Eğer bulunamazsa ikinci worksheet'i kullan
-        if not ders_worksheet and len(worksheets) > 1:
-            ders_worksheet = worksheets[1]  # İkinci worksheet
-            print(f"⚠️ Ders programı worksheet bulunamadı, {ders_worksheet.title} kullanılıyor")
-        
-        if not ders_worksheet:
-            print("❌ Ders programı worksheet bulunamadı!")
-            return None
-        
-        print(f"🎯 Seçilen worksheet: '{ders_worksheet.title}'")
-        
-        # Ham veriyi al
-        all_values = ders_worksheet.get_all_values()
-        
-        print(f"📊 Worksheet'ten alınan satır sayısı: {len(all_values)}")
-        
-        if not all_values or len(all_values) < 2:
-            print("❌ Ders programı worksheet'inde veri bulunamadı!")
-            return None
-        
-        # Başlıkları al
-        headers = all_values[0]
-        print(f"📋 Başlıklar: {headers}")
-        
-        # Sütun isimlerini güncelle
-        updated_headers = []
-        for header in headers:
-            if header == 'GEÇERLİLİK TARİHİ':
-                updated_headers.append('GÜNCELLENME TARİHİ')
-            else:
-                updated_headers.append(header)
-        
-        print(f"📋 Güncellenmiş başlıklar: {updated_headers}")
+            return jsonify({'error': 'GOOGLE_SHEET_ID ayarlanmamış'}), 500
         
-        # Veri satırlarını al
-        data_rows = all_values[1:]
+        sheet = sheets_manager.get_role_worksheet('universiteler')
         
-        # DataFrame oluştur
-        df = pd.DataFrame(data_rows, columns=updated_headers)
-        print(f'✅ Ders programı worksheet\'inden {len(df)} satır veri yüklendi')
-        print('📊 Ders programı başlıkları:', list(df.columns))
+        with sheet_write_lock:
+            # Program koduna göre satırı bul (satır indeksi, doğrulama hücresiyle)
+            _, rows = locate_program_rows(sheet, [program_kodu])
+            row_index = rows.get(str(program_kodu).strip())
+            
+            if row_index is None:
+                return jsonify({'error': 'Üniversite bulunamadı'}), 404
+            
+            # Satırı sil; altındaki satırlar indekste bir yukarı kayar
+            with sheets_call('delete_rows'):
+                sheet.delete_rows(row_index)
+            index = current_sheet_rows()
+            if index is not None:
+                index.deleted(row_index)
+            
+            data_cache.apply(lambda frames: apply_universite_changes(frames, deleted=[program_kodu]))
         
-        return df
+        return jsonify({'message': 'Üniversite başarıyla silindi'}), 200
         
+    except SheetsBusyError:
+        raise
     except Exception as e:
-        print(f'❌ Ders programı veri yükleme hatası: {e}')
-        import traceback
-        traceback.print_exc()
-        return None
+        api_logger.exception('Veri silme hatası: %s', e)
+        sheets_manager.invalidate()
+        return jsonify({'error': 'Veri silinirken hata oluştu'}), 500
+
+# Ders programı verilerini yükleme
+def load_ders_programi_data():
+    """Ders programı verisini önbellekteki snapshot'tan döndürür"""
+    snapshot = data_cache.get()
+    return snapshot.ders_df if snapshot is not None else None
 
 # Ders programı sayfası
 @app.route('/ders-planlari')
@@ -674,91 +2982,77 @@ def ders_planlari():
 
 # Ders programı verilerini API olarak döndürme
 @app.route('/api/ders_programlari')
+@conditional_get('ders_programlari', precompress=True)
 def get_ders_programlari():
     """Ders programı verilerini JSON olarak döndürür"""
     try:
-        df = load_ders_programi_data()
+        snapshot = request_snapshot()
         
-        if df is None:
+        if snapshot is None or snapshot.ders_df is None:
             return jsonify({'error': 'Ders programı verisi yüklenemedi'}), 500
         
-        # NaN değerleri temizle
-        df = df.where(pd.notnull(df), None)
-        
-        # Veriyi JSON formatına çevir
-        data = []
-        for _, row in df.iterrows():
-            row_dict = {}
-            for col in df.columns:
-                value = row[col]
-                # NaN ve None değerleri güvenli bir şekilde işle
-                if pd.isna(value) or value is None:
-                    row_dict[col] = None
-                elif isinstance(value, (int, float)) and value != value:  # NaN kontrolü
-                    row_dict[col] = None
-                else:
-                    row_dict[col] = str(value) if value is not None else None
-            data.append(row_dict)
-        
-        return jsonify({
-            'data': data,
-            'total_count': len(data),
-            'columns': list(df.columns)
-        })
+        # Parametresiz istekte gövde conditional_get tarafından snapshot başına bir kez üretilir
+        return json_bytes_response(dumps_json({
+            'data': snapshot.ders_records,
+            'total_count': len(snapshot.ders_records),
+            'columns': list(snapshot.ders_df.columns)
+        }))
         
     except Exception as e:
-        print(f'Ders programı API hatası: {e}')
-        import traceback
-        traceback.print_exc()
+        ders_logger.exception('Ders programı API hatası: %s', e)
         return jsonify({'error': 'Veri alınırken hata oluştu'}), 500
 
+def build_ders_filtreler(df):
+    """Ders programı filtre seçeneklerini (benzersiz, sıralı değer listeleri) hazırlar"""
+    # NaN değerleri temizle
+    df = df.where(pd.notnull(df), None)
+    
+    # Filtre seçeneklerini hazırla
+    filtreler = {}
+    
+    # Üniversite filtreleri
+    if 'ÜNİVERSİTE' in df.columns:
+        universite_list = sorted([str(u) for u in df['ÜNİVERSİTE'].unique() if u is not None and str(u).strip()])
+        filtreler['universite'] = universite_list
+    
+    # Bölüm filtreleri
+    if 'BÖLÜM' in df.columns:
+        bolum_list = sorted([str(b) for b in df['BÖLÜM'].unique() if b is not None and str(b).strip()])
+        filtreler['bolum'] = bolum_list
+    
+    # Dönem filtreleri
+    if 'DÖNEM' in df.columns:
+        donem_list = sorted([str(d) for d in df['DÖNEM'].unique() if d is not None and str(d).strip()])
+        filtreler['donem'] = donem_list
+    
+    # Ders grubu filtreleri
+    if 'DERS GRUBU' in df.columns:
+        ders_grubu_list = sorted([str(dg) for dg in df['DERS GRUBU'].unique() if dg is not None and str(dg).strip()])
+        filtreler['ders_grubu'] = ders_grubu_list
+    
+    # Ders alt grubu filtreleri
+    if 'DERS ALT GRUBU' in df.columns:
+        ders_alt_grubu_list = sorted([str(dag) for dag in df['DERS ALT GRUBU'].unique() if dag is not None and str(dag).strip()])
+        filtreler['ders_alt_grubu'] = ders_alt_grubu_list
+    
+    return filtreler
+
 # Ders programı filtreleri
 @app.route('/api/ders_programlari_filtreler')
+@conditional_get('ders_programlari_filtreler', precompress=True)
 def get_ders_programlari_filtreler():
     """Ders programı için filtre seçeneklerini döndürür"""
     try:
-        df = load_ders_programi_data()
+        snapshot = request_snapshot()
         
-        if df is None:
+        if snapshot is None or snapshot.ders_df is None:
             return jsonify({'error': 'Ders programı verisi yüklenemedi'}), 500
         
-        # NaN değerleri temizle
-        df = df.where(pd.notnull(df), None)
-        
-        # Filtre seçeneklerini hazırla
-        filtreler = {}
-        
-        # Üniversite filtreleri
-        if 'ÜNİVERSİTE' in df.columns:
-            universite_list = sorted([str(u) for u in df['ÜNİVERSİTE'].unique() if u is not None and str(u).strip()])
-            filtreler['universite'] = universite_list
-        
-        # Bölüm filtreleri
-        if 'BÖLÜM' in df.columns:
-            bolum_list = sorted([str(b) for b in df['BÖLÜM'].unique() if b is not None and str(b).strip()])
-            filtreler['bolum'] = bolum_list
-        
-        # Dönem filtreleri
-        if 'DÖNEM' in df.columns:
-            donem_list = sorted([str(d) for d in df['DÖNEM'].unique() if d is not None and str(d).strip()])
-            filtreler['donem'] = donem_list
-        
-        # Ders grubu filtreleri
-        if 'DERS GRUBU' in df.columns:
-            ders_grubu_list = sorted([str(dg) for dg in df['DERS GRUBU'].unique() if dg is not None and str(dg).strip()])
-            filtreler['ders_grubu'] = ders_grubu_list
-        
-        # Ders alt grubu filtreleri
-        if 'DERS ALT GRUBU' in df.columns:
-            ders_alt_grubu_list = sorted([str(dag) for dag in df['DERS ALT GRUBU'].unique() if dag is not None and str(dag).strip()])
-            filtreler['ders_alt_grubu'] = ders_alt_grubu_list
-        
-        return jsonify(filtreler)
+        # Parametresiz istekte seçenekler conditional_get tarafından snapshot başına bir kez hesaplanır
+        return json_bytes_response(dumps_json(build_ders_filtreler(snapshot.ders_df)))
         
     except Exception as e:
-        print(f'Ders programı filtre hatası: {e}')
-        import traceback
-        traceback.print_exc()
+        ders_logger.exception('Ders programı filtre hatası: %s', e)
         return jsonify({'error': 'Filtreler alınırken hata oluştu'}), 500
 
 # Filtrelenmiş ders programı verileri
@@ -766,436 +3060,70 @@ def get_ders_programlari_filtreler():
 def filter_ders_programlari():
     """Ders programı verilerini filtreler"""
     try:
-        df = load_ders_programi_data()
+        snapshot = request_snapshot()
         
-        if df is None:
+        if snapshot is None or snapshot.ders_df is None:
             return jsonify({'error': 'Ders programı verisi yüklenemedi'}), 500
+        df = snapshot.ders_df
         
         # Filtre parametrelerini al
         data = request.get_json()
-        universite = data.get('universite', '')
-        bolum = data.get('bolum', '')
-        donem = data.get('donem', '')
-        ders_grubu = data.get('ders_grubu', '')
-        ders_alt_grubu = data.get('ders_alt_grubu', '')
-        
-        # Debug: Log the received parameters
-        print(f"🔍 Filtre parametreleri alındı:")
-        print(f"   Üniversite: '{universite}'")
-        print(f"   Bölüm: '{bolum}'")
-        print(f"   Dönem: '{donem}'")
-        print(f"   Ders Grubu: '{ders_grubu}'")
-        print(f"   Ders Alt Grubu: '{ders_alt_grubu}'")
-        
-        # Debug: Log the data shape and sample
-        print(f"🔍 DataFrame boyutu: {df.shape}")
-        print(f"🔍 DataFrame sütunları: {list(df.columns)}")
-        if not df.empty:
-            print(f"🔍 İlk 3 satır örneği:")
-            for i, row in df.head(3).iterrows():
-                print(f"   Satır {i}: {dict(row)}")
-        
-        # Filtreleme yap
-        filtered_df = df.copy()
-        original_count = len(filtered_df)
-        
-        if universite:
-            print(f"🔍 Üniversite filtresi uygulanıyor: '{universite}'")
-            before_filter = len(filtered_df)
-            
-            # Üniversite filtresi için esnek mantık
-            def universite_filter_logic(row_universite, filter_universite):
-                """Üniversite filtresi için özel mantık"""
-                if pd.isna(row_universite) or pd.isna(filter_universite):
-                    return False
-                
-                row_str = str(row_universite).strip()
-                filter_str = str(filter_universite).strip()
-                
-                if not row_str or not filter_str:
-                    return False
-                
-                # 1. Tam eşleşme (büyük/küçük harf duyarsız)
-                if row_str.lower() == filter_str.lower():
-                    print(f"   ✅ Tam eşleşme bulundu: '{row_str}' == '{filter_str}'")
-                    return True
-                
-                # 2. İçeriyor kontrolü (büyük/küçük harf duyarsız)
-                if filter_str.lower() in row_str.lower():
-                    print(f"   ✅ İçeriyor bulundu: '{filter_str}' in '{row_str}'")
-                    return True
-                
-                # 3. Kısmi eşleşme kontrolü (kelime bazında)
-                row_words = set(row_str.lower().split())
-                filter_words = set(filter_str.lower().split())
-                
-                # Eğer filtredeki tüm kelimeler satırda varsa
-                if filter_words.issubset(row_words):
-                    print(f"   ✅ Kelime eşleşmesi bulundu: {filter_words} ⊆ {row_words}")
-                    return True
-                
-                # 4. Özel durumlar için kontrol
-                # "İstanbul Üniversitesi" gibi parantezli ifadeler
-                if '(' in filter_str and ')' in filter_str:
-                    # Parantez içindeki kısmı çıkar
-                    base_filter = filter_str.split('(')[0].strip()
-                    if base_filter.lower() in row_str.lower():
-                        print(f"   ✅ Parantez öncesi eşleşme: '{base_filter}' in '{row_str}'")
-                        return True
-                
-                return False
-            
-            # Filtreleme uygula
-            universite_mask = filtered_df['ÜNİVERSİTE'].apply(
-                lambda x: universite_filter_logic(x, universite)
-            )
-            
-            filtered_df = filtered_df[universite_mask]
-            after_filter = len(filtered_df)
-            print(f"   Üniversite filtresi öncesi: {before_filter}, sonrası: {after_filter}")
-            
-            # Debug: Show what was found
-            if after_filter > 0:
-                found_universities = filtered_df['ÜNİVERSİTE'].unique()
-                print(f"   ✅ Bulunan üniversiteler ({len(found_universities)} adet):")
-                for i, uni in enumerate(found_universities, 1):
-                    print(f"      {i}. {uni}")
-            else:
-                print(f"   ❌ Hiç üniversite bulunamadı!")
-                
-                # Mevcut üniversiteleri kontrol et
-                if len(filtered_df) > 0:
-                    all_universities = filtered_df['ÜNİVERSİTE'].astype(str).unique()
-                    print(f"   🔍 Mevcut üniversiteler ({len(all_universities)} adet):")
-                    for i, uni in enumerate(all_universities[:10], 1):  # İlk 10'unu göster
-                        print(f"      {i}. {uni}")
-                    if len(all_universities) > 10:
-                        print(f"      ... ve {len(all_universities) - 10} tane daha")
-                else:
-                    print(f"   ⚠️ Filtrelenecek veri kalmadı (önceki filtreler çok kısıtlayıcı)")
-        
-        if bolum:
-            print(f"🔍 Bölüm filtresi uygulanıyor: '{bolum}'")
-            before_filter = len(filtered_df)
-            
-            # Bölüm filtresi için yeni mantık
-            def bolum_filter_logic(row_bolum, filter_bolum):
-                """Bölüm filtresi için özel mantık"""
-                if pd.isna(row_bolum) or pd.isna(filter_bolum):
-                    return False
-                
-                row_str = str(row_bolum).strip()
-                filter_str = str(filter_bolum).strip()
-                
-                if not row_str or not filter_str:
-                    return False
-                
-                # 1. Tam eşleşme (büyük/küçük harf duyarsız)
-                if row_str.lower() == filter_str.lower():
-                    print(f"   ✅ Tam eşleşme bulundu: '{row_str}' == '{filter_str}'")
-                    return True
-                
-                # 2. İçeriyor kontrolü (büyük/küçük harf duyarsız)
-                if filter_str.lower() in row_str.lower():
-                    print(f"   ✅ İçeriyor bulundu: '{filter_str}' in '{row_str}'")
-                    return True
-                
-                # 3. Kısmi eşleşme kontrolü (kelime bazında)
-                row_words = set(row_str.lower().split())
-                filter_words = set(filter_str.lower().split())
-                
-                # Eğer filtredeki tüm kelimeler satırda varsa
-                if filter_words.issubset(row_words):
-                    print(f"   ✅ Kelime eşleşmesi bulundu: {filter_words} ⊆ {row_words}")
-                    return True
-                
-                # 4. Özel durumlar için kontrol
-                # "Bilgisayar Mühendisliği (İngilizce)" gibi parantezli ifadeler
-                if '(' in filter_str and ')' in filter_str:
-                    # Parantez içindeki kısmı çıkar
-                    base_filter = filter_str.split('(')[0].strip()
-                    if base_filter.lower() in row_str.lower():
-                        print(f"   ✅ Parantez öncesi eşleşme: '{base_filter}' in '{row_str}'")
-                        return True
-                
-                return False
-            
-            # Filtreleme uygula
-            bolum_mask = filtered_df['BÖLÜM'].apply(
-                lambda x: bolum_filter_logic(x, bolum)
-            )
-            
-            filtered_df = filtered_df[bolum_mask]
-            after_filter = len(filtered_df)
-            
-            print(f"   Bölüm filtresi öncesi: {before_filter}, sonrası: {after_filter}")
-            
-            # Debug: Show what was found
-            if after_filter > 0:
-                found_bolums = filtered_df['BÖLÜM'].unique()
-                print(f"   ✅ Bulunan bölümler ({len(found_bolums)} adet):")
-                for i, bol in enumerate(found_bolums, 1):
-                    print(f"      {i}. {bol}")
-            else:
-                print(f"   ❌ Hiç bölüm bulunamadı!")
-                
-                # Mevcut bölümleri kontrol et
-                if len(filtered_df) > 0:
-                    all_bolums = filtered_df['BÖLÜM'].astype(str).unique()
-                    print(f"   🔍 Mevcut bölümler ({len(all_bolums)} adet):")
-                    for i, bol in enumerate(all_bolums[:10], 1):  # İlk 10'unu göster
-                        print(f"      {i}. {bol}")
-                    if len(all_bolums) > 10:
-                        print(f"      ... ve {len(all_bolums) - 10} tane daha")
-                else:
-                    print(f"   ⚠️ Filtrelenecek veri kalmadı (önceki filtreler çok kısıtlayıcı)")
-        
-        if donem:
-            print(f"🔍 Dönem filtresi uygulanıyor: '{donem}'")
-            before_filter = len(filtered_df)
-            
-            # Dönem filtresi için esnek mantık
-            def donem_filter_logic(row_donem, filter_donem):
-                """Dönem filtresi için özel mantık"""
-                if pd.isna(row_donem) or pd.isna(filter_donem):
-                    return False
-                
-                row_str = str(row_donem).strip()
-                filter_str = str(filter_donem).strip()
-                
-                if not row_str or not filter_str:
-                    return False
-                
-                # 1. Tam eşleşme (büyük/küçük harf duyarsız)
-                if row_str.lower() == filter_str.lower():
-                    print(f"   ✅ Tam eşleşme bulundu: '{row_str}' == '{filter_str}'")
-                    return True
-                
-                # 2. İçeriyor kontrolü (büyük/küçük harf duyarsız)
-                if filter_str.lower() in row_str.lower():
-                    print(f"   ✅ İçeriyor bulundu: '{filter_str}' in '{row_str}'")
-                    return True
-                
-                # 3. Sayısal eşleşme kontrolü (1, 2, 3 vs.)
-                try:
-                    if row_str.isdigit() and filter_str.isdigit():
-                        if int(row_str) == int(filter_str):
-                            print(f"   ✅ Sayısal eşleşme bulundu: {row_str} == {filter_str}")
-                            return True
-                except:
-                    pass
-                
-                return False
-            
-            # Filtreleme uygula
-            donem_mask = filtered_df['DÖNEM'].apply(
-                lambda x: donem_filter_logic(x, donem)
-            )
-            
-            filtered_df = filtered_df[donem_mask]
-            after_filter = len(filtered_df)
-            print(f"   Dönem filtresi öncesi: {before_filter}, sonrası: {after_filter}")
+        filters = {param: data.get(param, '') for param in DERS_FILTER_RULES}
+        
+        ders_logger.debug('🔍 Filtre parametreleri alındı: %s (DataFrame boyutu: %s)', filters, df.shape)
+        
+        if isinstance(data_source, SqliteDataSource):
+            # Eşleştirme veritabanında yapılır (türetilmiş küçük harf / kelime / sayı sütunları)
+            data = data_source.query_ders_programlari(filters)
+            ders_logger.debug('🔍 SQLite filtreleme tamamlandı. Filtrelenmiş: %d', len(data))
+            return jsonify({
+                'data': data,
+                'total_count': len(data),
+                'filtered_count': len(data),
+                'columns': list(df.columns)
+            })
+        
+        verbose = ders_logger.isEnabledFor(logging.DEBUG)
+        
+        # Filtreleme: her filtre, snapshot'ta hazırlanan eşleştiriciden bir satır maskesi üretir
+        mask = np.ones(len(df), dtype=bool)
+        original_count = len(df)
+        
+        for param, value in filters.items():
+            if not value:
+                continue
+            column, _ = DERS_FILTER_RULES[param]
+            if not verbose:
+                mask &= snapshot.ders_matcher.match(param, value)
+                continue
             
-            # Debug: Show what was found
+            # Ayrıntılı tanılama: sadece DEBUG seviyesinde (veya istek bazlı ayrıntılı modda) hesaplanır
+            before_filter = int(mask.sum())
+            mask &= snapshot.ders_matcher.match(param, value)
+            after_filter = int(mask.sum())
+            ders_logger.debug("   %s filtresi ('%s') öncesi: %d, sonrası: %d", column, value, before_filter, after_filter)
             if after_filter > 0:
-                found_donems = filtered_df['DÖNEM'].unique()
-                print(f"   ✅ Bulunan dönemler ({len(found_donems)} adet):")
-                for i, don in enumerate(found_donems, 1):
-                    print(f"      {i}. {don}")
+                found_values = df[column][mask].unique()
+                ders_logger.debug('   ✅ Bulunan değerler (%d adet): %s', len(found_values), list(found_values[:10]))
             else:
-                print(f"   ❌ Hiç dönem bulunamadı!")
-                
-                # Mevcut dönemleri kontrol et
-                if len(filtered_df) > 0:
-                    all_donems = filtered_df['DÖNEM'].astype(str).unique()
-                    print(f"   🔍 Mevcut dönemler ({len(all_donems)} adet):")
-                    for i, don in enumerate(all_donems[:10], 1):  # İlk 10'unu göster
-                        print(f"      {i}. {don}")
-                    if len(all_donems) > 10:
-                        print(f"      ... ve {len(all_donems) - 10} tane daha")
-                else:
-                    print(f"   ⚠️ Filtrelenecek veri kalmadı (önceki filtreler çok kısıtlayıcı)")
+                ders_logger.debug('   ❌ %s için eşleşme bulunamadı!', column)
         
-        if ders_grubu:
-            print(f"🔍 Ders Grubu filtresi uygulanıyor: '{ders_grubu}'")
-            before_filter = len(filtered_df)
-            
-            # Ders Grubu filtresi için esnek mantık
-            def ders_grubu_filter_logic(row_ders_grubu, filter_ders_grubu):
-                """Ders Grubu filtresi için özel mantık"""
-                if pd.isna(row_ders_grubu) or pd.isna(filter_ders_grubu):
-                    return False
-                
-                row_str = str(row_ders_grubu).strip()
-                filter_str = str(filter_ders_grubu).strip()
-                
-                if not row_str or not filter_str:
-                    return False
-                
-                # 1. Tam eşleşme (büyük/küçük harf duyarsız)
-                if row_str.lower() == filter_str.lower():
-                    print(f"   ✅ Tam eşleşme bulundu: '{row_str}' == '{filter_str}'")
-                    return True
-                
-                # 2. İçeriyor kontrolü (büyük/küçük harf duyarsız)
-                if filter_str.lower() in row_str.lower():
-                    print(f"   ✅ İçeriyor bulundu: '{filter_str}' in '{row_str}'")
-                    return True
-                
-                # 3. Kısmi eşleşme kontrolü (kelime bazında)
-                row_words = set(row_str.lower().split())
-                filter_words = set(filter_str.lower().split())
-                
-                # Eğer filtredeki tüm kelimeler satırda varsa
-                if filter_words.issubset(row_words):
-                    print(f"   ✅ Kelime eşleşmesi bulundu: {filter_words} ⊆ {row_words}")
-                    return True
-                
-                # 4. Kısaltma kontrolü (MATEMATİK -> MAT)
-                if len(filter_str) >= 3:
-                    if filter_str.lower() in row_str.lower()[:len(filter_str)]:
-                        print(f"   ✅ Kısaltma eşleşmesi bulundu: '{filter_str}' in '{row_str}'")
-                        return True
-                
-                return False
-            
-            # Filtreleme uygula
-            ders_grubu_mask = filtered_df['DERS GRUBU'].apply(
-                lambda x: ders_grubu_filter_logic(x, ders_grubu)
-            )
-            
-            filtered_df = filtered_df[ders_grubu_mask]
-            after_filter = len(filtered_df)
-            print(f"   Ders Grubu filtresi öncesi: {before_filter}, sonrası: {after_filter}")
-            
-            # Debug: Show what was found
-            if after_filter > 0:
-                found_ders_gruplari = filtered_df['DERS GRUBU'].unique()
-                print(f"   ✅ Bulunan ders grupları ({len(found_ders_gruplari)} adet):")
-                for i, dg in enumerate(found_ders_gruplari, 1):
-                    print(f"      {i}. {dg}")
-            else:
-                print(f"   ❌ Hiç ders grubu bulunamadı!")
-                
-                # Mevcut ders gruplarını kontrol et
-                if len(filtered_df) > 0:
-                    all_ders_gruplari = filtered_df['DERS GRUBU'].astype(str).unique()
-                    print(f"   🔍 Mevcut ders grupları ({len(all_ders_gruplari)} adet):")
-                    for i, dg in enumerate(all_ders_gruplari[:10], 1):  # İlk 10'unu göster
-                        print(f"      {i}. {dg}")
-                    if len(all_ders_gruplari) > 10:
-                        print(f"      ... ve {len(all_ders_gruplari) - 10} tane daha")
-                else:
-                    print(f"   ⚠️ Filtrelenecek veri kalmadı (önceki filtreler çok kısıtlayıcı)")
+        positions = np.flatnonzero(mask)
+        ders_logger.debug('🔍 Filtreleme tamamlandı. Orijinal: %d, Filtrelenmiş: %d', original_count, len(positions))
         
-        if ders_alt_grubu:
-            print(f"🔍 Ders Alt Grubu filtresi uygulanıyor: '{ders_alt_grubu}'")
-            before_filter = len(filtered_df)
-            
-            # Ders Alt Grubu filtresi için esnek mantık
-            def ders_alt_grubu_filter_logic(row_ders_alt_grubu, filter_ders_alt_grubu):
-                """Ders Alt Grubu filtresi için özel mantık"""
-                if pd.isna(row_ders_alt_grubu) or pd.isna(filter_ders_alt_grubu):
-                    return False
-                
-                row_str = str(row_ders_alt_grubu).strip()
-                filter_str = str(filter_ders_alt_grubu).strip()
-                
-                if not row_str or not filter_str:
-                    return False
-                
-                # 1. Tam eşleşme (büyük/küçük harf duyarsız)
-                if row_str.lower() == filter_str.lower():
-                    print(f"   ✅ Tam eşleşme bulundu: '{row_str}' == '{filter_str}'")
-                    return True
-                
-                # 2. İçeriyor kontrolü (büyük/küçük harf duyarsız)
-                if filter_str.lower() in row_str.lower():
-                    print(f"   ✅ İçeriyor bulundu: '{filter_str}' in '{row_str}'")
-                    return True
-                
-                # 3. Kısmi eşleşme kontrolü (kelime bazında)
-                row_words = set(row_str.lower().split())
-                filter_words = set(filter_str.lower().split())
-                
-                # Eğer filtredeki tüm kelimeler satırda varsa
-                if filter_words.issubset(row_words):
-                    print(f"   ✅ Kelime eşleşmesi bulundu: {filter_words} ⊆ {row_words}")
-                    return True
-                
-                # 4. Kısaltma kontrolü (WebProgramlama -> Web)
-                if len(filter_str) >= 3:
-                    if filter_str.lower() in row_str.lower()[:len(filter_str)]:
-                        print(f"   ✅ Kısaltma eşleşmesi bulundu: '{filter_str}' in '{row_str}'")
-                        return True
-                
-                # 5. Boş değer kontrolü (eğer filtre boşsa, boş olanları da kabul et)
-                if not filter_str and not row_str:
-                    print(f"   ✅ Boş değer eşleşmesi bulundu")
-                    return True
-                
-                return False
-            
-            # Filtreleme uygula
-            ders_alt_grubu_mask = filtered_df['DERS ALT GRUBU'].apply(
-                lambda x: ders_alt_grubu_filter_logic(x, ders_alt_grubu)
-            )
-            
-            filtered_df = filtered_df[ders_alt_grubu_mask]
-            after_filter = len(filtered_df)
-            print(f"   Ders Alt Grubu filtresi öncesi: {before_filter}, sonrası: {after_filter}")
-            
-            # Debug: Show what was found
-            if after_filter > 0:
-                found_ders_alt_gruplari = filtered_df['DERS ALT GRUBU'].unique()
-                print(f"   ✅ Bulunan ders alt grupları ({len(found_ders_alt_gruplari)} adet):")
-                for i, dag in enumerate(found_ders_alt_gruplari, 1):
-                    print(f"      {i}. {dag}")
-            else:
-                print(f"   ❌ Hiç ders alt grubu bulunamadı!")
-                
-                # Mevcut ders alt gruplarını kontrol et
-                if len(filtered_df) > 0:
-                    all_ders_alt_gruplari = filtered_df['DERS ALT GRUBU'].astype(str).unique()
-                    print(f"   🔍 Mevcut ders alt grupları ({len(all_ders_alt_gruplari)} adet):")
-                    for i, dag in enumerate(all_ders_alt_gruplari[:10], 1):  # İlk 10'unu göster
-                        print(f"      {i}. {dag}")
-                    if len(all_ders_alt_gruplari) > 10:
-                        print(f"      ... ve {len(all_ders_alt_gruplari) - 10} tane daha")
-                else:
-                    print(f"   ⚠️ Filtrelenecek veri kalmadı (önceki filtreler çok kısıtlayıcı)")
-        
-        print(f"🔍 Filtreleme tamamlandı. Orijinal: {original_count}, Filtrelenmiş: {len(filtered_df)}")
-        
-        # NaN değerleri temizle
-        filtered_df = filtered_df.where(pd.notnull(filtered_df), None)
-        
-        # Veriyi JSON formatına çevir
-        data = []
-        for _, row in filtered_df.iterrows():
-            row_dict = {}
-            for col in filtered_df.columns:
-                value = row[col]
-                # NaN ve None değerleri güvenli bir şekilde işle
-                if pd.isna(value) or value is None:
-                    row_dict[col] = None
-                elif isinstance(value, (int, float)) and value != value:  # NaN kontrolü
-                    row_dict[col] = None
-                else:
-                    row_dict[col] = str(value) if value is not None else None
-            data.append(row_dict)
+        # Kayıtlar snapshot'ta JSON'a hazır tutulur
+        records = snapshot.ders_records
+        data = [records[i] for i in positions]
         
         return jsonify({
             'data': data,
             'total_count': len(data),
-            'filtered_count': len(filtered_df),
-            'columns': list(filtered_df.columns)
+            'filtered_count': len(data),
+            'columns': list(df.columns)
         })
         
     except Exception as e:
-        print(f'❌ Ders programı filtreleme hatası: {e}')
-        import traceback
-        traceback.print_exc()
+        ders_logger.exception('❌ Ders programı filtreleme hatası: %s', e)
         return jsonify({'error': 'Filtreleme yapılırken hata oluştu'}), 500
 
 
@@ -1204,7 +3132,8 @@ def filter_ders_programlari():
 @app.route('/api/status')
 def get_status():
     try:
-        client = get_google_sheets_client()
+        # Sheets bağlantısı sadece etkin kaynak Google Sheets ise denenir
+        client = get_google_sheets_client() if isinstance(data_source, SheetsDataSource) else None
         sheets_connected = client is not None
         
         SHEET_ID = os.environ.get('GOOGLE_SHEET_ID', '')
@@ -1212,15 +3141,21 @@ def get_status():
         
         df = load_data()
         data_count = len(df) if df is not None else 0
+        cache_status = data_cache.status()
         
         return jsonify({
             'sheets_connected': sheets_connected,
             'sheet_configured': sheet_configured,
-            'data_source': 'Google Sheets' if sheets_connected and sheet_configured else 'Excel File',
+            'data_source': data_source.name,
             'data_count': data_count,
-            'last_updated': datetime.now().isoformat()
+            'last_updated': cache_status['loaded_at'] or datetime.now().isoformat(),
+            'snapshot_source': cache_status['source'],
+            'snapshot_age_seconds': cache_status['age_seconds'],
+            'cache': cache_status
         })
         
+    except SheetsBusyError:
+        raise
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -1229,6 +3164,37 @@ def get_status():
             'data_source': 'Error'
         }), 500
 
+# Prometheus metrikleri
+@app.route('/metrics')
+def metrics():
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # Her istekte yeni kayıt: diğer worker'ların dosyaları da okunur
+        registry = CollectorRegistry()
+        registry.register(SnapshotAgeCollector(multiprocess.MultiProcessCollector(registry)))
+    else:
+        registry = REGISTRY
+    return app.response_class(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+# Veriyi SQLite'a aktarma: flask --app app import-data [--from file --file tablo.xlsx]
+@app.cli.command('import-data')
+@click.option('--from', 'source', type=click.Choice(['sheets', 'file']), default='sheets', show_default=True,
+              help='Verinin okunacağı kaynak')
+@click.option('--file', 'file_path', default=DATA_FILE, help='--from file için .xlsx dosyası veya CSV dizini')
+@click.option('--db', 'db_path', default=SQLITE_PATH, show_default=True, help='SQLite veritabanı dosyası')
+def import_data_command(source, file_path, db_path):
+    """Google Sheets'teki veya yerel dosyadaki veriyi indeksli SQLite veritabanına aktarır"""
+    reader = FileDataSource(file_path) if source == 'file' else SheetsDataSource(sheets_manager)
+    started = time.perf_counter()
+    values = reader.fetch()
+    if not values:
+        raise click.ClickException(f'{reader.name} kaynağından veri okunamadı')
+    try:
+        counts = SqliteDataSource(db_path).import_values(values)
+    except (ValueError, sqlite3.Error) as e:
+        raise click.ClickException(str(e))
+    row_counts = ', '.join(f'{table}: {count}' for table, count in counts.items())
+    click.echo(f'✅ {reader.name} -> {db_path} ({row_counts} satır, {time.perf_counter() - started:.2f} sn)')
+
 #if __name__ == '__main__':
 #    app.run(debug=True) 
 
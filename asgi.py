@@ -0,0 +1,70 @@
+"""ASGI girişi: Flask uygulamasını asyncio tabanlı bir sunucuda (uvicorn) çalıştırır
+
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker
+    uvicorn asgi:application --port 5000
+
+Bu asenkron bir Sheets istemcisi değil, bir thread havuzudur: Flask ve gspread senkron
+kalır. Bağlantılar worker'ın olay döngüsünde tutulur, her istek ASGI_THREADS boyutlu
+havuzdaki bir thread'de çalışır ve yanıtlanana kadar o thread'i tutar.
+
+Sheets çağrıları app.sheets_call içinde SHEETS_MAX_CONCURRENCY ile sınırlanır. Havuz
+varsayılan olarak bunun 8 katıdır ve hiçbir zaman ondan küçük veya eşit olamaz: Sheets
+çağrıları sürerken önbellekten yanıtlanan okumalara thread kalır. Sırada bekleyen istekler
+de (en fazla SHEETS_QUEUE_TIMEOUT) birer thread tuttuğundan, çok sayıda eşzamanlı yazma
+havuzu yine de doldurabilir.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgiInstance
+
+from app import SHEETS_MAX_CONCURRENCY, api_logger, app
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', SHEETS_MAX_CONCURRENCY * 8))
+if ASGI_THREADS <= SHEETS_MAX_CONCURRENCY:
+    api_logger.warning('⚠️ ASGI_THREADS (%d) SHEETS_MAX_CONCURRENCY (%d) değerinden büyük olmalı, %d kullanılıyor',
+                       ASGI_THREADS, SHEETS_MAX_CONCURRENCY, SHEETS_MAX_CONCURRENCY + 1)
+    ASGI_THREADS = SHEETS_MAX_CONCURRENCY + 1
+
+executor = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix='asgi')
+
+class FlaskRequest(WsgiToAsgiInstance):
+    """Tek bir isteği havuzdaki bir thread'de çalıştırır
+
+    asgiref'in WsgiToAsgi'si WSGI uygulamasını thread_sensitive modda, yani tüm istekler
+    için tek bir ortak thread'de çalıştırır; bu da sync worker'daki tıkanmayı geri getirir.
+    """
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(self.run_wsgi_sync, thread_sensitive=False, executor=executor)(body)
+
+    def run_wsgi_sync(self, body):
+        environ = self.build_environ(self.scope, body)
+        result = self.wsgi_application(environ, self.start_response)
+        try:
+            for output in result:
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                self.sync_send({'type': 'http.response.body', 'body': output, 'more_body': True})
+        finally:
+            # WSGI sözleşmesi: yanıtın close()'u (Werkzeug call_on_close) çağrılmalı
+            if hasattr(result, 'close'):
+                result.close()
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({'type': 'http.response.body'})
+
+async def application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    await FlaskRequest(app)(scope, receive, send)
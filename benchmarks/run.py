@@ -0,0 +1,219 @@
+"""Okuma API'leri için çevrimdışı süre ve bellek ölçümleri
+
+Google Sheets yerine app.data_source bellek içi bir FakeDataSource ile değiştirilir ve
+her uç nokta / filtre kombinasyonu Flask test istemcisiyle çağrılır. Sonuçlar
+kaydedilmiş bir temel ölçümle (baseline) karşılaştırılıp gerilemeler raporlanır.
+
+    python benchmarks/run.py                      # 1k, 10k, 100k satır
+    python benchmarks/run.py --sizes 1000 --repeat 50
+    python benchmarks/run.py --save-baseline      # sonuçları temel ölçüm olarak kaydet
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# app import edilmeden önce: diskteki snapshot'lar ve ayrıntılı günlükler ölçümü bozmasın
+os.environ['SNAPSHOT_DIR'] = ''
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as application  # noqa: E402
+from benchmarks.synthetic import SIZES, generate  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+# (ad, yöntem, yol, JSON gövdesi)
+CASES = [
+    ('universiteler', 'GET', '/api/universiteler', None),
+    ('universiteler ulke', 'GET', '/api/universiteler?ulke=KKTC', None),
+    ('universiteler sehir+tur', 'GET', '/api/universiteler?sehir=Ankara&tur=Devlet', None),
+    ('universiteler tum filtreler', 'GET', '/api/universiteler?ulke=Türkiye&sehir=Ankara&grup=A&tur=Devlet', None),
+    ('universiteler arama', 'GET', '/api/universiteler?search=teknik', None),
+    ('universiteler arama+sirala', 'GET', '/api/universiteler?search=teknik&sort_by=2024 Başarı Sırası&sort_order=desc', None),
+    ('universiteler sirala sayi', 'GET', '/api/universiteler?sort_by=Kontenjan&sort_order=desc', None),
+    ('universiteler sirala metin', 'GET', '/api/universiteler?sort_by=Şehir', None),
+    ('universiteler sayfa', 'GET', '/api/universiteler?offset=100&limit=50', None),
+    ('universiteler alanlar', 'GET', '/api/universiteler?fields=Üniversite Adı,Program Kodu,Şehir&limit=200', None),
+    ('suggest', 'GET', '/api/universiteler/suggest?q=tek', None),
+    ('filtreler', 'GET', '/api/filtreler', None),
+    ('sehirler', 'GET', '/api/sehirler?ulke=Türkiye', None),
+    ('dinamik filtreler', 'GET', '/api/dinamik-filtreler', None),
+    ('dinamik filtreler secili', 'GET', '/api/dinamik-filtreler?ulke=Türkiye&grup=B', None),
+    ('universite detay', 'GET', '/api/universite/100000007', None),
+    ('universite yok', 'GET', '/api/universite/1', None),
+    ('ders programlari', 'GET', '/api/ders_programlari', None),
+    ('ders programlari filtreler', 'GET', '/api/ders_programlari_filtreler', None),
+    ('ders filtrele universite', 'POST', '/api/ders_programlari_filtrele', {'universite': 'teknik'}),
+    ('ders filtrele bolum+donem', 'POST', '/api/ders_programlari_filtrele', {'bolum': 'bilgisayar', 'donem': '3'}),
+    ('ders filtrele grup+alt grup', 'POST', '/api/ders_programlari_filtrele', {'ders_grubu': 'PROG', 'ders_alt_grubu': 'web'}),
+    ('ders filtrele bos', 'POST', '/api/ders_programlari_filtrele', {}),
+]
+
+def load_dataset(rows, seed):
+    """Veri kaynağını sentetik veriyle değiştirir ve snapshot'ı sıfırdan kurar"""
+    application.data_source = application.FakeDataSource(generate(rows, seed))
+    application.data_cache.snapshot = None
+    application.data_cache.last_attempt = 0.0
+    gc.collect()
+    started = time.perf_counter()
+    snapshot = application.data_cache.get()
+    elapsed = time.perf_counter() - started
+    if snapshot is None:
+        raise RuntimeError(f'{rows} satırlık snapshot kurulamadı: {application.data_cache.last_error}')
+    return elapsed
+
+def measure_disk_load(snapshot):
+    """Soğuk açılış: diske yazılmış snapshot'ın (tablolar + indeksler) okunma süresi; pyarrow yoksa None"""
+    if application.feather is None:
+        return None
+    with tempfile.TemporaryDirectory() as directory:
+        store = application.SnapshotStore(directory)
+        store.save(snapshot)
+        gc.collect()
+        started = time.perf_counter()
+        loaded = store.load()
+        elapsed = time.perf_counter() - started
+    if loaded is None:
+        raise RuntimeError(f'Diskteki snapshot okunamadı: {store.last_error}')
+    return elapsed
+
+def call(client, method, path, body, headers):
+    if method == 'GET':
+        return client.get(path, headers=headers)
+    return client.post(path, json=body, headers=headers)
+
+def measure_case(client, case, repeat, headers):
+    """İlk (soğuk) çağrının bellek tepe değeri ve sonraki çağrıların süre dağılımı"""
+    _, method, path, body = case
+    gc.collect()
+    tracemalloc.start()
+    response = call(client, method, path, body, headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            call(client, method, path, body, headers)
+            timings.append((time.perf_counter() - started) * 1000)
+    finally:
+        gc.enable()
+    timings.sort()
+    return {
+        'status': response.status_code,
+        'bytes': len(response.data),
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        'min_ms': round(timings[0], 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+def run(sizes, repeat, seed, encoding, only=None):
+    client = application.app.test_client()
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    results = {}
+    for rows in sizes:
+        load_seconds = load_dataset(rows, seed)
+        snapshot = application.data_cache.snapshot
+        disk_seconds = measure_disk_load(snapshot)
+        # Ana verinin ham (metin) ve kompakt (kategorik / tipli) halinin bellek kullanımı
+        memory = snapshot.df.attrs['memory_report']
+        result = {
+            'status': 200,
+            'load_ms': round(load_seconds * 1000, 1),
+            'memory_before_kb': round(memory['before_bytes'] / 1024, 1),
+            'memory_after_kb': round(memory['after_bytes'] / 1024, 1),
+        }
+        line = (f'\n{rows} satır: snapshot {load_seconds * 1000:.0f} ms, '
+                f'bellek {result["memory_before_kb"]:.0f} KB -> {result["memory_after_kb"]:.0f} KB')
+        if disk_seconds is not None:
+            result['disk_load_ms'] = round(disk_seconds * 1000, 1)
+            line += f', diskten {disk_seconds * 1000:.0f} ms'
+        results[f'{rows}/snapshot'] = result
+        print(line, file=sys.stderr)
+        for case in CASES:
+            if only and only not in case[0]:
+                continue
+            result = measure_case(client, case, repeat, headers)
+            results[f'{rows}/{case[0]}'] = result
+            print(f'  {case[0]:<32} {result["status"]}  {result["median_ms"]:>9.3f} ms  '
+                  f'p95 {result["p95_ms"]:>9.3f} ms  {result["peak_kb"]:>10.1f} KB  {result["bytes"]:>10} B', file=sys.stderr)
+    return results
+
+def compare(results, baseline, threshold, noise_ms):
+    """Temel ölçüme göre belirgin şekilde yavaşlayan veya daha çok bellek kullananlar"""
+    regressions = []
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric, floor in (('median_ms', noise_ms), ('load_ms', noise_ms), ('disk_load_ms', noise_ms), ('peak_kb', 64), ('memory_after_kb', 64)):
+            if metric not in result or metric not in previous:
+                continue
+            old, new = previous[metric], result[metric]
+            # Küçük mutlak farklar ölçüm gürültüsü sayılır
+            if new > old * (1 + threshold) and new - old > floor:
+                regressions.append((key, metric, old, new))
+        if result['status'] != previous.get('status'):
+            regressions.append((key, 'status', previous.get('status'), result['status']))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--repeat', type=int, default=20, help='ölçülen (ısınmış) çağrı sayısı')
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--encoding', default='', help="Accept-Encoding başlığı (örn. 'br, gzip')")
+    parser.add_argument('--only', help='sadece adında bu metin geçen senaryolar')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='sonuçları temel ölçüm olarak kaydet')
+    parser.add_argument('--threshold', type=float, default=0.25, help='gerileme sayılan oransal artış')
+    parser.add_argument('--noise-ms', type=float, default=0.5, help='gerileme sayılmayan mutlak süre farkı')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat, args.seed, args.encoding, args.only)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'meta': {
+                    'python': platform.python_version(),
+                    'pandas': application.pd.__version__,
+                    'machine': platform.machine(),
+                    'repeat': args.repeat,
+                    'seed': args.seed,
+                    'encoding': args.encoding,
+                },
+                'results': results,
+            }, f, ensure_ascii=False, indent=2, sort_keys=True)
+        print(f'\n💾 Temel ölçüm kaydedildi: {args.baseline}', file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # Temel ölçüm olmadan gerileme hiç raporlanamaz; sessizce başarılı sayılmasın
+        print(f'\n❌ Karşılaştırılacak temel ölçüm yok: {args.baseline} (--save-baseline ile oluşturun)', file=sys.stderr)
+        return 2
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline['results'], args.threshold, args.noise_ms)
+    if not regressions:
+        print(f'\n✅ Temel ölçüme göre gerileme yok ({args.baseline})', file=sys.stderr)
+        return 0
+    print(f'\n❌ {len(regressions)} gerileme:', file=sys.stderr)
+    for key, metric, old, new in regressions:
+        print(f'  {key} {metric}: {old} -> {new}', file=sys.stderr)
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
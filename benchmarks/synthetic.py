@@ -0,0 +1,119 @@
+"""Ölçümler için sentetik üniversite ve ders programı sayfaları
+
+Üretilen satırlar Google Sheets'ten gelen değerlerle aynı biçimdedir (hepsi metin,
+binlik ayraçlı sıralar, virgüllü puanlar, boş hücreler); aynı tohum her zaman aynı
+veriyi üretir.
+"""
+import random
+
+UNIVERSITE_HEADERS = [
+    'Üniversite Adı', 'Program Kodu', 'Fakülte Adı', 'Ülke', 'Şehir', 'Grup', 'Program Adı', 'Kontenjan',
+    '2024 Başarı Sırası', '2024 YKS En Küçük Puanı', '2024 YKS Puanı Aralığı', '2024 Başarı Sırası Aralığı',
+    'Kuruluş Tarihi', 'Adres', 'Telefon', 'E-posta', 'Rektör', 'Üni Alan Adı', 'Fakülte Alan adı',
+    'Bölüm Alan Adı', 'Tür', 'Wikipedia Sayfası', 'Akreditasyon',
+]
+
+DERS_PROGRAMI_HEADERS = ['ÜNİVERSİTE', 'BÖLÜM', 'DÖNEM', 'DERS GRUBU', 'DERS ALT GRUBU', 'DERS ADI', 'GEÇERLİLİK TARİHİ']
+
+SIZES = (1000, 10000, 100000)
+
+SEHIRLER = {
+    'Türkiye': ['İstanbul', 'Ankara', 'İzmir', 'Bursa', 'Antalya', 'Konya', 'Eskişehir', 'Kayseri', 'Trabzon',
+                'Samsun', 'Çanakkale', 'Şanlıurfa', 'Diyarbakır', 'Erzurum', 'Gaziantep', 'Muğla', 'Isparta', 'Sakarya'],
+    'KKTC': ['Lefkoşa', 'Gazimağusa', 'Girne', 'Güzelyurt'],
+}
+UNIVERSITE_KOKLERI = ['Teknik', 'Orta Doğu Teknik', 'Boğaziçi', 'Yıldız Teknik', 'Ege', 'Çukurova', 'Işık', 'Hacettepe',
+                      'Dokuz Eylül', 'Gazi', 'Marmara', 'Karadeniz Teknik', 'Atatürk', 'Uludağ', 'Akdeniz', 'Selçuk']
+FAKULTELER = ['Mühendislik Fakültesi', 'Mühendislik ve Doğa Bilimleri Fakültesi', 'Bilgisayar ve Bilişim Fakültesi',
+              'Teknoloji Fakültesi', 'Fen Fakültesi']
+PROGRAMLAR = ['Bilgisayar Mühendisliği', 'Yazılım Mühendisliği', 'Bilişim Sistemleri Mühendisliği',
+              'Yapay Zeka Mühendisliği', 'Elektrik-Elektronik Mühendisliği', 'Endüstri Mühendisliği']
+PROGRAM_EKLERI = ['', ' (İngilizce)', ' (%50 İndirimli)', ' (Burslu)', ' (İÖ)']
+DERS_GRUPLARI = {
+    'MATEMATİK': ['Analiz', 'Lineer Cebir', 'Ayrık Matematik', 'Diferansiyel Denklemler'],
+    'PROGRAMLAMA': ['Web Programlama', 'Nesne Yönelimli Programlama', 'Algoritmalar', ''],
+    'FİZİK': ['Fizik I', 'Fizik II', ''],
+    'DONANIM': ['Mantık Devreleri', 'Mikroişlemciler', 'Bilgisayar Mimarisi'],
+    'VERİ': ['Veri Tabanı Sistemleri', 'Veri Madenciliği', 'Makine Öğrenmesi'],
+}
+
+def _universiteler(rng, count):
+    """Her biri birkaç şehir/tür özelliği taşıyan üniversite havuzu"""
+    universiteler = []
+    for index in range(count):
+        # Her boyutta her ülke ve şehirden üniversite bulunsun (filtreler boş dönmesin)
+        ulke = 'KKTC' if index % 8 == 7 else 'Türkiye'
+        sehir = SEHIRLER[ulke][index % len(SEHIRLER[ulke])]
+        kok = UNIVERSITE_KOKLERI[index % len(UNIVERSITE_KOKLERI)]
+        ad = f'{sehir} {kok} Üniversitesi' if index >= len(UNIVERSITE_KOKLERI) else f'{kok} Üniversitesi'
+        universiteler.append({
+            'ad': ad,
+            'ulke': ulke,
+            'sehir': sehir,
+            'tur': 'Vakıf' if rng.random() < 0.35 else 'Devlet',
+            'kurulus': str(rng.randint(1773, 2022)),
+            'alan_adi': f'u{index}.edu.tr',
+        })
+    return universiteler
+
+def _bos_olabilir(rng, value, oran=0.08):
+    # Sayfada doldurulmamış hücreler boş metin olarak gelir
+    return '' if rng.random() < oran else value
+
+def universite_rows(rows, universiteler, rng):
+    values = [list(UNIVERSITE_HEADERS)]
+    for index in range(rows):
+        uni = rng.choice(universiteler)
+        basari = rng.randint(500, 900000)
+        puan = rng.uniform(180, 560)
+        values.append([
+            uni['ad'],
+            str(100000000 + index),
+            rng.choice(FAKULTELER),
+            uni['ulke'],
+            uni['sehir'],
+            rng.choice(['A', 'B', 'C']),
+            rng.choice(PROGRAMLAR) + rng.choice(PROGRAM_EKLERI),
+            _bos_olabilir(rng, str(rng.randint(5, 150))),
+            _bos_olabilir(rng, f'{basari:,}'),
+            _bos_olabilir(rng, f'{puan:.5f}'.replace('.', ',')),
+            f'{puan:.2f} - {puan + rng.uniform(1, 40):.2f}'.replace('.', ','),
+            f'{basari:,} - {basari + rng.randint(100, 50000):,}',
+            uni['kurulus'],
+            f'{uni["sehir"]} Kampüsü No:{rng.randint(1, 300)}',
+            f'0{rng.randint(200, 499)} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}',
+            f'bilgi@{uni["alan_adi"]}',
+            f'Prof. Dr. Rektör {rng.randint(1, 9999)}',
+            uni['alan_adi'],
+            f'muhendislik.{uni["alan_adi"]}',
+            f'bm.{uni["alan_adi"]}',
+            uni['tur'],
+            _bos_olabilir(rng, f'https://tr.wikipedia.org/wiki/{uni["ad"].replace(" ", "_")}', 0.3),
+            _bos_olabilir(rng, rng.choice(['MÜDEK', 'ABET', 'FEDEK']), 0.6),
+        ])
+    return values
+
+def ders_programi_rows(rows, universiteler, rng):
+    values = [list(DERS_PROGRAMI_HEADERS)]
+    for index in range(rows):
+        grup = rng.choice(list(DERS_GRUPLARI))
+        values.append([
+            rng.choice(universiteler)['ad'],
+            rng.choice(PROGRAMLAR) + rng.choice(PROGRAM_EKLERI),
+            str(rng.randint(1, 8)),
+            grup,
+            rng.choice(DERS_GRUPLARI[grup]),
+            f'{grup.title()} Dersi {index}',
+            f'{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.2024',
+        ])
+    return values
+
+def generate(rows, seed=2024):
+    """FakeDataSource'a verilecek rol -> satır listesi sözlüğü (ders programı da aynı boyutta)"""
+    rng = random.Random(seed)
+    # Farklı üniversite sayısı satırla birlikte büyür (öneri / facet listeleri de büyüsün)
+    universiteler = _universiteler(rng, max(len(UNIVERSITE_KOKLERI), rows // 50))
+    return {
+        'universiteler': universite_rows(rows, universiteler, rng),
+        'ders_programi': ders_programi_rows(rows, universiteler, rng),
+    }
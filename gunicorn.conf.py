@@ -0,0 +1,19 @@
+"""gunicorn ayarları: worker'lar arası Prometheus metrikleri için ortak dizin"""
+import os
+import shutil
+import tempfile
+
+# prometheus_client ilk kez import edilmeden önce ayarlanmalı: metrikler bu dizindeki dosyalara yazılır
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'prometheus-multiproc')
+)
+
+def on_starting(server):
+    # Önceki çalıştırmadan kalan sayaçları temizle
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+def child_exit(server, worker):
+    # Ölen worker'ın canlı gauge değerlerini kaldır
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
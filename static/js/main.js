@@ -8,6 +8,16 @@ let currentGrup = '';
 let currentTur = '';
 let autocompleteList;
 
+// Sayfalama: liste sayfa sayfa ve sadece kartlarda gösterilen alanlarla yüklenir
+const PAGE_SIZE = 50;
+const CARD_FIELDS = [
+    'Program Kodu', 'Üniversite Adı', 'Program Adı', 'Ülke', 'Şehir', 'Fakülte Adı',
+    'Kontenjan', 'Tür', '2024 YKS En Küçük Puanı', '2024 Başarı Sırası',
+    '2024 Başarı Sırası Aralığı', 'Wikipedia Alan Adı'
+];
+let loadedUniversities = [];
+let totalUniversities = 0;
+
 // DOM elements
 const searchInput = document.getElementById('searchInput');
 const searchBtn = document.getElementById('searchBtn');
@@ -166,11 +176,11 @@ function createAutocomplete() {
         }
         // Fetch suggestions
         try {
-            const params = new URLSearchParams({ search: val, sort_by: 'Üniversite Adı', sort_order: 'asc' });
-            const response = await fetch(`/api/universiteler?${params}`);
+            const params = new URLSearchParams({ q: val, limit: 10 });
+            const response = await fetch(`/api/universiteler/suggest?${params}`);
             const universities = await response.json();
             autocompleteList.innerHTML = '';
-            universities.slice(0, 10).forEach(uni => {
+            universities.forEach(uni => {
                 const item = document.createElement('button');
                 item.type = 'button';
                 item.className = 'list-group-item list-group-item-action';
@@ -361,9 +371,12 @@ function updateFilterOptions(filterElement, options, currentValue) {
     }
 }
 
-// Load universities with current filters
-async function loadUniversities() {
-    showLoading();
+// Load universities with current filters (append=true: sonraki sayfayı ekle)
+async function loadUniversities(append = false) {
+    if (!append) {
+        showLoading();
+        loadedUniversities = [];
+    }
     
     try {
         const params = new URLSearchParams({
@@ -373,14 +386,18 @@ async function loadUniversities() {
             grup: currentGrup,
             tur: currentTur,
             sort_by: currentSortBy,
-            sort_order: currentSortOrder
+            sort_order: currentSortOrder,
+            limit: PAGE_SIZE,
+            offset: loadedUniversities.length,
+            fields: CARD_FIELDS.join(',')
         });
         
         const response = await fetch(`/api/universiteler?${params}`);
-        const universities = await response.json();
-        console.log('Gelen üniversite sayısı:', universities.length, universities);
-        displayUniversities(universities);
-        updateStats(universities);
+        const page = await response.json();
+        loadedUniversities = loadedUniversities.concat(page.data);
+        totalUniversities = page.total;
+        displayUniversities(loadedUniversities);
+        updateStats(page);
     } catch (error) {
         console.error('Error loading universities:', error);
         showError('Üniversiteler yüklenirken bir hata oluştu.');
@@ -468,7 +485,16 @@ function displayUniversities(universities) {
         </div>
     `).join('');
     
-    resultsContainer.innerHTML = html;
+    const remaining = totalUniversities - universities.length;
+    const loadMore = remaining > 0 ? `
+        <div class="text-center my-4">
+            <button type="button" class="btn btn-outline-primary" onclick="loadUniversities(true)">
+                <i class="fas fa-chevron-down me-2"></i>Daha fazla göster (${remaining} kayıt daha)
+            </button>
+        </div>
+    ` : '';
+    
+    resultsContainer.innerHTML = html + loadMore;
 }
 
 // Direkt detay sayfasına git
@@ -534,15 +560,12 @@ function clearFilters() {
     loadUniversities();
 }
 
-// Update statistics
-function updateStats(universities) {
-    const uniqueUlkeler = [...new Set(universities.map(u => u['Ülke']).filter(Boolean))];
-    const uniqueSehirler = [...new Set(universities.map(u => u['Şehir']).filter(Boolean))];
-    
-    document.getElementById('totalCount').textContent = universities.length;
-    document.getElementById('ulkeCount').textContent = uniqueUlkeler.length;
-    document.getElementById('sehirCount').textContent = uniqueSehirler.length;
-    document.getElementById('filteredCount').textContent = universities.length;
+// Update statistics (sayılar sunucunun filtrelenmiş toplamlarından gelir)
+function updateStats(page) {
+    document.getElementById('totalCount').textContent = page.total;
+    document.getElementById('ulkeCount').textContent = page.stats.ulke_count;
+    document.getElementById('sehirCount').textContent = page.stats.sehir_count;
+    document.getElementById('filteredCount').textContent = page.total;
 }
 
 // Show loading state
@@ -0,0 +1,83 @@
+import os
+import sys
+
+import pytest
+
+# app import edilmeden önce: testler diske snapshot yazmasın, günlükler sessiz olsun
+os.environ['SNAPSHOT_DIR'] = ''
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as application  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+
+@pytest.fixture
+def fake_source(monkeypatch):
+    """Veri kaynağını sentetik veriyle dolu bir FakeDataSource ile değiştirir; snapshot boş başlar"""
+    source = application.FakeDataSource(generate(200, seed=7))
+    monkeypatch.setattr(application, 'data_source', source)
+    monkeypatch.setattr(application.data_cache, 'snapshot', None)
+    monkeypatch.setattr(application.data_cache, 'last_attempt', 0.0)
+    return source
+
+@pytest.fixture
+def client():
+    return application.app.test_client()
+
+class FakeWorksheet:
+    """Ağa çıkmayan gspread worksheet'i: values_batch_get / batch_update / delete_rows çağrılarını kaydeder"""
+
+    id = 0
+    title = 'Üniversiteler'
+
+    def __init__(self, rows):
+        self.rows = [list(row) for row in rows]
+        self.calls = []
+        self.spreadsheet = self
+
+    def _cell(self, row, col):
+        values = self.rows[row - 1] if row <= len(self.rows) else []
+        return values[col - 1] if col <= len(values) else ''
+
+    def _range(self, name):
+        part = name.split('!', 1)[1]
+        if part == '1:1':
+            return {'values': [self.rows[0]]}
+        if ':' in part:
+            start, _ = part.split(':')
+            row, col = application.a1_to_rowcol(start)
+            return {'values': [[self._cell(r, col)] for r in range(row, len(self.rows) + 1)]}
+        row, col = application.a1_to_rowcol(part)
+        value = self._cell(row, col)
+        return {'values': [[value]]} if value else {}
+
+    def values_batch_get(self, ranges):
+        self.calls.append(('values_batch_get', list(ranges)))
+        return {'valueRanges': [self._range(name) for name in ranges]}
+
+    def batch_update(self, data):
+        self.calls.append(('batch_update', data))
+        for item in data:
+            row, col = application.a1_to_rowcol(item['range'])
+            self.rows[row - 1][col - 1] = item['values'][0][0]
+
+    def delete_rows(self, index):
+        self.calls.append(('delete_rows', index))
+        del self.rows[index - 1]
+
+    def count(self, name):
+        return sum(1 for call in self.calls if call[0] == name)
+
+@pytest.fixture
+def sheet(fake_source, monkeypatch):
+    """Yazma uç noktaları için: snapshot fake_source'tan, yazmalar bellek içi FakeWorksheet'e gider"""
+    worksheet = FakeWorksheet(fake_source.values['universiteler'])
+    application.data_cache.get()
+    monkeypatch.setattr(fake_source, 'writable', True)
+    monkeypatch.setenv('GOOGLE_SHEET_ID', 'test')
+    monkeypatch.setattr(application.sheets_manager, 'get_client', lambda: object())
+    monkeypatch.setattr(application.sheets_manager, 'get_role_worksheet', lambda role: worksheet)
+    monkeypatch.setattr(application.sheets_manager, 'key_columns', {})
+    return worksheet
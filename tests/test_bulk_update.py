@@ -0,0 +1,55 @@
+"""PUT /api/universite/<kod> ve PUT /api/universiteler: tek okuma (batchGet) ve tek batch_update"""
+import app as application
+
+def code(sheet, row):
+    return sheet.rows[row][1]
+
+def column(sheet, field):
+    return sheet.rows[0].index(field)
+
+def test_single_put_reads_and_writes_once(sheet, client):
+    target = code(sheet, 5)
+    response = client.put(f'/api/universite/{target}', json={'Kontenjan': '77', 'Olmayan Alan': 'x'})
+    assert response.status_code == 200
+    assert sheet.count('values_batch_get') == 1
+    assert sheet.count('batch_update') == 1
+    # Sadece sayfada olan alanın hücresi yazılır
+    assert sheet.calls[-1][1] == [{'range': 'H6', 'values': [['77']]}]
+    assert sheet.rows[5][column(sheet, 'Kontenjan')] == '77'
+
+def test_bulk_put_single_round_trip(sheet, client):
+    targets = [code(sheet, row) for row in (3, 10, 42)]
+    response = client.put('/api/universiteler', json=[
+        {'program_kodu': target, 'data': {'Kontenjan': str(i), 'Şehir': 'Ankara'}} for i, target in enumerate(targets)
+    ])
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == targets
+    assert sheet.count('values_batch_get') == 1
+    assert sheet.count('batch_update') == 1
+    assert len(sheet.calls[-1][1]) == 6
+    for i, row in enumerate((3, 10, 42)):
+        assert sheet.rows[row][column(sheet, 'Kontenjan')] == str(i)
+    
+    assert application.data_cache.wait_for_writes(timeout=10)
+    detail = client.get(f'/api/universite/{targets[1]}').get_json()
+    assert detail['Kontenjan'] == 1 and detail['Şehir'] == 'Ankara'
+
+def test_bulk_put_with_unknown_code_writes_nothing(sheet, client):
+    before = [list(row) for row in sheet.rows]
+    response = client.put('/api/universiteler', json={'updates': [
+        {'program_kodu': code(sheet, 3), 'data': {'Kontenjan': '1'}},
+        {'program_kodu': 'yok-boyle-bir-kod', 'data': {'Kontenjan': '2'}},
+    ]})
+    assert response.status_code == 404
+    assert response.get_json()['not_found'] == ['yok-boyle-bir-kod']
+    assert sheet.count('batch_update') == 0
+    assert sheet.rows == before
+
+def test_bulk_put_rejects_malformed_body(sheet, client):
+    assert client.put('/api/universiteler', json=[]).status_code == 400
+    assert client.put('/api/universiteler', json=[{'program_kodu': '1'}]).status_code == 400
+    assert sheet.calls == []
+
+def test_read_only_source_rejects_writes(fake_source, client):
+    response = client.put('/api/universiteler', json=[{'program_kodu': '1', 'data': {}}])
+    assert response.status_code == 409
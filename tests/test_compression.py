@@ -0,0 +1,47 @@
+"""Accept-Encoding'e göre br / gzip / sıkıştırmasız yanıt ve Vary başlığı"""
+import gzip
+
+import pytest
+
+import app as application
+
+def get(client, path, encoding=None):
+    headers = {'Accept-Encoding': encoding} if encoding is not None else {}
+    return client.get(path, headers=headers)
+
+@pytest.mark.parametrize('path', ['/api/ders_programlari', '/api/universiteler?ulke=KKTC'])
+def test_gzip_negotiated(fake_source, client, path):
+    plain = get(client, path)
+    response = get(client, path, 'gzip, deflate')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == plain.data
+
+@pytest.mark.skipif(application.brotli is None, reason='brotli kurulu değil')
+def test_brotli_preferred(fake_source, client):
+    plain = get(client, '/api/ders_programlari')
+    response = get(client, '/api/ders_programlari', 'gzip, br')
+    assert response.headers['Content-Encoding'] == 'br'
+    assert application.brotli.decompress(response.data) == plain.data
+
+@pytest.mark.parametrize('encoding', [None, 'identity', 'deflate', 'gzip;q=0'])
+def test_identity_fallback(fake_source, client, encoding):
+    response = get(client, '/api/ders_programlari', encoding)
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.get_json()['total_count'] == 200
+
+def test_each_encoding_has_own_etag(fake_source, client):
+    plain = get(client, '/api/ders_programlari')
+    gzipped = get(client, '/api/ders_programlari', 'gzip')
+    assert plain.headers['ETag'] != gzipped.headers['ETag']
+    # Sıkıştırılmamış gösterimin ETag'i gzip isteğinde eşleşmez
+    response = client.get('/api/ders_programlari', headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain.headers['ETag']})
+    assert response.status_code == 200
+
+def test_small_body_not_compressed(fake_source, client, monkeypatch):
+    monkeypatch.setattr(application, 'COMPRESS_MIN_SIZE', 10 ** 9)
+    response = get(client, '/api/universiteler?ulke=KKTC', 'gzip')
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
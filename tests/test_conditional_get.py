@@ -0,0 +1,48 @@
+"""Koşullu GET: değişmeyen snapshot için 304, yeni sürümde 200"""
+import pytest
+
+import app as application
+
+PATHS = ['/api/universiteler', '/api/universiteler?ulke=KKTC&limit=5', '/api/filtreler', '/api/ders_programlari']
+
+def bump_version():
+    def renamed(frames):
+        df = frames['universiteler'].copy()
+        df.loc[0, 'Üniversite Adı'] = 'Yeni Ad'
+        return {**frames, 'universiteler': df}
+    application.data_cache.apply(renamed)
+    assert application.data_cache.wait_for_writes(timeout=10)
+
+@pytest.mark.parametrize('path', PATHS)
+def test_if_none_match(fake_source, client, path):
+    first = client.get(path)
+    assert first.status_code == 200
+    response = client.get(path, headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == first.headers['ETag']
+
+@pytest.mark.parametrize('path', PATHS)
+def test_if_modified_since(fake_source, client, path):
+    first = client.get(path)
+    response = client.get(path, headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 304
+
+def test_query_parameters_change_etag(fake_source, client):
+    a = client.get('/api/universiteler?ulke=KKTC').headers['ETag']
+    b = client.get('/api/universiteler?ulke=Türkiye').headers['ETag']
+    assert a != b
+
+def test_version_bump_returns_full_response(fake_source, client):
+    # Last-Modified saniye çözünürlüklü: yeni sürüm aynı saniyede kurulsa da önceki daha eski görünsün
+    application.data_cache.get().created_at -= 5
+    first = client.get('/api/universiteler')
+    bump_version()
+    
+    response = client.get('/api/universiteler', headers={'If-None-Match': first.headers['ETag']})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != first.headers['ETag']
+    assert any(record['Üniversite Adı'] == 'Yeni Ad' for record in response.get_json())
+    
+    response = client.get('/api/universiteler', headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert response.status_code == 200
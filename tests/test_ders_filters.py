@@ -0,0 +1,26 @@
+"""Ders programı filtrelerinin eşleşme kuralları (DERS_FILTER_RULES)"""
+import pandas as pd
+
+import app as application
+
+def donem_matches(values, filter_value):
+    matcher = application.TextColumnMatcher(pd.Series(values, dtype=object))
+    return matcher.match(filter_value, application.DERS_FILTER_RULES['donem'][1]).tolist()
+
+def test_donem_number_match():
+    assert donem_matches(['1', '01', '10', None, ''], '1') == [True, True, True, False, False]
+    assert donem_matches(['1', '01', '10'], '01') == [True, True, False]
+
+def test_donem_non_decimal_digits():
+    # '²' isdigit() ama int() ile çevrilemez: hata değil, sadece içerme eşleşmesi
+    assert donem_matches(['1', '²', '3'], '²') == [False, True, False]
+    assert donem_matches(['1', '²', '01'], '1') == [True, False, True]
+
+def test_filter_endpoint_non_decimal_donem(fake_source, client):
+    response = client.post('/api/ders_programlari_filtrele', json={'donem': '²'})
+    assert response.status_code == 200
+    assert response.get_json()['total_count'] == 0
+    
+    response = client.post('/api/ders_programlari_filtrele', json={'donem': '3'})
+    assert response.status_code == 200
+    assert response.get_json()['total_count'] > 0
@@ -0,0 +1,52 @@
+"""FacetEngine ve /api/dinamik-filtreler: birleşik filtrelerde facet sayıları"""
+from collections import Counter
+
+import pytest
+
+import app as application
+
+def matching(records, filters):
+    return [record for record in records
+            if all(record[application.FACET_COLUMNS[param]] == value for param, value in filters.items() if value)]
+
+def expected_counts(records, column, filters):
+    return dict(Counter(record[column] for record in matching(records, filters) if record[column] is not None))
+
+@pytest.fixture
+def records(fake_source, client):
+    return client.get('/api/universiteler').get_json()
+
+def filter_sets(records):
+    first = records[0]
+    values = {param: first[column] for param, column in application.FACET_COLUMNS.items()}
+    yield {}
+    yield {'ulke': values['ulke']}
+    yield {'ulke': values['ulke'], 'grup': values['grup']}
+    yield {'sehir': values['sehir'], 'tur': values['tur']}
+    yield dict(values)
+    yield {'ulke': values['ulke'], 'sehir': 'Olmayan Şehir'}
+
+def test_dynamic_facet_counts(records, client):
+    for filters in filter_sets(records):
+        body = client.get('/api/dinamik-filtreler', query_string=filters).get_json()
+        # Ülkeler seçimden bağımsız olarak tam liste
+        assert body['sayilar']['ulkeler'] == expected_counts(records, 'Ülke', {})
+        for key, param in (('sehirler', 'sehir'), ('gruplar', 'grup'), ('turler', 'tur')):
+            counts = expected_counts(records, application.FACET_COLUMNS[param], filters)
+            assert body['sayilar'][key] == counts, (key, filters)
+            assert body[key] == sorted(counts), (key, filters)
+
+def test_list_total_under_same_filters(records, client):
+    for filters in filter_sets(records):
+        body = client.get('/api/universiteler', query_string={**filters, 'limit': 1}).get_json()
+        assert body['total'] == len(matching(records, filters)), filters
+
+def test_facet_mask_is_intersection(fake_source):
+    snapshot = application.data_cache.get()
+    df = snapshot.df
+    first = df.iloc[0]
+    filters = {'ulke': first['Ülke'], 'grup': first['Grup']}
+    mask = snapshot.facets.mask(filters)
+    expected = ((df['Ülke'] == first['Ülke']) & (df['Grup'] == first['Grup'])).to_numpy()
+    assert (mask == expected).all()
+    assert snapshot.facets.mask({'ulke': '', 'sehir': ''}) is None
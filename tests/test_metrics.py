@@ -0,0 +1,19 @@
+"""/metrics: Prometheus metinleri"""
+import time
+
+import app as application
+
+def metric_value(text, name):
+    for line in text.splitlines():
+        if line.startswith(f'{name} ') or line.startswith(f'{name}{{'):
+            return float(line.rsplit(' ', 1)[1])
+    return None
+
+def test_snapshot_age_computed_at_scrape(fake_source, client):
+    client.get('/api/filtreler')
+    application.SNAPSHOT_REFRESHED.set(time.time() - 100)
+    
+    first = metric_value(client.get('/metrics').get_data(as_text=True), 'data_snapshot_age_seconds')
+    time.sleep(0.05)
+    second = metric_value(client.get('/metrics').get_data(as_text=True), 'data_snapshot_age_seconds')
+    assert 100 <= first < second < 110
@@ -0,0 +1,46 @@
+"""PresortedIndex ve /api/universiteler?sort_by=: Türkçe alfabe sırası, iki yön ve boş değerler"""
+import pandas as pd
+import pytest
+
+import app as application
+
+NAMES = ['Özyeğin', 'Ordu', 'Çukurova', 'Cumhuriyet', 'İnönü', 'Işık', 'Ege', 'Şırnak', 'Sakarya', 'Uşak', 'Üsküdar', 'ığdır']
+TURKISH_ORDER = ['Cumhuriyet', 'Çukurova', 'Ege', 'ığdır', 'Işık', 'İnönü', 'Ordu', 'Özyeğin', 'Sakarya', 'Şırnak', 'Uşak', 'Üsküdar']
+
+def test_names_in_turkish_alphabet_order():
+    index = application.PresortedIndex(pd.DataFrame({'Üniversite Adı': NAMES}))
+    assert [NAMES[i] for i in index.order('Üniversite Adı')] == TURKISH_ORDER
+    assert [NAMES[i] for i in index.order('Üniversite Adı', ascending=False)] == TURKISH_ORDER[::-1]
+
+def test_equal_names_keep_row_order_ascending():
+    df = pd.DataFrame({'Üniversite Adı': ['b', 'A', 'a', 'B']})
+    index = application.PresortedIndex(df)
+    assert index.order('Üniversite Adı').tolist() == [1, 2, 0, 3]
+    assert index.order('Üniversite Adı', ascending=False).tolist() == [3, 0, 2, 1]
+
+def test_numeric_blanks_last_in_both_directions():
+    df = pd.DataFrame({'Kontenjan': pd.array([5, None, 3, 5, 1], dtype='Int64')})
+    index = application.PresortedIndex(df)
+    assert index.order('Kontenjan').tolist() == [4, 2, 0, 3, 1]
+    assert index.order('Kontenjan', ascending=False).tolist() == [3, 0, 2, 4, 1]
+    assert index.order('Yok') is None
+
+def sorted_records(client, sort_by, sort_order):
+    return client.get('/api/universiteler', query_string={'sort_by': sort_by, 'sort_order': sort_order}).get_json()
+
+def test_api_name_sort(fake_source, client):
+    ascending = sorted_records(client, 'Üniversite Adı', 'asc')
+    keys = [application.turkish_key(record['Üniversite Adı']) for record in ascending]
+    assert keys == sorted(keys)
+    descending = sorted_records(client, 'Üniversite Adı', 'desc')
+    assert descending == ascending[::-1]
+
+@pytest.mark.parametrize('column', application.SORTABLE_NUMERIC_COLUMNS)
+def test_api_numeric_sort(fake_source, client, column):
+    for order, reverse in (('asc', False), ('desc', True)):
+        records = sorted_records(client, column, order)
+        values = [record[column] for record in records]
+        present = [value for value in values if value is not None]
+        assert present == sorted(present, reverse=reverse)
+        # Boşlar her iki yönde de sonda
+        assert values[len(present):] == [None] * (len(values) - len(present))
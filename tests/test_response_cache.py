@@ -0,0 +1,42 @@
+"""Snapshot başına bir kez üretilen yanıt gövdeleri ve koşullu GET (ETag / Last-Modified)"""
+import app as application
+
+def renamed(frames):
+    df = frames['universiteler'].copy()
+    df.loc[0, 'Üniversite Adı'] = 'Yeni Ad'
+    return {**frames, 'universiteler': df}
+
+def bump_version():
+    application.data_cache.apply(renamed)
+    assert application.data_cache.wait_for_writes(timeout=10)
+
+def test_payload_built_once_per_snapshot(fake_source, client, monkeypatch):
+    calls = []
+    build = application.build_ders_filtreler
+    monkeypatch.setattr(application, 'build_ders_filtreler', lambda df: calls.append(1) or build(df))
+    
+    first = client.get('/api/ders_programlari_filtreler')
+    second = client.get('/api/ders_programlari_filtreler')
+    assert first.status_code == second.status_code == 200
+    assert first.data == second.data
+    assert len(calls) == 1
+    
+    # Yeni snapshot sürümü gövdeyi bir kez daha üretir
+    bump_version()
+    client.get('/api/ders_programlari_filtreler')
+    client.get('/api/ders_programlari_filtreler')
+    assert len(calls) == 2
+
+def test_payload_cached_once_per_encoding(fake_source, client):
+    client.get('/api/ders_programlari')
+    client.get('/api/ders_programlari', headers={'Accept-Encoding': 'gzip'})
+    client.get('/api/ders_programlari')
+    # Kodlama başına tek kayıt: gövde ayrıca sıkıştırılmamış haliyle ikinci kez saklanmaz
+    assert sorted(application.data_cache.snapshot._payloads) == [
+        'ders_programlari:/api/ders_programlari:None',
+        'ders_programlari:/api/ders_programlari:gzip',
+    ]
+
+def test_parameterized_request_not_cached(fake_source, client):
+    client.get('/api/universiteler?ulke=KKTC')
+    assert application.data_cache.snapshot._payloads == {}
@@ -0,0 +1,38 @@
+"""NgramSearchIndex ve /api/universiteler?search=: alt dizi araması kaba taramayla aynı sonucu verir"""
+import numpy as np
+import pytest
+
+import app as application
+
+NAMES = ['İstanbul Teknik Üniversitesi', 'Orta Doğu Teknik Üniversitesi', 'Ankara Üniversitesi',
+         None, 'İstanbul Teknik Üniversitesi', 'Işık Üniversitesi', '', 'Çukurova Üniversitesi']
+
+def brute_force(values, query):
+    query = application.normalize_text(query)
+    return [i for i, value in enumerate(values) if query in application.normalize_text(value)]
+
+@pytest.mark.parametrize('query', ['t', 'te', 'tek', 'teknik', 'TEKNİK', 'istanbul teknik', 'cukurova',
+                                   'Çukurova', 'üniversitesi', 'dogu', 'işık', 'yok', 'nik ü', 'xyzxyz'])
+def test_search_matches_substring_scan(query):
+    index = application.NgramSearchIndex(NAMES)
+    assert index.search(query).tolist() == brute_force(NAMES, query)
+
+def test_blank_query_means_no_filter():
+    index = application.NgramSearchIndex(NAMES)
+    assert index.search('') is None
+    assert index.search('   ') is None
+
+def test_repeated_names_expand_to_all_rows():
+    index = application.NgramSearchIndex(NAMES)
+    positions = index.search('istanbul')
+    assert positions.tolist() == [0, 4]
+    assert positions.dtype == np.int64
+
+def test_api_search_matches_scan(fake_source, client):
+    records = client.get('/api/universiteler').get_json()
+    names = [record['Üniversite Adı'] for record in records]
+    for query in ('teknik', 'Ü', 'ankara üni', 'yok-böyle-bir-ad'):
+        body = client.get('/api/universiteler', query_string={'search': query, 'limit': 500}).get_json()
+        expected = [records[i]['Program Kodu'] for i in brute_force(names, query)]
+        assert sorted(record['Program Kodu'] for record in body['data']) == sorted(expected), query
+        assert body['total'] == len(expected)
@@ -0,0 +1,55 @@
+"""SheetRowIndex: silme sonrası satır kayması ve sayfa dışarıdan değiştiğinde yeniden tarama"""
+import app as application
+
+KONTENJAN = 'H'
+
+def code(sheet, row):
+    return sheet.rows[row][1]
+
+def kontenjan(sheet, program_kodu):
+    row = next(row for row in sheet.rows if row[1] == program_kodu)
+    return row[sheet.rows[0].index('Kontenjan')]
+
+def test_index_shifts_rows_after_delete():
+    index = application.SheetRowIndex(['a', 'b', 'c', 'b'])
+    assert (index.row('a'), index.row('b'), index.row('c')) == (2, 3, 4)
+    index.deleted(3)
+    assert (index.row('a'), index.row('b'), index.row('c')) == (2, 4, 3)
+    index.appended('d', 7)
+    assert index.row('d') == 7 and index.codes[-2:] == ['', 'd']
+
+def test_put_after_delete_uses_shifted_row(sheet, client):
+    deleted, target = code(sheet, 3), code(sheet, 10)
+    assert client.delete(f'/api/universite/{deleted}').status_code == 200
+    assert sheet.calls[-1] == ('delete_rows', 4)
+    
+    response = client.put(f'/api/universite/{target}', json={'Kontenjan': '55'})
+    assert response.status_code == 200
+    # Doğrulama okumaları dışında sütun taranmadı; yazma kaymış satıra gitti
+    assert sheet.count('values_batch_get') == 2
+    assert sheet.calls[-1][1] == [{'range': f'{KONTENJAN}10', 'values': [['55']]}]
+    assert kontenjan(sheet, target) == '55'
+    
+    assert application.data_cache.wait_for_writes(timeout=10)
+    assert client.get(f'/api/universite/{deleted}').status_code == 404
+
+def test_external_edit_triggers_rescan(sheet, client):
+    target = code(sheet, 10)
+    # Sayfaya dışarıdan bir satır eklenir: indeksteki satır artık başka kodu taşır
+    sheet.rows.insert(1, ['Dışarıdan Eklenen'] + ['999'] + [''] * (len(sheet.rows[0]) - 2))
+    
+    response = client.put(f'/api/universite/{target}', json={'Kontenjan': '66'})
+    assert response.status_code == 200
+    # Doğrulama tutmadı: Program Kodu sütunu bir kez yeniden okundu
+    assert sheet.count('values_batch_get') == 2
+    assert sheet.calls[-1][1] == [{'range': f'{KONTENJAN}12', 'values': [['66']]}]
+    assert kontenjan(sheet, target) == '66'
+    
+    # Yeniden kurulan indeks sonraki yazmada doğrudan kullanılır
+    client.put(f'/api/universite/{target}', json={'Kontenjan': '67'})
+    assert sheet.count('values_batch_get') == 3
+
+def test_delete_unknown_code(sheet, client):
+    response = client.delete('/api/universite/yok-boyle-bir-kod')
+    assert response.status_code == 404
+    assert sheet.count('delete_rows') == 0
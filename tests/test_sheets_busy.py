@@ -0,0 +1,44 @@
+"""SHEETS_MAX_CONCURRENCY dolduğunda: 503 döner, sağlam oturum atılmaz"""
+import threading
+
+import pytest
+
+import app as application
+
+@pytest.fixture
+def busy_sheets(monkeypatch):
+    """Tek yerlik ve dolu bir Sheets çağrı sırası; invalidate çağrıları kaydedilir"""
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(application, 'sheets_slots', slots)
+    monkeypatch.setattr(application, 'SHEETS_QUEUE_TIMEOUT', 0.01)
+    
+    def get_client():
+        with application.sheets_call('token_refresh'):
+            return object()
+    
+    invalidations = []
+    monkeypatch.setattr(application.sheets_manager, 'get_client', get_client)
+    monkeypatch.setattr(application.sheets_manager, 'invalidate', lambda: invalidations.append(True))
+    return invalidations
+
+def test_write_route_returns_503(busy_sheets, monkeypatch, client):
+    monkeypatch.setattr(application, 'data_source', application.SheetsDataSource(application.sheets_manager))
+    response = client.post('/api/universite', json={
+        'Üniversite Adı': 'Test Üniversitesi', 'Program Kodu': '1', 'Fakülte Adı': 'Mühendislik', 'Şehir': 'Ankara', 'Grup': 'A',
+    })
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert busy_sheets == []
+
+# Yoklamada da, yoklamasız tam indirmede (fetch_all_data) de
+@pytest.mark.parametrize('probe', [application.probe_data_source, None])
+def test_refresh_keeps_session_and_snapshot(busy_sheets, fake_source, monkeypatch, probe):
+    cache = application.SnapshotCache(application.fetch_all_data, 300, 30, 'Test', probe=probe)
+    snapshot = cache.get()
+    
+    monkeypatch.setattr(application, 'data_source', application.SheetsDataSource(application.sheets_manager))
+    cache._refresh()
+    assert cache.snapshot is snapshot
+    assert 'boş Sheets çağrı yeri' in cache.last_error
+    assert busy_sheets == []
@@ -0,0 +1,117 @@
+"""SnapshotCache: yenileme, değişiklik yoklaması ve paylaşılan disk deposu"""
+import time
+
+import app as application
+
+def make_cache(store=None):
+    return application.SnapshotCache(application.fetch_all_data, 300, 30, 'Test', store=store,
+                                     probe=application.probe_data_source)
+
+def changed_rows(source):
+    rows = [list(row) for row in source.values['universiteler']]
+    rows[1][0] = 'Değişmiş Üniversite'
+    return rows
+
+def test_invalidate_skips_published_snapshot(fake_source, tmp_path):
+    cache = make_cache(application.SnapshotStore(str(tmp_path)))
+    assert cache.get().version == 1
+    
+    fake_source.update('universiteler', changed_rows(fake_source))
+    cache.invalidate()
+    cache._refresh()
+    
+    # Depodaki snapshot hâlâ TTL içinde ama geçersizlemeden önce doğrulanmış: kaynağa gidilir
+    assert fake_source.fetch_count == 2
+    assert cache.snapshot.version == 2
+    assert cache.snapshot.df['Üniversite Adı'].iloc[0] == 'Değişmiş Üniversite'
+
+def test_published_snapshot_adopted_after_invalidation(fake_source, tmp_path):
+    writer = make_cache(application.SnapshotStore(str(tmp_path)))
+    reader = make_cache(application.SnapshotStore(str(tmp_path)))
+    writer.get()
+    reader.get()
+    
+    reader.invalidate()
+    fake_source.update('universiteler', changed_rows(fake_source))
+    writer.invalidate()
+    writer._refresh()
+    reader._refresh()
+    
+    # Geçersizlemeden sonra yayınlanan snapshot tekrar indirilmeden benimsenir
+    assert fake_source.fetch_count == 2
+    assert reader.snapshot.version == writer.snapshot.version == 2
+
+def test_probe_unchanged_skips_fetch(fake_source):
+    cache = make_cache()
+    snapshot = cache.get()
+    assert fake_source.fetch_count == 1
+    
+    cache._refresh()
+    assert fake_source.probe_count == 2
+    assert fake_source.fetch_count == 1
+    assert cache.skipped_downloads == 1
+    assert cache.snapshot is snapshot and snapshot.version == 1
+
+def test_probe_changed_fetches(fake_source):
+    cache = make_cache()
+    cache.get()
+    
+    fake_source.update('universiteler', changed_rows(fake_source))
+    cache._refresh()
+    assert fake_source.fetch_count == 2
+    assert cache.skipped_downloads == 0
+    assert cache.snapshot.version == 2
+    assert cache.snapshot.source_token == str(fake_source.revision)
+
+def test_probe_error_falls_back_to_fetch(fake_source):
+    cache = make_cache()
+    cache.get()
+    
+    fake_source.probe_error = ConnectionError('drive erişilemiyor')
+    fake_source.update('universiteler', changed_rows(fake_source))
+    cache._refresh()
+    assert fake_source.fetch_count == 2
+    assert cache.snapshot.version == 2
+    assert cache.snapshot.source_token is None
+    assert cache.last_error is None
+    
+    # Yoklama düzelince sürüm anahtarı tekrar eşleşir ve indirme atlanır
+    fake_source.probe_error = None
+    cache._refresh()
+    cache._refresh()
+    assert fake_source.fetch_count == 3
+    assert cache.skipped_downloads == 1
+
+def renamed(name):
+    def change(frames):
+        df = frames['universiteler'].copy()
+        df.loc[0, 'Üniversite Adı'] = name
+        return {**frames, 'universiteler': df}
+    return change
+
+def test_apply_returns_before_rebuild(fake_source):
+    cache = make_cache()
+    snapshot = cache.get()
+    
+    # Yenileme sürerken gelen yazmalar beklemeden döner ve sonra tek kurulumla uygulanır
+    with cache._load_lock:
+        cache.apply(renamed('Birinci'))
+        cache.apply(renamed('İkinci'))
+        assert cache.snapshot is snapshot
+    assert cache.wait_for_writes(timeout=5)
+    assert cache.snapshot.df['Üniversite Adı'].iloc[0] == 'İkinci'
+    assert cache.snapshot.version == 2
+    assert cache.snapshot.source == 'write'
+
+def test_apply_skipped_when_snapshot_fetched_after_write(fake_source):
+    cache = make_cache()
+    cache.get()
+    with cache._load_lock:
+        cache.apply(renamed('Yazma'))
+        # Yazma sıradayken başlayan indirme değişikliği zaten içerir
+        time.sleep(0.01)
+        fake_source.update('universiteler', changed_rows(fake_source))
+        cache._fetch()
+    assert cache.wait_for_writes(timeout=5)
+    assert cache.snapshot.source == 'sheets'
+    assert cache.snapshot.df['Üniversite Adı'].iloc[0] == 'Değişmiş Üniversite'
@@ -0,0 +1,47 @@
+"""SnapshotStore: tablolar ve kurulumu pahalı indeksler birlikte yazılıp okunur"""
+import pytest
+
+import app as application
+
+pytestmark = pytest.mark.skipif(application.feather is None, reason='pyarrow kurulu değil')
+
+def saved_store(fake_source, tmp_path):
+    store = application.SnapshotStore(str(tmp_path))
+    cache = application.SnapshotCache(application.fetch_all_data, 300, 30, 'Test', store=store)
+    return store, cache.get()
+
+def test_load_reuses_persisted_indexes(fake_source, tmp_path, monkeypatch):
+    store, saved = saved_store(fake_source, tmp_path)
+    
+    def rebuilt(*args):
+        raise AssertionError('indeks yeniden kuruldu')
+    monkeypatch.setattr(application.PrefixSuggestIndex, '__init__', rebuilt)
+    monkeypatch.setattr(application, 'dataframe_records', rebuilt)
+    
+    loaded = store.load()
+    assert loaded.digest == saved.digest
+    assert loaded.records == saved.records
+    assert loaded.ders_records == saved.ders_records
+    assert loaded.suggest_index.suggest('tek', 5) == saved.suggest_index.suggest('tek', 5)
+    assert loaded.program_index.positions == saved.program_index.positions
+
+def test_load_rebuilds_indexes_from_other_format(fake_source, tmp_path, monkeypatch):
+    store, saved = saved_store(fake_source, tmp_path)
+    monkeypatch.setattr(application.SnapshotStore, 'INDEX_FORMAT', application.SnapshotStore.INDEX_FORMAT + 1)
+    
+    loaded = store.load()
+    assert loaded.records == saved.records
+    assert loaded.records is not None
+
+def test_stale_index_files_removed(fake_source, tmp_path):
+    store, _ = saved_store(fake_source, tmp_path)
+    for revision in range(2):
+        rows = [list(row) for row in fake_source.values['universiteler']]
+        rows[1][0] = f'Değişmiş Üniversite {revision}'
+        fake_source.update('universiteler', rows)
+        cache = application.SnapshotCache(application.fetch_all_data, 300, 30, 'Test', store=store)
+        cache.invalidate()
+        cache._refresh()
+    
+    # Son iki sürümün dosyaları tutulur
+    assert len(list(tmp_path.glob('indexes-*.pickle'))) == 2
@@ -0,0 +1,56 @@
+"""SqliteDataSource.import_values: repodaki çalışma kitabı ve eksik sütunlu sayfalar"""
+import os
+
+import app as application
+from benchmarks.synthetic import generate
+
+XLSX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'toplantı tablo 1.xlsx')
+
+def index_names(source):
+    with source._read() as conn:
+        return {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+
+def test_import_repo_workbook(tmp_path):
+    values = application.FileDataSource(XLSX_PATH).fetch()
+    source = application.SqliteDataSource(str(tmp_path / 'data.sqlite3'))
+    counts = source.import_values(values)
+    
+    assert counts['universiteler'] > 0
+    rows = source.query_universiteler('', {}, None, True)
+    assert len(rows) == counts['universiteler']
+
+def test_import_without_ulke_column(tmp_path):
+    values = generate(200, seed=1)
+    sheet = values['universiteler']
+    drop = sheet[0].index('Ülke')
+    values['universiteler'] = [row[:drop] + row[drop + 1:] for row in sheet]
+    
+    source = application.SqliteDataSource(str(tmp_path / 'data.sqlite3'))
+    source.import_values(values)
+    
+    # Ülke + Şehir bileşik indeksi atlanır, Şehir indeksi yine kurulur
+    sehir = f'c{values["universiteler"][0].index("Şehir")}'
+    assert f'universiteler_{sehir}' in index_names(source)
+    rows, total, stats = source.query_universiteler('', {'sehir': 'Ankara'}, None, True, page=(0, 10))
+    assert total > 0 and all(row['Şehir'] == 'Ankara' for row in rows)
+    assert stats['ulke_count'] == 0
+
+def test_reimport_replaces_content(tmp_path):
+    source = application.SqliteDataSource(str(tmp_path / 'data.sqlite3'))
+    source.import_values(generate(100, seed=1))
+    counts = source.import_values(generate(300, seed=2))
+    assert counts['universiteler'] == 300
+    assert len(source.query_universiteler('', {}, None, True)) == 300
+
+def test_ders_number_filter_matches_memory(tmp_path):
+    values = generate(200, seed=3)
+    donem = values['ders_programi'][0].index('DÖNEM')
+    values['ders_programi'][1][donem] = '²'
+    values['ders_programi'][2][donem] = '03'
+    source = application.SqliteDataSource(str(tmp_path / 'data.sqlite3'))
+    source.import_values(values)
+    matcher = application.DersProgramiMatcher(application.build_ders_programi_df(values['ders_programi']))
+    
+    for value in ('3', '03', '²', '٣'):
+        rows = source.query_ders_programlari({'donem': value})
+        assert len(rows) == int(matcher.match('donem', value).sum()), value
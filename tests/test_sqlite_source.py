@@ -0,0 +1,74 @@
+"""SQLite kaynağında snapshot (ETag, facet'ler) ile SQL sorgularının aynı aktarmadan gelmesi"""
+import time
+
+import pytest
+
+import app as application
+from benchmarks.synthetic import generate
+
+@pytest.fixture
+def sqlite_source(monkeypatch, tmp_path):
+    source = application.SqliteDataSource(str(tmp_path / 'data.sqlite3'))
+    source.import_values(generate(300, seed=1))
+    monkeypatch.setattr(application, 'data_source', source)
+    monkeypatch.setattr(application.data_cache, 'snapshot', None)
+    monkeypatch.setattr(application.data_cache, 'last_attempt', 0.0)
+    return source
+
+def wait_for_refresh(source, timeout=10):
+    """Arka plandaki yeniden kurulumun snapshot'ı kaynağın revizyonuna getirmesini bekler"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        snapshot = application.data_cache.snapshot
+        if not application.data_cache.refreshing and snapshot.source_token == source.probe():
+            return snapshot
+        time.sleep(0.01)
+    raise AssertionError('snapshot yenilenmedi')
+
+def test_reimport_changes_validators_and_facets(sqlite_source, client):
+    first = client.get('/api/universiteler?limit=5')
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    
+    # TTL dolmadan yeniden aktarma: SQL hemen yeni veriden yanıtlar, doğrulayıcılar değişir
+    sqlite_source.import_values(generate(500, seed=2))
+    response = client.get('/api/universiteler?limit=5', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert 'Last-Modified' not in response.headers
+    body = response.get_json()
+    assert body['total'] == 500
+    
+    # Snapshot arka planda aynı aktarmaya geçer
+    snapshot = wait_for_refresh(sqlite_source)
+    assert len(snapshot.df) == 500
+    assert body['stats']['sehir_count'] == snapshot.df['Şehir'].nunique()
+    refreshed = client.get('/api/universiteler?limit=5', headers={'If-None-Match': response.headers['ETag']})
+    assert refreshed.status_code == 200
+    assert client.get('/api/universiteler?limit=5', headers={'If-None-Match': refreshed.headers['ETag']}).status_code == 304
+
+def test_reimport_does_not_answer_if_modified_since(sqlite_source, client):
+    last_modified = client.get('/api/filtreler').headers['Last-Modified']
+    sqlite_source.import_values(generate(500, seed=2))
+    response = client.get('/api/filtreler', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 200
+
+def test_unchanged_database_keeps_etag(sqlite_source, client):
+    etag = client.get('/api/universiteler?limit=5').headers['ETag']
+    response = client.get('/api/universiteler?limit=5', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+def test_ders_filter_uses_synced_snapshot(sqlite_source, client):
+    client.post('/api/ders_programlari_filtrele', json={'donem': '3'})
+    sqlite_source.import_values(generate(500, seed=2))
+    body = client.post('/api/ders_programlari_filtrele', json={'donem': '3'}).get_json()
+    assert body['total_count'] == len(body['data']) > 0
+    assert len(wait_for_refresh(sqlite_source).ders_df) == 500
+
+def test_only_api_requests_pin_the_database(sqlite_source, client, monkeypatch):
+    pinned = []
+    pin = sqlite_source.pin
+    monkeypatch.setattr(sqlite_source, 'pin', lambda: pinned.append(application.request.path) or pin())
+    client.get('/')
+    client.get('/api/filtreler')
+    assert pinned == ['/api/filtreler']
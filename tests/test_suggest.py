@@ -0,0 +1,56 @@
+"""PrefixSuggestIndex ve /api/universiteler/suggest: önek eşleşmeleri ve sıralama"""
+import pandas as pd
+
+import app as application
+
+ROWS = [
+    ('Işık Üniversitesi', 'Bilgisayar Mühendisliği', '1'),
+    ('Ankara Üniversitesi', 'Hukuk', '2'),
+    ('Orta Doğu Teknik Üniversitesi', 'Fizik', '3'),
+    ('İstanbul Teknik Üniversitesi', 'Mimarlık', '4'),
+    ('Ankara Üniversitesi', 'Fizik', '5'),
+    ('İstanbul Teknik Üniversitesi', 'Fizik', '6'),
+    (None, 'Boş', '7'),
+]
+
+def make_index():
+    df = pd.DataFrame(ROWS, columns=application.SUGGEST_FIELDS)
+    return application.PrefixSuggestIndex(df)
+
+def codes(suggestions):
+    return [suggestion['Program Kodu'] for suggestion in suggestions]
+
+def test_name_prefix_before_word_prefix():
+    # 'istanbul teknik' isim başından, 'orta doğu teknik' kelime başından eşleşir
+    assert codes(make_index().suggest('Teknik', 10)) == ['3', '6', '4']
+    assert codes(make_index().suggest('ist', 10)) == ['6', '4']
+
+def test_same_name_ordered_by_program():
+    assert codes(make_index().suggest('ankara', 10)) == ['5', '2']
+
+def test_turkish_folding():
+    index = make_index()
+    assert codes(index.suggest('isik', 10)) == ['1']
+    assert codes(index.suggest('IŞIK', 10)) == ['1']
+    assert codes(index.suggest('İSTANBUL', 10)) == codes(index.suggest('istanbul', 10))
+
+def test_limit_and_empty_queries():
+    index = make_index()
+    assert len(index.suggest('üniversitesi', 2)) == 2
+    assert index.suggest('', 10) == []
+    assert index.suggest('ankara', 0) == []
+    assert index.suggest('yok', 10) == []
+
+def test_suggestion_fields():
+    assert make_index().suggest('işık', 1) == [
+        {'Üniversite Adı': 'Işık Üniversitesi', 'Program Adı': 'Bilgisayar Mühendisliği', 'Program Kodu': '1'}
+    ]
+
+def test_api_suggest_limits(fake_source, client, monkeypatch):
+    monkeypatch.setattr(application, 'SUGGEST_MAX_LIMIT', 3)
+    body = client.get('/api/universiteler/suggest?q=a&limit=50').get_json()
+    assert 0 < len(body) <= 3
+    for item in body:
+        name = application.turkish_fold(item['Üniversite Adı'])
+        assert name.startswith('a') or ' a' in name
+    assert client.get('/api/universiteler/suggest').get_json() == []
@@ -0,0 +1,43 @@
+"""ProgramCodeIndex ve /api/universite/<kod>: sabit zamanlı detay araması ve tekrarlanan kodlar"""
+import pytest
+
+import app as application
+
+@pytest.fixture
+def duplicate_source(fake_source):
+    """2., 3. ve 6. veri satırları 1. satırın kodunu taşır; 4. satırın kodu boşluklarla çevrili"""
+    rows = [list(row) for row in fake_source.values['universiteler']]
+    key = rows[0].index('Program Kodu')
+    rows[3][key] = rows[2][key] = rows[6][key] = rows[1][key]
+    rows[4][key] = f'  {rows[4][key]}  '
+    fake_source.update('universiteler', rows)
+    return rows, key
+
+def test_detail_matches_list_record(fake_source, client):
+    records = client.get('/api/universiteler').get_json()
+    for record in records[:20]:
+        detail = client.get(f"/api/universite/{record['Program Kodu']}").get_json()
+        assert detail['Program Kodu'] == record['Program Kodu']
+        assert detail['Üniversite Adı'] == record['Üniversite Adı']
+
+def test_unknown_code_is_404(fake_source, client):
+    response = client.get('/api/universite/yok-boyle-bir-kod')
+    assert response.status_code == 404
+    assert response.get_json() == {'error': 'Üniversite bulunamadı'}
+
+def test_duplicate_code_uses_first_row(duplicate_source, client):
+    rows, key = duplicate_source
+    header = rows[0]
+    detail = client.get(f'/api/universite/{rows[1][key]}').get_json()
+    assert detail['Üniversite Adı'] == rows[1][header.index('Üniversite Adı')].strip()
+    
+    index = application.data_cache.snapshot.program_index
+    assert index.duplicates == {rows[1][key]: [0, 1, 2, 5]}
+    status = client.get('/api/status').get_json()
+    assert status['cache']['duplicate_program_codes'] == 1
+
+def test_code_lookup_ignores_surrounding_whitespace(duplicate_source, client):
+    rows, key = duplicate_source
+    code = rows[4][key].strip()
+    assert client.get(f'/api/universite/{code}').get_json()['Program Kodu'] == code
+    assert client.get(f'/api/universite/%20{code}%20').status_code == 200
@@ -0,0 +1,40 @@
+"""/api/universiteler: sayfalama, alan seçimi ve toplamlar"""
+import app as application
+
+def test_legacy_call_returns_all_records(fake_source, client):
+    body = client.get('/api/universiteler').get_json()
+    assert isinstance(body, list)
+    assert len(body) == 200
+
+def test_limit_offset_and_total(fake_source, client):
+    everything = client.get('/api/universiteler').get_json()
+    body = client.get('/api/universiteler?limit=20&offset=30').get_json()
+    assert body['total'] == 200
+    assert (body['limit'], body['offset']) == (20, 30)
+    assert body['data'] == everything[30:50]
+
+def test_offset_past_end(fake_source, client):
+    body = client.get('/api/universiteler?limit=20&offset=1000').get_json()
+    assert body['data'] == [] and body['total'] == 200
+
+def test_limit_clamped_to_max(fake_source, client, monkeypatch):
+    monkeypatch.setattr(application, 'UNIVERSITELER_MAX_LIMIT', 50)
+    body = client.get('/api/universiteler?limit=100000').get_json()
+    assert body['limit'] == 50 and len(body['data']) == 50
+
+def test_offset_or_fields_without_limit_uses_default(fake_source, client, monkeypatch):
+    monkeypatch.setattr(application, 'UNIVERSITELER_DEFAULT_LIMIT', 25)
+    for query in ('offset=10', 'fields=Program Kodu'):
+        body = client.get(f'/api/universiteler?{query}').get_json()
+        assert body['limit'] == 25 and len(body['data']) == 25, query
+
+def test_fields_projection(fake_source, client):
+    body = client.get('/api/universiteler?limit=5&fields=Program Kodu, Şehir,Olmayan').get_json()
+    assert all(set(record) == {'Program Kodu', 'Şehir'} for record in body['data'])
+
+def test_total_and_stats_follow_filters(fake_source, client):
+    everything = client.get('/api/universiteler?ulke=KKTC').get_json()
+    body = client.get('/api/universiteler?ulke=KKTC&limit=3').get_json()
+    assert body['total'] == len(everything) > 3
+    assert body['stats']['ulke_count'] == 1
+    assert body['stats']['sehir_count'] == len({record['Şehir'] for record in everything})